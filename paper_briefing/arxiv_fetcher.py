@@ -2,23 +2,126 @@
 
 from __future__ import annotations
 
+import hashlib
 import random
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Set
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
 
 import arxiv
-import requests
 
-from .config import SEARCH_QUERY, MAX_FETCH
+from .citations import get_citation_resolver
+from .config import (
+    ARXIV_PAGE_SIZE,
+    CONFERENCE_ALIASES,
+    FETCH_MAX_SCAN,
+    FETCH_WINDOW,
+    FETCH_WORKERS,
+    MAX_FETCH,
+    RELEVANCE_MIN_SCORE,
+    SEARCH_QUERY,
+)
+from .http_cache import CachedSession, OfflineCacheMiss, is_offline
+from .ids import canonical_id
+from .keyword_matcher import match_keywords
+from .query_planner import QueryShard, plan_shards
+from .rate_limit import TokenBucket, get_arxiv_limiter
+
+# 주요 학회 목록 (리스트 순서 = 우선순위)
+MAJOR_CONFERENCES = list(CONFERENCE_ALIASES)
+_CONF_RANK = {conf: i for i, conf in enumerate(MAJOR_CONFERENCES)}
+
+
+def _trie_regex(words: List[str]) -> str:
+    """단어 목록을 공통 접두사로 묶은 정규식으로 만듭니다 (접두사 트리 = 결정적 분기).
+
+    ["nips", "neurips", "naacl"] → "n(?:aacl|eurips|ips)" 처럼 후보를 한 글자씩 좁혀 가므로
+    별칭이 늘어도 위치마다 모든 별칭을 다시 시도하지 않습니다. 공백은 ``\\s+``로 매칭합니다.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def _emit(node: dict) -> str:
+        branches = []
+        for ch in sorted(k for k in node if k):
+            head = r"\s+" if ch == " " else re.escape(ch)
+            branches.append(head + _emit(node[ch]))
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            body = f"(?:{body})?"   # 여기서 끝나는 별칭도 있음 (greedy라 긴 별칭 우선)
+        return body
+
+    return _emit(trie)
+
+
+def _build_venue_pattern() -> Tuple["re.Pattern", Dict[str, str], Dict[str, str]]:
+    """별칭 표 전체를 하나의 정규식으로 컴파일합니다.
+
+    별칭은 접두사 트리로 묶고, 별칭 바로 뒤의 연도("NeurIPS 2024", "CVPR'25",
+    "ICRA2025", "AAAI-24")를 함께 잡습니다. 텍스트는 ASCII만 소문자로 바꿔 넘깁니다
+    (IGNORECASE 없이 매칭, 길이가 그대로라 원문과 같은 위치로 대소문자를 확인할 수 있음).
+
+    별칭 앞뒤는 단어 경계여야 하고, 앞뒤가 "-"/"."로 다른 단어와 이어진 경우
+    ("rss-feed", "x.icra")는 별칭으로 보지 않습니다.
 
-# 주요 학회 목록
-MAJOR_CONFERENCES = [
-    "NeurIPS", "ICML", "ICLR", "AAAI", "IJCAI",
-    "CVPR", "ICCV", "ECCV", "ACL", "EMNLP", "NAACL"
-]
+    Returns:
+        (정규식, {소문자 별칭: 학회}, {소문자 짧은 별칭: 표기})
+    """
+    alias_to_conf: Dict[str, str] = {}
+    short: Dict[str, str] = {}
+    for conf, aliases in CONFERENCE_ALIASES.items():
+        for alias in aliases:
+            key = " ".join(alias.lower().split())
+            alias_to_conf[key] = conf
+            if len(alias) <= _SHORT_ALIAS_LEN:
+                short[key] = alias
+    pattern = re.compile(
+        rf"(?<![a-z0-9_])(?<![a-z0-9][-.])(?P<alias>{_trie_regex(list(alias_to_conf))})"
+        r"(?:(?:\s*|-)(?P<year4>(?:19|20)\d{2})(?!\d)|(?:\s*['’]|-)(?P<year2>\d{2})(?!\d))?"
+        r"(?![a-z_]|[-.][a-z0-9])"
+    )
+    return pattern, alias_to_conf, short
+
+
+# 이 길이 이하 별칭("RSS", "ACL", "ICRA")은 흔한 단어·URL 조각과 겹치므로 추가 조건을 봄 (parse_venue)
+_SHORT_ALIAS_LEN = 4
+_VENUE_RE, _ALIAS_TO_CONF, _SHORT_ALIASES = _build_venue_pattern()
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+_STATUS_RE = re.compile(
+    r"\b(?:(?P<workshop>workshops?)"
+    r"|(?P<to_appear>to\s+appear|forthcoming)"
+    r"|(?P<submitted>submitted|under\s+review)"
+    r"|(?P<accepted>accepted|published\s+(?:at|in)|proceedings|oral|spotlight|poster))\b"
+)
+# 짧은 별칭이 학회를 가리킨다고 볼 수 있는 문맥: 앞 _CONTEXT_BEFORE자 안의 채택·투고 표현,
+# 바로 뒤의 학회 단어("ACL Findings", "ICRA workshop"), 뒤 _YEAR_AFTER자 안의 연도
+_CONTEXT_BEFORE_RE = re.compile(
+    r"\b(?:(?:conference|proceedings|symposium|accepted|appears?|appearing|"
+    r"submitted|under\s+review|published|presented)\b|(?:conf|proc)\.)"
+)
+_CONTEXT_AFTER_RE = re.compile(
+    r"[\s,(]*(?:main\s+)?(?:(?:conference|proceedings|findings|workshops?|track|symposium)\b|conf\.)"
+)
+_CONTEXT_BEFORE = 30
+_YEAR_AFTER = 20
+# 별칭을 품은 공백 단위 토큰이 URL·도메인·파일 경로인지 ("github.com/foo/rss-feed", "https://icra2024.org")
+_URL_TOKEN_RE = re.compile(r"://|^www\.|^[\w-]+(?:\.[\w-]+)+/|\.(?:com|org|net|io|ai|edu|html?|xml|pdf)\b")
+_YEAR_RE = re.compile(r"(?<!\d)(?:19|20)\d{2}(?!\d)")
+
+
+class VenueInfo(NamedTuple):
+    conference: str = ""    # 정규화된 학회명 (예: "NeurIPS")
+    year: int = 0           # 학회 연도 (알 수 없으면 0)
+    status: str = ""        # "accepted" / "workshop" / "to_appear" / "submitted" / ""
 
 
 @dataclass
@@ -35,12 +138,102 @@ class Paper:
     journal_ref: str = ""   # 예: "NeurIPS 2024"
     comment: str = ""       # 예: "Accepted at ICML 2024"
     conference: str = ""    # 추출된 학회명
+    venue_year: int = 0     # 학회 연도 (예: 2024)
+    venue_status: str = ""  # "accepted" / "workshop" / "to_appear" / "submitted"
+    topics: List[str] = field(default_factory=list)  # 이 논문을 찾은 검색 샤드 (주제/카테고리)
+    # 로컬 키워드 매칭 결과 (제목+초록, keyword_matcher) - 값싼 사전 관련도 신호
+    keyword_hits: Dict[str, int] = field(default_factory=dict)  # {키워드: 등장 횟수}
+    topic_hits: Dict[str, int] = field(default_factory=dict)    # {주제: 키워드 등장 횟수 합}
+    relevance: float = 0.0   # 로컬 관련도 모델 예측 점수 (0~5, relevance.py / 모델 없으면 0)
     # 인용 정보
     citation_count: int = 0  # Semantic Scholar 기반 인용수
     # AI 트리아지 결과 (나중에 채워짐)
     summary: str = ""
     tags: List[str] = field(default_factory=list)
     score: float = 0.0
+    triage_model: str = ""   # 결과를 낸 LLM 모델 (헤지·장애 전환 시 보조 provider 모델일 수 있음)
+
+
+def parse_venue(journal_ref: str, comment: str) -> VenueInfo:
+    """journal_ref와 comment에서 학회명·연도·채택 상태를 한 번에 추출합니다.
+
+    CONFERENCE_ALIASES 전체를 미리 컴파일한 정규식 하나로 텍스트를 한 번만 훑고,
+    여러 학회가 언급되면 MAJOR_CONFERENCES 우선순위가 가장 높은 것을 고릅니다.
+
+    Args:
+        journal_ref: 예) "NeurIPS 2024", "Proc. of ICRA 2025"
+        comment: 예) "Accepted at CVPR 2025", "To appear in ICLR", "NIPS'17 workshop"
+
+    Returns:
+        VenueInfo (학회가 없으면 모든 필드가 빈 값)
+    """
+    original = f"{journal_ref} {comment}"
+    text = original.translate(_ASCII_LOWER)
+    best = None
+    best_rank = len(MAJOR_CONFERENCES)
+    for m in _VENUE_RE.finditer(text):
+        alias = " ".join(m.group("alias").split())
+        conf = _ALIAS_TO_CONF[alias]
+        rank = _CONF_RANK[conf]
+        if rank >= best_rank or _in_url(text, m.start()):
+            continue
+        if alias in _SHORT_ALIASES and not _short_alias_ok(m, original, text, len(journal_ref)):
+            continue
+        best, best_rank = m, rank
+    if best is None:
+        return VenueInfo()
+
+    if best.group("year4"):
+        year = int(best.group("year4"))
+    elif best.group("year2"):
+        year = 2000 + int(best.group("year2"))
+    else:
+        # 별칭 바로 뒤에 연도가 없으면 학회명 이후의 첫 연도 (예: "ICRA, Yokohama, 2024")
+        found = _YEAR_RE.search(text, best.end()) or _YEAR_RE.search(text)
+        year = int(found.group()) if found else 0
+
+    status = ""
+    for m in _STATUS_RE.finditer(text):
+        kind = m.lastgroup
+        if kind == "workshop":
+            status = "workshop"     # 워크숍 표기가 있으면 본 학회 채택보다 우선
+            break
+        # 우선순위: workshop > to_appear > accepted > submitted
+        if not status or kind == "to_appear" or (kind == "accepted" and status == "submitted"):
+            status = kind
+    if not status and journal_ref.strip():
+        status = "accepted"         # journal_ref에 학회가 적혀 있으면 출판된 것으로 봄
+
+    return VenueInfo(MAJOR_CONFERENCES[best_rank], year, status)
+
+
+def _in_url(text: str, pos: int) -> bool:
+    """pos를 품은 공백 단위 토큰이 URL·도메인·파일 경로면 True."""
+    start = max(text.rfind(ch, 0, pos) for ch in " \t\n") + 1
+    ends = [i for i in (text.find(ch, pos) for ch in " \t\n") if i >= 0]
+    return _URL_TOKEN_RE.search(text[start:min(ends, default=len(text))]) is not None
+
+
+def _short_alias_ok(m: "re.Match", original: str, text: str, ref_len: int) -> bool:
+    """짧은 별칭 매치가 학회 표기인지 판단합니다.
+
+    바로 뒤에 연도가 붙어 있으면("icra 2024", "AAAI-24") 대소문자와 무관하게 인정합니다.
+    아니면 원문에서 대문자(또는 별칭 표 표기, 예: "CoRL")로 적혀 있고, journal_ref 안이거나
+    학회를 가리키는 문맥("Accepted at ACL", "ACL Findings", "ICRA, Yokohama, 2024")이 있어야
+    합니다. "uses the ACL anthology" 같은 일반 문장은 학회로 보지 않습니다.
+    """
+    if m.group("year4") or m.group("year2"):
+        return True
+    written = original[m.start("alias"):m.end("alias")]
+    if not (written.isupper() or written == _SHORT_ALIASES[m.group("alias")]):
+        return False
+    if m.start() < ref_len:
+        return True
+    return bool(
+        _CONTEXT_BEFORE_RE.search(text, max(0, m.start() - _CONTEXT_BEFORE), m.start())
+        or _CONTEXT_AFTER_RE.match(text, m.end())
+        or _YEAR_RE.search(text, m.end(), m.end() + _YEAR_AFTER)
+    )
 
 
 def extract_conference(journal_ref: str, comment: str) -> str:
@@ -53,14 +246,7 @@ def extract_conference(journal_ref: str, comment: str) -> str:
     Returns:
         추출된 학회명 (없으면 빈 문자열)
     """
-    text = f"{journal_ref} {comment}".upper()
-    
-    for conf in MAJOR_CONFERENCES:
-        # 대소문자 구분 없이 학회명 검색
-        if re.search(rf"\b{conf}\b", text, re.IGNORECASE):
-            return conf
-    
-    return ""
+    return parse_venue(journal_ref, comment).conference
 
 
 def fetch_citation_count(arxiv_id: str) -> int:
@@ -72,39 +258,41 @@ def fetch_citation_count(arxiv_id: str) -> int:
     Returns:
         인용수 (실패 시 0)
     """
-    # arXiv ID에서 버전 제거 (예: 2401.12345v1 → 2401.12345)
-    clean_id = arxiv_id.split('v')[0] if 'v' in arxiv_id else arxiv_id
-    
-    url = f"https://api.semanticscholar.org/graph/v1/paper/ARXIV:{clean_id}"
-    params = {"fields": "citationCount"}
-    
-    try:
-        response = requests.get(url, params=params, timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            return data.get("citationCount", 0) or 0
-        elif response.status_code == 404:
-            # Semantic Scholar에 아직 인덱싱되지 않은 논문
-            return 0
-        else:
-            return 0
-    except Exception as e:
-        print(f"[citation] {arxiv_id} 인용수 가져오기 실패: {e}")
+    count = get_citation_resolver().fetch_one(arxiv_id)
+    if count is None:
+        print(f"[citation] {arxiv_id} 인용수 가져오기 실패")
         return 0
+    return count
 
 
-def fetch_citations_batch(papers: List[Paper], delay: float = 0.1) -> None:
+def fetch_citations_batch(papers: List[Paper], delay: float = 0.1, use_cache: bool = True) -> None:
     """여러 논문의 인용수를 배치로 가져와 Paper 객체에 채웁니다.
     
+    Semantic Scholar ``/paper/batch`` 엔드포인트로 한 번에 조회하고,
+    배치에서 누락된 논문만 단건으로 재조회합니다 (citations.CitationResolver).
+    use_cache=True면 MongoDB 인용수 캐시에 유효한 값이 있는 논문은 조회를 건너뜁니다.
+    
     Args:
         papers: Paper 객체 리스트 (in-place로 수정됨)
-        delay: API 호출 간 지연 시간 (초)
+        delay: 하위 호환용 (요청 간격은 CitationResolver가 429 응답에 맞춰 조절)
+        use_cache: 인용수 캐시 사용 여부 (MongoDB 연결 실패 시 자동으로 미사용)
     """
-    for i, paper in enumerate(papers):
-        paper.citation_count = fetch_citation_count(paper.id)
-        if (i + 1) % 10 == 0:
-            print(f"[citation] {i + 1}/{len(papers)}편 처리 중...")
-        time.sleep(delay)  # API rate limit 준수
+    if use_cache:
+        try:
+            from .citation_cache import fill_citations
+            fill_citations(papers)
+            return
+        except Exception as e:
+            print(f"[citation] 캐시 사용 불가 ({e}) → API로 직접 조회")
+
+    resolver = get_citation_resolver()
+    counts = resolver.resolve(p.id for p in papers)
+    for paper in papers:
+        paper.citation_count = counts.get(canonical_id(paper.id), 0)
+    print(
+        f"[citation] {len(counts)}/{len(papers)}편 조회 완료 "
+        f"(요청 {resolver.requests}회, 429/재시도 {resolver.throttled}회)"
+    )
 
 
 def filter_by_conference(papers: List[Paper], conferences: List[str] = None) -> List[Paper]:
@@ -135,79 +323,13 @@ def fetch_recent_papers(max_results: int = MAX_FETCH) -> List[Paper]:
     이후 select_papers_with_criteria()에서 조건에 맞게 선택할 수 있도록 합니다.
     
     학회지 논문 확보를 위해 각 년도당 100개씩 수집합니다.
+    연도 그룹은 공용 rate limiter를 거쳐 동시에 수집됩니다 (fetch_buckets 참고).
     """
-    current_year = datetime.now().year
-    client = arxiv.Client(page_size=50, delay_seconds=10, num_retries=3)
-    
+    buckets = [(label, start, end) for label, start, end, _ in _year_buckets()]
+
     all_papers: List[Paper] = []
-    
-    # ── 최근 (올해, 최대 100개) ──
-    year0_query = f"{SEARCH_QUERY} AND submittedDate:[{current_year}0101 TO {current_year}1231]"
-    year0_search = arxiv.Search(
-        query=year0_query,
-        max_results=100,
-        sort_by=arxiv.SortCriterion.SubmittedDate,
-        sort_order=arxiv.SortOrder.Descending,
-    )
-    
-    year0_papers = []
-    for result in client.results(year0_search):
-        year0_papers.append(_create_paper_from_result(result))
-    
-    all_papers.extend(year0_papers)
-    print(f"[fetch] 최근 ({current_year}년): {len(year0_papers)}개 수집")
-    time.sleep(10)  # arXiv API rate limit 방지
-    
-    # ── 1년전 (최대 100개) ──
-    year1_query = f"{SEARCH_QUERY} AND submittedDate:[{current_year-1}0101 TO {current_year-1}1231]"
-    year1_search = arxiv.Search(
-        query=year1_query,
-        max_results=100,
-        sort_by=arxiv.SortCriterion.SubmittedDate,
-        sort_order=arxiv.SortOrder.Descending,
-    )
-    
-    year1_papers = []
-    for result in client.results(year1_search):
-        year1_papers.append(_create_paper_from_result(result))
-    
-    all_papers.extend(year1_papers)
-    print(f"[fetch] 1년전 ({current_year-1}년): {len(year1_papers)}개 수집")
-    time.sleep(10)  # arXiv API rate limit 방지
-    
-    # ── 2년전 (최대 100개) ──
-    year2_query = f"{SEARCH_QUERY} AND submittedDate:[{current_year-2}0101 TO {current_year-2}1231]"
-    year2_search = arxiv.Search(
-        query=year2_query,
-        max_results=100,
-        sort_by=arxiv.SortCriterion.SubmittedDate,
-        sort_order=arxiv.SortOrder.Descending,
-    )
-    
-    year2_papers = []
-    for result in client.results(year2_search):
-        year2_papers.append(_create_paper_from_result(result))
-    
-    all_papers.extend(year2_papers)
-    print(f"[fetch] 2년전 ({current_year-2}년): {len(year2_papers)}개 수집")
-    time.sleep(10)  # arXiv API rate limit 방지
-    
-    # ── 3~4년전 (최대 100개) ──
-    year34_query = f"{SEARCH_QUERY} AND submittedDate:[{current_year-4}0101 TO {current_year-3}1231]"
-    year34_search = arxiv.Search(
-        query=year34_query,
-        max_results=100,
-        sort_by=arxiv.SortCriterion.SubmittedDate,
-        sort_order=arxiv.SortOrder.Descending,
-    )
-    
-    year34_papers = []
-    for result in client.results(year34_search):
-        year34_papers.append(_create_paper_from_result(result))
-    
-    all_papers.extend(year34_papers)
-    print(f"[fetch] 3~4년전 ({current_year-4}-{current_year-3}년): {len(year34_papers)}개 수집")
-    
+    for fetched in fetch_buckets(buckets, max_results=100):
+        all_papers.extend(fetched.papers)
     return all_papers
 
 
@@ -337,90 +459,86 @@ def _select_papers_simple(candidates: List[Paper], quota: int, year_label: str)
 def fetch_and_select_papers(seen: Set[str]) -> List[Paper]:
     """arXiv 수집 + 중복 필터링 + 조건 선택을 통합 실행합니다.
 
-    각 년도별로 순차적으로:
-      1) 주요 학회지 우선 순위로 정렬
-      2) 중복(seen) 확인하며 선택
-      3) 할당량 채울 때까지 반복
+    모든 연도 그룹을 공용 rate limiter를 거쳐 동시에 스트리밍 수집하면서,
+    각 그룹마다:
+      1) 페이지를 필요한 만큼만 받아 중복(seen) 논문을 건너뜀
+      2) 1순위 학회(관련도 모델이 있으면 예측 만점까지) 논문만으로 할당량이 차면 즉시 중단,
+         아니면 기본 창(FETCH_WINDOW편)까지 보고, 중복으로 후보가 부족할 때만 더 페이징
+      3) 주요 학회지 우선 순위로 정렬해 할당량만큼 선택
+
+    로컬 관련도 모델(relevance.py)이 학습되어 있으면 수집 중에 예측 점수가
+    RELEVANCE_MIN_SCORE 미만인 후보를 빼고, 같은 학회 우선순위 안에서는 예측 점수
+    순으로 골라 관련 있어 보이는 상위 논문만 LLM 트리아지로 보냅니다.
 
     할당량: 최근 6편 / 1년전 9편 / 2년전 6편 / 3~4년전 9편 (총 30편)
 
     Args:
-        seen: 이미 처리된 논문 ID 집합 (선택된 논문 ID가 in-place로 추가됨)
+        seen: 이미 처리된 논문 ID 집합 또는 state.SeenIndex (선택된 논문 ID가 in-place로 추가됨)
 
     Returns:
         조건을 만족하는 논문 리스트
     """
-    current_year = datetime.now().year
-    client = arxiv.Client(page_size=50, delay_seconds=10, num_retries=3)
-
     # (레이블, 검색 시작 연도, 검색 종료 연도, 할당량)
-    year_configs = [
-        ("최근",    current_year,     current_year,     6),
-        ("1년전",   current_year - 1, current_year - 1, 9),
-        ("2년전",   current_year - 2, current_year - 2, 6),
-        ("3~4년전", current_year - 4, current_year - 3, 9),
-    ]
+    year_configs = _year_buckets()
+
+    # ── 1. 연도 그룹 동시 수집 (전체 소요 시간은 rate limit이 결정) ──
+    # 쿼리별 high-water mark부터 이어서 수집 (저장소 사용 불가 시 처음부터)
+    try:
+        from .state import load_harvest_marks
+        marks = load_harvest_marks()
+    except Exception as e:
+        print(f"[fetch] high-water mark 로드 실패 ({e}) → 처음부터 수집")
+        marks = None
+
+    try:
+        from .relevance import get_relevance_model
+        relevance = get_relevance_model()
+    except ImportError as e:
+        print(f"[relevance] numpy 미설치 ({e}) → 관련도 게이트 없이 선택")
+        relevance = None
+
+    fetched = fetch_buckets(
+        [(label, start, end) for label, start, end, _ in year_configs],
+        max_results=FETCH_WINDOW,
+        marks=marks,
+        seen=seen,
+        quotas=[quota for *_, quota in year_configs],
+        relevance=relevance,
+    )
 
     all_selected: List[Paper] = []
 
-    for label, year_start, year_end, quota in year_configs:
+    for (label, year_start, year_end, quota), bucket in zip(year_configs, fetched):
         print(f"\n[fetch+select] === {label} ({year_start}~{year_end}년) 목표 {quota}편 ===")
 
-        # ── 1. 해당 연도 논문 수집 ──
-        query = (
-            f"{SEARCH_QUERY} AND "
-            f"submittedDate:[{year_start}0101 TO {year_end}1231]"
-        )
-        search = arxiv.Search(
-            query=query,
-            max_results=100,
-            sort_by=arxiv.SortCriterion.SubmittedDate,
-            sort_order=arxiv.SortOrder.Descending,
+        conf_total = sum(1 for p in bucket.papers if p.conference)
+        print(
+            f"  수집: {bucket.scanned}편 중 미처리 후보 {len(bucket.papers)}편 "
+            f"(학회지: {conf_total}편 / 중복 건너뜀: {bucket.skipped}편"
+            + (f" / 관련도 미달: {bucket.gated}편" if bucket.gated else "") + ")"
         )
 
-        papers: List[Paper] = []
-        for result in client.results(search):
-            papers.append(_create_paper_from_result(result))
-
-        conf_total = sum(1 for p in papers if p.conference)
-        print(f"  수집: {len(papers)}편 (학회지: {conf_total}편)")
-
-        # ── 2. 주요 학회지 우선 순위로 정렬 ──
-        # MAJOR_CONFERENCES 리스트 인덱스가 낮을수록 우선순위 높음
-        # 동일 우선순위 내에서는 제출일 최신순(arxiv 검색 결과 순) 유지
-        def _conf_priority(paper: Paper) -> int:
-            if paper.conference and paper.conference in MAJOR_CONFERENCES:
-                return MAJOR_CONFERENCES.index(paper.conference)
-            return len(MAJOR_CONFERENCES)   # 비학회지는 맨 뒤
-
-        sorted_papers = sorted(papers, key=_conf_priority)
-
-        # ── 3. 중복 확인하며 할당량까지 순차 선택 (반복) ──
+        # ── 2. 주요 학회지 우선 순위로 선택 (worker에서 정렬됨) ──
         selected: List[Paper] = []
-        skipped = 0
-        for paper in sorted_papers:
-            if len(selected) >= quota:
-                break
+        for paper in bucket.selected:
             if paper.id in seen:
-                skipped += 1
                 continue
             selected.append(paper)
             seen.add(paper.id)   # 이후 연도 그룹에서 중복 방지
 
         conf_count = sum(1 for p in selected if p.conference)
-        print(
-            f"  선택: {len(selected)}/{quota}편 "
-            f"(학회지: {conf_count}편 / 중복 건너뜀: {skipped}편)"
-        )
+        print(f"  선택: {len(selected)}/{quota}편 (학회지: {conf_count}편)")
         if len(selected) < quota:
             print(f"  ⚠️ 경고: 후보 부족으로 {len(selected)}/{quota}편만 확보")
 
         all_selected.extend(selected)
-        
-        # arXiv API rate limit 방지를 위해 다음 연도 검색 전 대기
-        if label != year_configs[-1][0]:  # 마지막 연도가 아닌 경우
-            print("  (다음 연도 검색 전 10초 대기...)")
-            time.sleep(10)
+
+    if marks is not None:
+        try:
+            from .state import save_harvest_marks
+            save_harvest_marks({k: m for b in fetched for k, m in b.marks.items()})
+        except Exception as e:
+            print(f"[fetch] high-water mark 저장 실패: {e}")
 
     total_conf = sum(1 for p in all_selected if p.conference)
     print(
@@ -428,7 +546,7 @@ def fetch_and_select_papers(seen: Set[str]) -> List[Paper]:
         f"(학회지: {total_conf}편)"
     )
     
-    # ── 4. 인용수 가져오기 ──
+    # ── 3. 인용수 가져오기 ──
     if all_selected:
         print(f"\n[citation] Semantic Scholar에서 인용수 조회 중...")
         fetch_citations_batch(all_selected)
@@ -436,16 +554,429 @@ def fetch_and_select_papers(seen: Set[str]) -> List[Paper]:
     return all_selected
 
 
+def _conf_priority(paper: Paper) -> int:
+    """MAJOR_CONFERENCES 리스트 인덱스가 낮을수록 우선순위 높음 (비학회지는 맨 뒤)."""
+    return _CONF_RANK.get(paper.conference, len(MAJOR_CONFERENCES))
+
+
+def _selection_key(paper: Paper) -> Tuple[int, float]:
+    """학회 우선순위 → 로컬 관련도 예측 점수 높은 순 (모델이 없으면 모두 0이라 기존 순서 유지)."""
+    return _conf_priority(paper), -paper.relevance
+
+
+# ── 연도 그룹 동시 수집 ──────────────────────────────────────────────────────
+
+class RateLimitedClient(arxiv.Client):
+    """공용 TokenBucket을 거쳐 페이지를 요청하는 arxiv.Client.
+
+    arxiv.Client 자체의 delay_seconds 대기는 끄고, 페이지 요청(재시도 포함)마다
+    limiter 토큰을 받습니다. 스레드마다 client를 따로 만들어도 전체 요청 속도는
+    limiter 하나로 제한됩니다.
+
+    on_page가 주어지면 페이지를 받을 때마다 그 페이지의 논문 ID 목록으로 호출합니다
+    (SeenIndex.prefetch: 페이지 단위로 한 번에 seen 확인).
+    relevance(RelevanceModel)가 주어지면 페이지 전체의 관련도를 predict 한 번으로 계산해
+    page_scores({논문 ID: 점수})에 둡니다.
+    """
+
+    def __init__(
+        self, limiter: TokenBucket, page_size: int = 50, num_retries: int = 3,
+        on_page: Optional[Callable[[List[str]], None]] = None, relevance=None,
+    ):
+        super().__init__(page_size=page_size, delay_seconds=0, num_retries=num_retries)
+        self._session = CachedSession()   # 디스크 응답 캐시 (http_cache)
+        self.limiter = limiter
+        self.on_page = on_page
+        self.relevance = relevance
+        self.page_scores: Dict[str, float] = {}
+        self.requests = 0          # 실제 보낸 페이지 요청 수
+        self.cache_hits = 0        # 캐시에서 읽은 페이지 수
+        self.wait_seconds = 0.0    # rate limit 대기 누적 시간
+
+    def _parse_feed(self, url, first_page=True, _try_index=0):
+        # 캐시에 있는 페이지(또는 오프라인 모드)는 arXiv에 요청하지 않으므로 토큰 불필요
+        if is_offline() or self._session.cached_response("GET", url) is not None:
+            self.cache_hits += 1
+        else:
+            self.wait_seconds += self.limiter.acquire()
+            self.requests += 1
+        feed = super()._parse_feed(url, first_page=first_page, _try_index=_try_index)
+        if _try_index == 0 and (self.on_page is not None or self.relevance is not None):
+            items = _feed_items(feed)
+            if items and self.on_page is not None:
+                self.on_page([pid for pid, _, _ in items])
+            if items and self.relevance is not None:
+                scores = self.relevance.score_texts([(title, abstract) for _, title, abstract in items])
+                self.page_scores.update(zip((pid for pid, _, _ in items), scores))
+        return feed
+
+
+def _clean_text(title: str, summary: str) -> Tuple[str, str]:
+    return title.replace("\n", " ").strip(), summary.replace("\n", " ").strip()
+
+
+def _feed_items(feed) -> List[Tuple[str, str, str]]:
+    """한 페이지의 (논문 ID, 제목, 초록) (arxiv 4.x: ParsedFeed.results / 2.x: feedparser entries)."""
+    results = getattr(feed, "results", None)
+    if results is not None:
+        return [(result.get_short_id(), *_clean_text(result.title, result.summary)) for result in results]
+    return [(entry.id.split("arxiv.org/abs/")[-1], *_clean_text(entry.title, entry.summary))
+            for entry in feed.entries]
+
+
+@dataclass
+class BucketFetch:
+    """연도 그룹 하나의 수집 결과와 소요 시간."""
+    label: str
+    year_start: int
+    year_end: int
+    papers: List[Paper]         # 수집한 후보 (seen이 주어지면 미처리 논문만)
+    latency: float = 0.0        # 수집 시작~종료 (초)
+    wait_seconds: float = 0.0   # 그중 rate limit 대기 시간 (초)
+    requests: int = 0
+    cache_hits: int = 0
+    key: str = ""               # high-water mark 키 (쿼리별)
+    mark: Optional[dict] = None # 이번 수집 후의 high-water mark (증분 수집 시)
+    new_count: int = 0          # 지난 실행 이후 새로 올라온 논문 수
+    scanned: int = 0            # 실제로 훑은 검색 결과 수
+    skipped: int = 0            # seen이라 건너뛴 수
+    filtered: int = 0           # 로컬 키워드 필터에서 탈락한 수 (KEYWORD_FILTER="local")
+    gated: int = 0              # 로컬 관련도 예측 점수 미달로 탈락한 수 (RELEVANCE_MIN_SCORE)
+    selected: List[Paper] = field(default_factory=list)  # 할당량만큼 선택된 논문 (quota 지정 시)
+    marks: Dict[str, dict] = field(default_factory=dict)  # 샤드별 {키: high-water mark} (병합 결과)
+    shards: int = 1             # 병합된 샤드 수
+
+
+def _year_buckets() -> List[Tuple[str, int, int, int]]:
+    """(레이블, 검색 시작 연도, 검색 종료 연도, 할당량) 목록을 반환합니다."""
+    current_year = datetime.now().year
+    return [
+        ("최근",    current_year,     current_year,     6),
+        ("1년전",   current_year - 1, current_year - 1, 9),
+        ("2년전",   current_year - 2, current_year - 2, 6),
+        ("3~4년전", current_year - 4, current_year - 3, 9),
+    ]
+
+
+def _harvest_key(query: str) -> str:
+    """쿼리 문자열(연도 범위 포함)별 high-water mark 키."""
+    return hashlib.sha1(query.encode("utf-8")).hexdigest()[:16]
+
+
+def _search(query: str, max_results: int) -> arxiv.Search:
+    return arxiv.Search(
+        query=query,
+        max_results=max_results,
+        sort_by=arxiv.SortCriterion.SubmittedDate,
+        sort_order=arxiv.SortOrder.Descending,
+    )
+
+
+class _BucketStream:
+    """한 연도 그룹의 검색 결과를 한 편씩 내주는 지연(lazy) 스트림.
+
+    페이지는 소비자가 다음 논문을 요구할 때만 요청됩니다. mark가 있으면
+      1) head: 맨 앞에서부터 mark의 최신 논문(newest_id/newest_published)에
+         닿을 때까지 = 지난 실행 이후 새로 올라온 논문
+      2) tail: 지난 실행이 멈춘 위치(offset + 새 논문 수)부터 이어서
+    순서로 내주므로, 이미 가져간 구간을 다시 내려받지 않습니다.
+    소비를 멈춘 위치까지를 next_mark()로 기록합니다.
+    """
+
+    def __init__(self, client: arxiv.Client, query: str, mark: Optional[dict], max_scan: int):
+        self.client = client
+        self.query = query
+        self.mark = mark
+        self.max_scan = max_scan
+        self.newest = None          # 이번에 본 가장 최신 result
+        self.reached_mark = False
+        self.new_count = 0
+        self.tail = 0
+        self.tail_exhausted = False
+        self.scanned = 0
+
+    def __iter__(self) -> Iterator[Paper]:
+        mark = self.mark
+        # ── 1. head: 새로 올라온 논문 ──
+        for result in self.client.results(_search(self.query, self.max_scan)):
+            if self.newest is None:
+                self.newest = result
+            if mark and (
+                result.get_short_id() == mark["newest_id"]
+                or result.published.isoformat() <= mark["newest_published"]
+            ):
+                self.reached_mark = True
+                break
+            self.scanned += 1
+            if mark:
+                self.new_count += 1
+            yield _create_paper_from_result(result)
+
+        if not (mark and self.reached_mark):
+            return
+
+        # ── 2. tail: 지난 실행이 멈춘 위치부터 ──
+        remaining = self.max_scan - self.scanned
+        if remaining <= 0:
+            return
+        offset = mark["offset"] + self.new_count
+        for result in self.client.results(_search(self.query, offset + remaining), offset=offset):
+            self.scanned += 1
+            self.tail += 1
+            yield _create_paper_from_result(result)
+        self.tail_exhausted = self.tail < remaining
+
+    def next_mark(self) -> Optional[dict]:
+        if self.newest is None:
+            return self.mark
+        if self.mark and self.reached_mark:
+            if self.tail_exhausted and self.tail == 0:
+                # 이 그룹의 과거 논문을 끝까지 훑었음 → 다음 실행은 새 논문 다음부터 다시
+                print("[fetch] 과거 논문 소진 → 다음 실행은 처음부터 다시 순회")
+                offset = self.new_count
+            else:
+                offset = self.mark["offset"] + self.new_count + self.tail
+        else:
+            # 첫 실행이거나 mark까지 닿기 전에 멈춘 경우: 소비한 만큼이 다음 위치
+            offset = self.scanned
+        return {
+            "newest_id": self.newest.get_short_id(),
+            "newest_published": self.newest.published.isoformat(),
+            "offset": offset,
+            "query": self.query,
+        }
+
+
+def _bucket_query(base_query: str, year_start: int, year_end: int) -> str:
+    return f"{base_query} AND submittedDate:[{year_start}0101 TO {year_end}1231]"
+
+
+def _fetch_bucket(
+    label: str, year_start: int, year_end: int, max_results: int,
+    mark: Optional[dict] = None, incremental: bool = False,
+    seen: Optional[Set[str]] = None, quota: Optional[int] = None,
+    shard: Optional[QueryShard] = None, max_scan: int = FETCH_MAX_SCAN,
+    relevance=None,
+) -> BucketFetch:
+    """한 연도 그룹(의 한 샤드)을 최신 제출순으로 수집합니다 (워커 스레드에서 실행).
+
+    quota가 없으면 max_results편을 그대로 수집합니다.
+    quota가 있으면 스트리밍 선택기로 동작합니다:
+      - seen에 있는 논문은 건너뜀
+      - 가장 좋은 선택 키(_selection_key: 1순위 학회, 관련도 만점)인 후보가 quota편 모이면
+        즉시 중단 (뒤에서 더 좋은 후보가 나올 수 없고, 같은 키는 먼저 본 논문이 선택됨)
+      - 아니면 max_results편(기본 창)을 끝까지 본 뒤, 미처리 후보가 quota 이상이면 중단
+      - 중복으로 후보가 부족할 때만 max_scan편까지 계속 페이징
+
+    shard가 주어지면 SEARCH_QUERY 대신 샤드 쿼리로 검색하고, 수집한 논문의
+    topics에 샤드 이름을 기록합니다. shard.local_filter면 TOPIC_KEYWORDS가
+    하나도 없는 논문은 후보에서 제외합니다 (검색식에 키워드 절이 없으므로).
+
+    relevance(RelevanceModel)가 주어지면 받은 페이지마다 한 번에 관련도를 예측해
+    (RateLimitedClient.page_scores) RELEVANCE_MIN_SCORE 미만은 후보에서 빼고(할당량·조기 중단 계산에서도 제외), 선택 시 같은 학회
+    우선순위 안에서는 예측 점수가 높은 순으로 고릅니다.
+    """
+    page_size = min(ARXIV_PAGE_SIZE, max_results)
+    seen = seen if seen is not None else set()
+    client = RateLimitedClient(
+        get_arxiv_limiter(), page_size=page_size, on_page=getattr(seen, "prefetch", None), relevance=relevance,
+    )
+    query = _bucket_query(shard.query if shard else SEARCH_QUERY, year_start, year_end)
+    max_scan = max(max_results, max_scan) if quota is not None else max_results
+    stream = _BucketStream(client, query, mark if incremental else None, max_scan)
+    started = time.monotonic()
+
+    papers: List[Paper] = []
+    skipped = 0
+    filtered = 0
+    gated = 0
+    # 가능한 가장 좋은 선택 키 (모델이 없으면 관련도는 모두 0)
+    best_key = (0, -relevance.MAX_SCORE) if relevance is not None else (0, 0.0)
+    best = 0
+    local_filter = shard is not None and shard.local_filter
+    try:
+        for paper in stream:
+            if paper.id in seen:
+                skipped += 1
+                continue
+            if local_filter and not paper.keyword_hits:
+                filtered += 1
+                continue
+            if relevance is not None:
+                paper.relevance = client.page_scores.pop(paper.id, 0.0)
+                if paper.relevance < RELEVANCE_MIN_SCORE:
+                    gated += 1
+                    continue
+            if shard and shard.name:
+                paper.topics.append(shard.name)
+            papers.append(paper)
+            if quota is None:
+                continue
+            if _selection_key(paper) <= best_key:
+                best += 1
+            if best >= quota:
+                break
+            if stream.scanned >= max_results and len(papers) >= quota:
+                break
+    except OfflineCacheMiss:
+        where = f"{label}/{shard.name}" if shard and shard.name else label
+        print(f"[fetch] {where}: 오프라인 모드 - 캐시된 페이지까지만 사용")
+
+    # 동일 우선순위 내에서는 제출일 최신순(arxiv 검색 결과 순) 유지 (stable sort)
+    selected = sorted(papers, key=_selection_key)[:quota] if quota is not None else []
+    next_mark = stream.next_mark() if incremental else None
+    key = _harvest_key(query)
+
+    return BucketFetch(
+        label=label,
+        year_start=year_start,
+        year_end=year_end,
+        papers=papers,
+        latency=time.monotonic() - started,
+        wait_seconds=client.wait_seconds,
+        requests=client.requests,
+        cache_hits=client.cache_hits,
+        key=key,
+        mark=next_mark,
+        new_count=stream.new_count,
+        scanned=stream.scanned,
+        skipped=skipped,
+        filtered=filtered,
+        gated=gated,
+        selected=selected,
+        marks={key: next_mark} if next_mark else {},
+    )
+
+
+def _merge_shards(parts: List[BucketFetch], quota: Optional[int]) -> BucketFetch:
+    """같은 연도 그룹의 샤드별 결과를 하나로 합칩니다.
+
+    여러 샤드에 걸린 논문은 정규 ID(버전 제외)로 한 번만 남기고 topics를 합칩니다.
+    합친 후보는 제출일 최신순으로 다시 정렬한 뒤 학회 우선순위로 quota만큼 선택합니다.
+    """
+    if len(parts) == 1:
+        return parts[0]
+
+    merged: Dict[str, Paper] = {}
+    for part in parts:
+        for paper in part.papers:
+            cid = canonical_id(paper.id)
+            kept = merged.get(cid)
+            if kept is None:
+                merged[cid] = paper
+            else:
+                kept.topics.extend(t for t in paper.topics if t not in kept.topics)
+
+    papers = sorted(merged.values(), key=lambda p: p.published, reverse=True)
+    selected = sorted(papers, key=_selection_key)[:quota] if quota is not None else []
+    first = parts[0]
+    return BucketFetch(
+        label=first.label,
+        year_start=first.year_start,
+        year_end=first.year_end,
+        papers=papers,
+        latency=max(p.latency for p in parts),
+        wait_seconds=sum(p.wait_seconds for p in parts),
+        requests=sum(p.requests for p in parts),
+        cache_hits=sum(p.cache_hits for p in parts),
+        new_count=sum(p.new_count for p in parts),
+        scanned=sum(p.scanned for p in parts),
+        skipped=sum(p.skipped for p in parts),
+        filtered=sum(p.filtered for p in parts),
+        gated=sum(p.gated for p in parts),
+        selected=selected,
+        marks={k: m for p in parts for k, m in p.marks.items()},
+        shards=len(parts),
+    )
+
+
+def fetch_buckets(
+    buckets: List[Tuple[str, int, int]],
+    max_results: int = 100,
+    marks: Optional[Dict[str, dict]] = None,
+    seen: Optional[Set[str]] = None,
+    quotas: Optional[List[int]] = None,
+    shards: Optional[List[QueryShard]] = None,
+    relevance=None,
+) -> List[BucketFetch]:
+    """여러 연도 그룹 × 쿼리 샤드 검색을 동시에 실행합니다.
+
+    QUERY_SHARDING이 켜져 있으면 검색식을 주제(또는 카테고리)별 샤드로 나눠(query_planner.plan_shards)
+    (연도 그룹, 샤드) 조합마다 하나씩 워커에 맡기고, 끝나면 연도 그룹별로
+    중복을 제거해 합칩니다. 모든 요청은 get_arxiv_limiter()의 토큰 버킷을
+    공유하므로 arXiv 정책(3초에 1회)은 샤드 수와 무관하게 지켜집니다.
+
+    샤드당 탐색 창은 max_results를 샤드 수로 나눈 값이라 전체 탐색량은 비슷하지만,
+    샤드마다 최소 한 페이지를 요청하므로 요청 수는 샤드 수만큼 늘 수 있습니다.
+
+    Args:
+        buckets: (레이블, 시작 연도, 종료 연도) 리스트
+        max_results: 그룹당 수집 수 (quotas 지정 시 기본 탐색 창)
+        marks: 쿼리별 high-water mark ({키: mark}). 주어지면 증분 수집하고,
+            갱신된 mark는 각 BucketFetch.marks로 돌려줍니다 (저장은 호출자 몫).
+        seen: 이미 처리된 논문 ID (읽기 전용, 건너뜀). SeenIndex면 페이지마다 한 번에 서버에서 확인
+        quotas: 그룹별 할당량. 주어지면 필요한 만큼만 페이징하는 스트리밍 선택
+        shards: 쿼리 샤드 목록 (기본: plan_shards(), 즉 config.QUERY_SHARDING)
+        relevance: 로컬 관련도 모델 (주어지면 예측 점수 미달 후보 제외, _fetch_bucket 참고)
+
+    Returns:
+        buckets 순서와 동일한 BucketFetch 리스트 (샤드 결과는 병합됨)
+    """
+    incremental = marks is not None
+    quotas = quotas or [None] * len(buckets)
+    shards = shards if shards is not None else plan_shards()
+    if len(shards) == 1 and shards[0].query == SEARCH_QUERY:
+        shards = [None]   # 샤딩 없음: 기존 쿼리/high-water mark 키 그대로
+    window = -(-max_results // len(shards))
+    max_scan = -(-FETCH_MAX_SCAN // len(shards))
+
+    tasks = [
+        (i, label, year_start, year_end, quota, shard)
+        for i, ((label, year_start, year_end), quota) in enumerate(zip(buckets, quotas))
+        for shard in shards
+    ]
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max(1, min(FETCH_WORKERS, len(tasks)))) as pool:
+        futures = []
+        for i, label, year_start, year_end, quota, shard in tasks:
+            query = _bucket_query(shard.query if shard else SEARCH_QUERY, year_start, year_end)
+            mark = marks.get(_harvest_key(query)) if incremental else None
+            futures.append((i, pool.submit(
+                _fetch_bucket, label, year_start, year_end, window,
+                mark, incremental, seen, quota, shard, max_scan, relevance,
+            )))
+        parts: List[List[BucketFetch]] = [[] for _ in buckets]
+        for i, future in futures:
+            parts[i].append(future.result())
+    elapsed = time.monotonic() - started
+
+    fetched = [_merge_shards(p, quota) for p, quota in zip(parts, quotas)]
+    for b in fetched:
+        resume = f" / 신규 {b.new_count}편" if incremental else ""
+        sharded = f" / 샤드 {b.shards}개 병합 후 {len(b.papers)}편" if b.shards > 1 else ""
+        local = f" / 키워드 미일치 {b.filtered}편 제외" if b.filtered else ""
+        local += f" / 관련도 미달 {b.gated}편 제외" if b.gated else ""
+        print(
+            f"[fetch] {b.label} ({b.year_start}~{b.year_end}년): {b.scanned}편 훑음{local}{sharded} "
+            f"/ 요청 {b.requests}회 (캐시 {b.cache_hits}회) / 소요 {b.latency:.1f}s (rate limit 대기 {b.wait_seconds:.1f}s)"
+            f"{resume}"
+        )
+    print(f"[fetch] 전체 수집 {elapsed:.1f}s ({len(tasks)}개 검색 동시 실행)")
+    return fetched
+
+
 def _create_paper_from_result(result) -> Paper:
     """arxiv.Result 객체를 Paper 객체로 변환합니다."""
     journal_ref = result.journal_ref or ""
     comment = result.comment or ""
-    conference = extract_conference(journal_ref, comment)
+    venue = parse_venue(journal_ref, comment)
+    title, abstract = _clean_text(result.title, result.summary)
+    hits = match_keywords(title, abstract)
     
     return Paper(
         id=result.get_short_id(),
-        title=result.title.replace("\n", " ").strip(),
-        abstract=result.summary.replace("\n", " ").strip(),
+        title=title,
+        abstract=abstract,
         authors=[a.name for a in result.authors[:3]],
         published=result.published.strftime("%Y-%m-%d"),
         arxiv_url=result.entry_id,
@@ -453,5 +984,9 @@ def _create_paper_from_result(result) -> Paper:
         categories=list(result.categories),
         journal_ref=journal_ref,
         comment=comment,
-        conference=conference,
+        conference=venue.conference,
+        venue_year=venue.year,
+        venue_status=venue.status,
+        keyword_hits=hits.keywords,
+        topic_hits=hits.topics,
     )
@@ -0,0 +1,208 @@
+"""OpenAI Files / Batches API의 로컬 대역 서버 (오프라인 테스트·개발용).
+
+triage_batch.py가 쓰는 엔드포인트만 구현합니다:
+  POST /v1/files                  요청 JSONL 업로드 (multipart)
+  GET  /v1/files/{id}/content     결과·오류 JSONL 다운로드
+  POST /v1/batches                배치 작업 생성
+  GET  /v1/batches/{id}           상태 확인 (validating → in_progress → completed)
+
+작업은 상태를 `polls`회 확인한 뒤 한꺼번에 처리되고, 각 요청은 responder(요청 body → 응답 JSON
+문자열, None이면 실패 처리)로 답합니다. 기본 responder는 키워드 매칭으로 태그·점수를 매기는
+결정적 모의 트리아지입니다.
+
+  python -m paper_briefing.batch_server --port 8765
+  OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=local python run_briefing.py --batch-triage
+"""
+
+from __future__ import annotations
+
+import argparse
+import email.parser
+import email.policy
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional
+
+from .providers import mock_response
+
+Responder = Callable[[dict], Optional[str]]
+
+
+def mock_triage(body: dict) -> Optional[str]:
+    """user 메시지의 논문마다 키워드 매칭 기반 결과를 만듭니다 (MockProvider와 같은 결과)."""
+    return mock_response(next(m["content"] for m in body["messages"] if m["role"] == "user"))
+
+
+class LocalBatchServer:
+    """Batch API 대역 서버 (with 문 또는 start()/stop())."""
+
+    def __init__(self, responder: Responder = mock_triage, polls: int = 2, port: int = 0):
+        self.responder = responder
+        self.polls = polls   # completed가 되기 전까지 상태 확인 횟수
+        self.files: Dict[str, bytes] = {}
+        self.batches: Dict[str, dict] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/v1"
+
+    def start(self) -> "LocalBatchServer":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "LocalBatchServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ── 상태 ──────────────────────────────────────────────────────────────
+    def _new_id(self, prefix: str) -> str:
+        return f"{prefix}-local{next(self._ids):04d}"
+
+    def _file_obj(self, file_id: str, purpose: str) -> dict:
+        return {"id": file_id, "object": "file", "bytes": len(self.files[file_id]),
+                "created_at": int(time.time()), "filename": f"{file_id}.jsonl",
+                "purpose": purpose, "status": "processed"}
+
+    def _create_batch(self, req: dict) -> dict:
+        file_id = req["input_file_id"]
+        if file_id not in self.files:
+            raise KeyError(file_id)
+        total = sum(1 for line in self.files[file_id].splitlines() if line.strip())
+        batch = {
+            "id": self._new_id("batch"), "object": "batch", "endpoint": req["endpoint"],
+            "input_file_id": file_id, "completion_window": req["completion_window"],
+            "status": "validating", "created_at": int(time.time()),
+            "output_file_id": None, "error_file_id": None, "metadata": req.get("metadata") or {},
+            "request_counts": {"total": total, "completed": 0, "failed": 0},
+            "_polls": 0,
+        }
+        self.batches[batch["id"]] = batch
+        return batch
+
+    def _poll(self, batch: dict) -> dict:
+        batch["_polls"] += 1
+        if batch["status"] == "validating":
+            batch["status"] = "in_progress"
+        elif batch["status"] == "in_progress" and batch["_polls"] >= self.polls:
+            self._run(batch)
+        return batch
+
+    def _run(self, batch: dict) -> None:
+        """요청 파일을 처리해 결과/오류 파일을 만듭니다."""
+        out, err = [], []
+        for line in self.files[batch["input_file_id"]].splitlines():
+            if not line.strip():
+                continue
+            req = json.loads(line)
+            content = self.responder(req["body"])
+            if content is None:
+                err.append({"id": self._new_id("resp"), "custom_id": req["custom_id"], "response": None,
+                            "error": {"code": "server_error", "message": "stand-in responder failed"}})
+                continue
+            prompt_tokens = sum(len(m.get("content") or "") for m in req["body"].get("messages", [])) // 4 + 1
+            completion_tokens = len(content) // 4 + 1
+            out.append({
+                "id": self._new_id("resp"), "custom_id": req["custom_id"], "error": None,
+                "response": {"status_code": 200, "request_id": self._new_id("req"), "body": {
+                    "id": self._new_id("chatcmpl"), "object": "chat.completion",
+                    "model": req["body"].get("model"),
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": content}}],
+                    "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                              "total_tokens": prompt_tokens + completion_tokens},   # 글자 수/4 근사
+                }},
+            })
+        for records, key in ((out, "output_file_id"), (err, "error_file_id")):
+            if records:
+                file_id = self._new_id("file")
+                self.files[file_id] = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records).encode()
+                batch[key] = file_id
+        batch["request_counts"].update(completed=len(out), failed=len(err))
+        batch["status"] = "completed"
+        batch["completed_at"] = int(time.time())
+
+    # ── HTTP ──────────────────────────────────────────────────────────────
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, data: bytes, content_type: str = "application/json"):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _json(self, status: int, body: dict):
+                public = {k: v for k, v in body.items() if not k.startswith("_")}
+                self._send(status, json.dumps(public).encode())
+
+            def _not_found(self):
+                self._json(404, {"error": {"message": f"not found: {self.path}", "type": "invalid_request_error"}})
+
+            def _body(self) -> bytes:
+                return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+            def do_POST(self):
+                with server._lock:
+                    if self.path == "/v1/files":
+                        # multipart/form-data → email 파서로 file / purpose 필드 분리
+                        raw = f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + self._body()
+                        msg = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(raw)
+                        fields = {part.get_param("name", header="content-disposition"): part.get_payload(decode=True)
+                                  for part in msg.iter_parts()}
+                        file_id = server._new_id("file")
+                        server.files[file_id] = fields["file"]
+                        return self._json(200, server._file_obj(file_id, fields.get("purpose", b"").decode()))
+                    if self.path == "/v1/batches":
+                        try:
+                            return self._json(200, server._create_batch(json.loads(self._body())))
+                        except KeyError:
+                            return self._json(400, {"error": {"message": "unknown input_file_id",
+                                                              "type": "invalid_request_error"}})
+                    self._not_found()
+
+            def do_GET(self):
+                with server._lock:
+                    parts = self.path.split("?", 1)[0].strip("/").split("/")
+                    if parts[:2] == ["v1", "batches"] and len(parts) == 3 and parts[2] in server.batches:
+                        return self._json(200, server._poll(server.batches[parts[2]]))
+                    if parts[:2] == ["v1", "files"] and len(parts) >= 3 and parts[2] in server.files:
+                        if parts[3:] == ["content"]:
+                            return self._send(200, server.files[parts[2]], "application/octet-stream")
+                        return self._json(200, server._file_obj(parts[2], "batch"))
+                    self._not_found()
+
+        return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="OpenAI Batch API 로컬 대역 서버")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--polls", type=int, default=2, help="완료까지 상태 확인 횟수")
+    args = parser.parse_args()
+    server = LocalBatchServer(polls=args.polls, port=args.port)
+    print(f"[batch-server] {server.base_url} (Ctrl+C로 종료)")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
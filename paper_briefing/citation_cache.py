@@ -0,0 +1,176 @@
+"""인용수 캐시 (MongoDB) - 정규 arXiv ID 기준, 논문 나이에 따른 TTL."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from pymongo import ASCENDING, UpdateMany, UpdateOne
+
+from .citations import get_citation_resolver
+from .config import (
+    CITATION_CACHE_COLLECTION,
+    CITATION_REFRESH_LIMIT,
+    CITATION_TTL_MAX_DAYS,
+    CITATION_TTL_RULES,
+)
+from .ids import canonical_id
+from .state import _get_collection, _get_db
+
+
+def citation_ttl(published: str, now: Optional[datetime] = None) -> timedelta:
+    """출판일("YYYY-MM-DD")로부터 캐시 TTL을 계산합니다.
+
+    최신 논문은 인용수가 빠르게 변하므로 짧게, 오래된 논문은 길게 유지합니다.
+    출판일을 알 수 없으면 가장 짧은 TTL을 사용합니다.
+    """
+    now = now or datetime.now()
+    try:
+        age_days = (now - datetime.strptime(published[:10], "%Y-%m-%d")).days
+    except (TypeError, ValueError):
+        return timedelta(days=CITATION_TTL_RULES[0][1])
+
+    for max_age, ttl_days in CITATION_TTL_RULES:
+        if age_days < max_age:
+            return timedelta(days=ttl_days)
+    return timedelta(days=CITATION_TTL_MAX_DAYS)
+
+
+def _get_cache():
+    return _get_db()[CITATION_CACHE_COLLECTION]
+
+
+def load_cached_citations(arxiv_ids: Iterable[str]) -> Dict[str, int]:
+    """만료되지 않은 캐시 항목만 {정규 ID: 인용수}로 반환합니다."""
+    ids = list({canonical_id(i) for i in arxiv_ids})
+    if not ids:
+        return {}
+    docs = _get_cache().find(
+        {"_id": {"$in": ids}, "expires_at": {"$gt": datetime.now()}},
+        {"count": 1},
+    )
+    return {doc["_id"]: doc["count"] for doc in docs}
+
+
+def store_citations(counts: Dict[str, int], published: Dict[str, str]) -> Dict[str, datetime]:
+    """조회한 인용수를 캐시에 저장합니다.
+
+    Args:
+        counts: {정규 ID: 인용수}
+        published: {정규 ID: 출판일} (TTL 계산용)
+
+    Returns:
+        {정규 ID: 만료 시각}
+    """
+    if not counts:
+        return {}
+    now = datetime.now()
+    expires = {cid: now + citation_ttl(published.get(cid, ""), now) for cid in counts}
+    _get_cache().bulk_write(
+        [
+            UpdateOne(
+                {"_id": cid},
+                {"$set": {"count": count, "fetched_at": now, "expires_at": expires[cid]}},
+                upsert=True,
+            )
+            for cid, count in counts.items()
+        ],
+        ordered=False,
+    )
+    return expires
+
+
+def fill_citations(papers: List) -> int:
+    """캐시를 먼저 확인하고, 없거나 만료된 논문만 Semantic Scholar로 조회합니다.
+
+    Args:
+        papers: Paper 객체 리스트 (citation_count가 in-place로 채워짐)
+
+    Returns:
+        API로 새로 조회한 논문 수
+    """
+    cached = load_cached_citations(p.id for p in papers)
+    misses = [p for p in papers if canonical_id(p.id) not in cached]
+
+    fetched: Dict[str, int] = {}
+    if misses:
+        fetched = get_citation_resolver().resolve(p.id for p in misses)
+        store_citations(fetched, {canonical_id(p.id): p.published for p in misses})
+
+    for paper in papers:
+        cid = canonical_id(paper.id)
+        paper.citation_count = cached.get(cid, fetched.get(cid, 0))
+
+    print(f"[citation] 캐시 적중 {len(papers) - len(misses)}편 / API 조회 {len(misses)}편")
+    return len(misses)
+
+
+def refresh_stored_citations(limit: int = CITATION_REFRESH_LIMIT) -> int:
+    """저장된 논문의 citation_count를 만료가 오래된 순으로 일괄 갱신합니다.
+
+    papers 컬렉션에서 ``citation_expires_at``이 지난 논문을 만료가 오래된 순으로 먼저,
+    남는 자리에 만료 시각이 없는 논문(기존 데이터·방금 저장된 논문)을 채워
+    최대 ``limit``편 골라, 캐시에 유효한 값이 있으면 그대로 쓰고 나머지는 배치 API로
+    조회한 뒤 ``bulk_write``로 반영합니다.
+
+    Returns:
+        갱신된 논문 수
+    """
+    papers_col = _get_collection()
+    now = datetime.now()
+
+    # 만료 시각이 없는 문서는 오름차순 정렬 시 맨 앞에 오므로 따로 조회해 뒤에 붙입니다.
+    # 새로 저장된 논문(인용수는 fill_citations에서 캐시와 함께 이미 조회됨)이 limit을
+    # 다 차지해 실제로 만료된 논문이 밀리지 않도록 합니다.
+    fields = {"id": 1, "published": 1, "_id": 0}
+    due = list(
+        papers_col.find({"citation_expires_at": {"$lte": now}}, fields)
+        .sort("citation_expires_at", ASCENDING)
+        .limit(limit)
+    )
+    if len(due) < limit:
+        due += list(papers_col.find({"citation_expires_at": None}, fields).limit(limit - len(due)))
+    if not due:
+        print("[citation] 갱신할 논문 없음")
+        return 0
+
+    ids_by_cid: Dict[str, List[str]] = defaultdict(list)
+    published: Dict[str, str] = {}
+    for doc in due:
+        cid = canonical_id(doc["id"])
+        ids_by_cid[cid].append(doc["id"])
+        published[cid] = doc.get("published", "")
+
+    cache = _get_cache()
+    counts: Dict[str, int] = {}
+    expires: Dict[str, datetime] = {}
+    for doc in cache.find({"_id": {"$in": list(ids_by_cid)}, "expires_at": {"$gt": now}}):
+        counts[doc["_id"]] = doc["count"]
+        expires[doc["_id"]] = doc["expires_at"]
+
+    to_fetch = [cid for cid in ids_by_cid if cid not in counts]
+    if to_fetch:
+        fetched = get_citation_resolver().resolve(to_fetch)
+        expires.update(store_citations(fetched, published))
+        counts.update(fetched)
+
+    ops = [
+        UpdateMany(
+            {"id": {"$in": ids_by_cid[cid]}},
+            {"$set": {
+                "citation_count": count,
+                "citation_expires_at": expires[cid],
+                "citation_updated_at": now,
+            }},
+        )
+        for cid, count in counts.items()
+    ]
+    if ops:
+        papers_col.bulk_write(ops, ordered=False)
+
+    print(
+        f"[citation] 저장 논문 인용수 갱신: {len(ops)}/{len(ids_by_cid)}편 "
+        f"(캐시 {len(ids_by_cid) - len(to_fetch)}편 / API 조회 {len(to_fetch)}편)"
+    )
+    return len(ops)
@@ -0,0 +1,216 @@
+"""Semantic Scholar API로 논문 인용수를 일괄 조회합니다."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import S2_API_URL, S2_BATCH_SIZE, S2_MAX_FAILURES, S2_MAX_RETRIES, S2_MIN_INTERVAL
+from .http_cache import CachedSession, OfflineCacheMiss
+from .ids import canonical_id
+
+# 재시도 대상 상태 코드 (429: rate limit, 5xx: 일시 장애)
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+_MAX_BACKOFF = 60.0
+
+
+class CitationResolver:
+    """Semantic Scholar 배치 엔드포인트 기반 인용수 조회기.
+
+    - ``POST /paper/batch`` 로 요청당 최대 ``batch_size``개 ID를 한 번에 조회
+    - 하나의 ``requests.Session`` (커넥션 풀 + 디스크 응답 캐시)을 재사용
+    - 429 응답 시 ``Retry-After``를 따르고, 없으면 요청 간격을 2배씩 늘림.
+      성공하면 간격을 서서히 ``min_interval``까지 되돌림
+    - 서버가 배치를 거절(4xx 등)하면 절반씩 나눠 다시 배치 조회해 문제 ID만 골라냄.
+      재시도 후에도 응답이 없으면(장애/오프라인) 남은 조회를 중단
+    - 배치 응답에서 누락(null)된 ID만 단건 ``GET /paper/ARXIV:{id}``로 재조회하되,
+      연속 ``max_failures``번 실패하면 나머지 단건 조회는 포기
+
+    ``base_url``을 바꾸면 로컬 대역 서버(test_citations.py 참고)로 테스트할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        base_url: str = S2_API_URL,
+        api_key: Optional[str] = None,
+        batch_size: int = S2_BATCH_SIZE,
+        max_retries: int = S2_MAX_RETRIES,
+        min_interval: float = S2_MIN_INTERVAL,
+        timeout: float = 10.0,
+        max_failures: int = S2_MAX_FAILURES,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.batch_size = max(1, min(batch_size, 500))
+        self.max_retries = max_retries
+        self.min_interval = min_interval
+        self.timeout = timeout
+        self.max_failures = max(1, max_failures)
+
+        self._session = CachedSession()   # 디스크 응답 캐시 (http_cache)
+        self._session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        self._session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        api_key = api_key if api_key is not None else os.environ.get("S2_API_KEY", "")
+        if api_key:
+            self._session.headers["x-api-key"] = api_key
+
+        self._interval = min_interval
+        self._next_at = 0.0
+        self._lock = threading.Lock()
+
+        # 통계 (실행 로그용)
+        self.requests = 0
+        self.throttled = 0
+
+    # ── 요청 속도 조절 ──────────────────────────────────────────────────────
+
+    def _wait_turn(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_at)
+            self._next_at = start + self._interval
+        if start > now:
+            time.sleep(start - now)
+
+    def _on_throttled(self, retry_after: Optional[str]) -> float:
+        """429/5xx 이후 대기 시간을 정하고 요청 간격을 늘립니다."""
+        self.throttled += 1
+        try:
+            wait = float(retry_after) if retry_after else 0.0
+        except ValueError:
+            wait = 0.0
+        with self._lock:
+            self._interval = min(max(self._interval * 2, self.min_interval, 0.5), _MAX_BACKOFF)
+            wait = max(wait, self._interval)
+            self._next_at = max(self._next_at, time.monotonic() + wait)
+        return wait
+
+    def _on_success(self) -> None:
+        with self._lock:
+            self._interval = max(self.min_interval, self._interval * 0.75)
+
+    def _request(self, method: str, url: str, **kwargs) -> Optional[requests.Response]:
+        """재시도/backoff를 적용해 요청합니다. 최종 실패 시 None."""
+        for attempt in range(self.max_retries + 1):
+            if self._session.cached_response(method, url, **kwargs) is None:
+                self._wait_turn()
+                self.requests += 1
+            try:
+                resp = self._session.request(method, url, timeout=self.timeout, **kwargs)
+            except OfflineCacheMiss:
+                return None
+            except requests.RequestException as e:
+                print(f"[citation] 요청 실패 ({attempt + 1}/{self.max_retries + 1}): {e}")
+                self._on_throttled(None)
+                continue
+
+            if resp.status_code in _RETRY_STATUS:
+                wait = self._on_throttled(resp.headers.get("Retry-After"))
+                print(f"[citation] HTTP {resp.status_code} → {wait:.1f}s 후 재시도")
+                continue
+
+            self._on_success()
+            return resp
+        return None
+
+    # ── 조회 ──────────────────────────────────────────────────────────────
+
+    def fetch_one(self, arxiv_id: str) -> Optional[int]:
+        """단건 조회. 미인덱싱(404)은 0, 요청 실패는 None."""
+        cid = canonical_id(arxiv_id)
+        resp = self._request(
+            "GET", f"{self.base_url}/paper/ARXIV:{cid}", params={"fields": "citationCount"}
+        )
+        if resp is None:
+            return None
+        if resp.status_code == 404:
+            # Semantic Scholar에 아직 인덱싱되지 않은 논문
+            return 0
+        if resp.status_code != 200:
+            return None
+        return resp.json().get("citationCount", 0) or 0
+
+    def _fetch_batch(self, ids: List[str], counts: Dict[str, int]) -> bool:
+        """배치 조회 결과를 counts에 채웁니다. 응답 순서는 요청 ids 순서와 같고, 없는 논문은 null.
+
+        서버가 배치를 거절하면(200 이외 응답) 절반씩 나눠 다시 조회합니다. 한 건짜리
+        배치까지 거절되면 그 ID만 누락으로 남깁니다 (resolve의 단건 재조회 대상).
+
+        Returns:
+            재시도 후에도 응답이 없으면(장애/오프라인 캐시 미스) False. 더 나눠 보내도
+            소용없으므로 호출자는 남은 조회를 중단합니다.
+        """
+        resp = self._request(
+            "POST",
+            f"{self.base_url}/paper/batch",
+            params={"fields": "citationCount"},
+            json={"ids": [f"ARXIV:{i}" for i in ids]},
+        )
+        if resp is None:
+            print(f"[citation] 배치 조회 실패 (응답 없음, {len(ids)}건)")
+            return False
+        if resp.status_code != 200:
+            if len(ids) == 1:
+                print(f"[citation] 배치 조회 거절 (HTTP {resp.status_code}, {ids[0]})")
+                return True
+            print(f"[citation] 배치 조회 거절 (HTTP {resp.status_code}, {len(ids)}건) → 절반씩 재조회")
+            mid = len(ids) // 2
+            return self._fetch_batch(ids[:mid], counts) and self._fetch_batch(ids[mid:], counts)
+
+        for cid, item in zip(ids, resp.json()):
+            if item is not None:
+                counts[cid] = item.get("citationCount", 0) or 0
+        return True
+
+    def resolve(self, arxiv_ids: Iterable[str]) -> Dict[str, int]:
+        """여러 arXiv ID의 인용수를 조회합니다.
+
+        Args:
+            arxiv_ids: arXiv ID 목록 (버전 포함 여부 무관)
+
+        Returns:
+            {정규 ID: 인용수}. 끝내 조회에 실패한 ID는 포함되지 않습니다.
+        """
+        ids = list(dict.fromkeys(canonical_id(i) for i in arxiv_ids))
+        counts: Dict[str, int] = {}
+
+        for start in range(0, len(ids), self.batch_size):
+            chunk = ids[start : start + self.batch_size]
+            if not self._fetch_batch(chunk, counts):
+                print(f"[citation] 서버 응답 없음 → 남은 {len(ids) - start}편 조회 중단")
+                return counts
+            if len(ids) > self.batch_size:
+                print(f"[citation] {min(start + self.batch_size, len(ids))}/{len(ids)}편 배치 조회")
+
+        # 배치에서 누락된 ID만 단건으로 재조회 (연속 실패가 쌓이면 포기)
+        misses = [i for i in ids if i not in counts]
+        if misses:
+            print(f"[citation] 배치 누락 {len(misses)}편 단건 재조회")
+        failures = 0
+        for n, cid in enumerate(misses):
+            count = self.fetch_one(cid)
+            if count is None:
+                failures += 1
+                if failures >= self.max_failures:
+                    print(f"[citation] 단건 조회 {failures}회 연속 실패 → 남은 {len(misses) - n - 1}편 포기")
+                    break
+                continue
+            failures = 0
+            counts[cid] = count
+
+        return counts
+
+
+_resolver: CitationResolver | None = None
+
+
+def get_citation_resolver() -> CitationResolver:
+    """프로세스 공용 CitationResolver (커넥션 풀·backoff 상태 공유)."""
+    global _resolver
+    if _resolver is None:
+        _resolver = CitationResolver()
+    return _resolver
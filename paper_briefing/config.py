@@ -1,5 +1,7 @@
 """중앙 설정값 - 여기서 키워드/카테고리/모델 등을 조정합니다."""
 
+import os
+
 # ── arXiv 검색 설정 ────────────────────────────────────────────────────────────
 ARXIV_CATEGORIES = ["cs.RO", "cs.CV", "cs.LG", "cs.AI"]
 
@@ -17,30 +19,169 @@ TOPIC_KEYWORDS = {
                     "uncertainty", "out-of-distribution", "OOD"],
 }
 
+# 주요 학회 별칭 표 (키 순서 = 선택 우선순위, 별칭은 대소문자 무시)
+# journal_ref / comment 에서 한 번의 정규식 스캔으로 학회명·연도·채택 상태를 추출합니다.
+CONFERENCE_ALIASES = {
+    "NeurIPS": ["NeurIPS", "NIPS", "Neural Information Processing Systems"],
+    "ICML":    ["ICML", "International Conference on Machine Learning"],
+    "ICLR":    ["ICLR", "International Conference on Learning Representations"],
+    "AAAI":    ["AAAI"],
+    "IJCAI":   ["IJCAI"],
+    "CVPR":    ["CVPR", "Conference on Computer Vision and Pattern Recognition"],
+    "ICCV":    ["ICCV", "International Conference on Computer Vision"],
+    "ECCV":    ["ECCV", "European Conference on Computer Vision"],
+    "ACL":     ["ACL"],
+    "EMNLP":   ["EMNLP"],
+    "NAACL":   ["NAACL"],
+    "CoRL":    ["CoRL", "Conference on Robot Learning"],
+    "ICRA":    ["ICRA", "International Conference on Robotics and Automation"],
+    "IROS":    ["IROS", "International Conference on Intelligent Robots and Systems"],
+    "RSS":     ["RSS", "Robotics: Science and Systems"],
+}
+
 # arXiv API 쿼리 문자열
 _cat_q = " OR ".join(f"cat:{c}" for c in ARXIV_CATEGORIES)
 _kw_flat = [kw for kws in TOPIC_KEYWORDS.values() for kw in kws]
 _kw_q = " OR ".join(f'abs:"{kw}"' for kw in _kw_flat)
 SEARCH_QUERY = f"({_cat_q}) AND ({_kw_q})"
 
+# 쿼리 샤딩: 거대한 OR 쿼리 하나 대신 작은 쿼리 여러 개로 나눠 병렬 수집 (query_planner.py)
+#   "none"     → SEARCH_QUERY 하나 (기본: 연도 그룹당 요청 수가 가장 적음)
+#   "category" → ARXIV_CATEGORIES 카테고리별 (4개)
+#   "topic"    → TOPIC_KEYWORDS 주제별 (5개)
+# 샤드마다 최소 한 페이지를 요청하고 모든 요청이 같은 rate limit(3초에 1회)을 거치므로
+# 샤딩하면 요청 수·수집 시간이 샤드 수만큼 늘 수 있습니다. 주제별 출처(topics)가 필요할 때만 켭니다.
+QUERY_SHARDING = os.getenv("QUERY_SHARDING", "none")
+
+# 키워드 필터 위치 (keyword_matcher.py)
+#   "query" → 검색식에 abs:"..." 절로 포함해 arXiv가 필터링
+#   "local" → 카테고리만으로 검색하고 TOPIC_KEYWORDS는 제목+초록에서 로컬 매칭
+#             (쿼리 샤딩은 "topic" 대신 "category" 단위로 동작)
+KEYWORD_FILTER = os.getenv("KEYWORD_FILTER", "query")
+
 MAX_FETCH   = 60   # arXiv에서 가져올 후보 수 (seen 필터링 후 30편 확보 위해 여유 포함)
 MAX_PROCESS = 30   # AI 트리아지·Slack 전송 대상 최대 논문 수
 
+# arXiv API rate limit (이용 약관: 3초에 1회 이하) - 프로세스 전역 토큰 버킷으로 적용
+ARXIV_MIN_INTERVAL = 3.0   # 요청 간 최소 간격 (초)
+ARXIV_BURST        = 1     # 버킷 최대 토큰 수 (연속 허용 요청 수)
+FETCH_WORKERS      = 8     # 연도 그룹 × 쿼리 샤드를 동시에 수집할 스레드 수
+ARXIV_PAGE_SIZE    = 50    # 페이지당 결과 수 (필요한 페이지만 지연 요청)
+FETCH_WINDOW       = 100   # 연도 그룹당 기본 탐색 창 (학회지로 할당량이 차면 더 일찍 중단)
+FETCH_MAX_SCAN     = 500   # seen 중복으로 후보가 부족할 때 최대로 훑을 결과 수
+
+# ── HTTP 응답 캐시 (arXiv Atom 페이지 / Semantic Scholar) ─────────────────────
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", "data/http_cache")
+HTTP_CACHE_TTL = float(os.getenv("HTTP_CACHE_TTL", 6 * 3600))  # 유효 시간(초), 0이면 캐시 미사용
+
+# ── Semantic Scholar (인용수) ─────────────────────────────────────────────────
+S2_API_URL     = os.getenv("S2_API_URL", "https://api.semanticscholar.org/graph/v1")  # 로컬 대역 서버로 교체 가능
+S2_BATCH_SIZE  = 500    # /paper/batch 요청당 최대 ID 수 (API 상한 500)
+S2_MAX_RETRIES = 5      # 429/5xx 재시도 횟수
+S2_MIN_INTERVAL = 1.0   # 요청 간 기본 간격 (초), 429 발생 시 자동으로 늘어남
+S2_MAX_FAILURES = 3     # 단건 재조회가 연속으로 이만큼 실패하면 나머지 단건 조회 포기
+
+# 인용수 캐시 TTL: 논문 나이(출판일 기준, 일)가 적을수록 인용수가 빨리 변하므로 짧게 유지
+CITATION_TTL_RULES = [      # (논문 나이 상한(일), TTL(일))
+    (90,      1),
+    (365,     3),
+    (365 * 3, 14),
+]
+CITATION_TTL_MAX_DAYS   = 30     # 그보다 오래된 논문
+CITATION_CACHE_COLLECTION = "citations"
+CITATION_REFRESH_LIMIT  = 500    # refresh 1회당 갱신할 최대 논문 수 (만료가 오래된 순)
+
 # ── AI 설정 ───────────────────────────────────────────────────────────────────
-LLM_PROVIDER  = "openai" ## os.getenv("LLM_PROVIDER", "openai").lower()  # "openai" or "gemini"
+LLM_PROVIDER  = os.getenv("LLM_PROVIDER", "openai").lower()    # "openai" / "gemini" / "mock" (providers.py)
+LLM_SECONDARY = os.getenv("LLM_SECONDARY", "").lower()          # 헤지·장애 전환용 보조 provider ("" = 사용 안 함)
 OPENAI_MODEL  = "gpt-4o"
 GEMINI_MODEL  = "models/gemini-2.5-flash"  # 빠르고 저렴 (alternatives: gemini-2.0-flash, gemini-flash-latest)
-TRIAGE_BATCH  = 10          # 한 번에 트리아지할 논문 수 (품질·안정성 균형)
+TRIAGE_BATCH  = 20          # 배치당 최대 논문 수 (실제 크기는 아래 토큰 예산으로 결정)
 ABSTRACT_CHARS = 600        # 초록 잘라 보낼 최대 길이
 
+# 트리아지 배치 동시 실행 (rate_limit.get_llm_limiter)
+TRIAGE_CONCURRENCY = int(os.getenv("TRIAGE_CONCURRENCY", 4))    # 동시에 보낼 배치 수
+TRIAGE_RPM         = int(os.getenv("TRIAGE_RPM", 500))          # 분당 요청 수 한도
+TRIAGE_TPM         = int(os.getenv("TRIAGE_TPM", 30000))        # 분당 토큰 수 한도 (입력+출력)
+TRIAGE_OUTPUT_TOKENS_PER_PAPER = 350   # 논문당 예상 출력 토큰 초기값 (한글 요약 3-5문장, 실행 중 보정)
+
+# 토큰 예산 기반 배치 구성 (token_budget.py)
+TRIAGE_CONTEXT_TOKENS    = 128000   # 모델 컨텍스트 (요청 1회 입력 + 출력)
+TRIAGE_MAX_OUTPUT_TOKENS = 16384    # 모델 최대 출력 토큰
+TRIAGE_LATENCY_SLO       = 60.0     # 배치 1회 목표 응답 시간 (초) → 출력 토큰 상한으로 환산
+TRIAGE_OUTPUT_TPS        = 60.0     # 출력 속도 초기값 (토큰/초, 실행 중 보정)
+TOKEN_CALIBRATION_FILE   = "data/token_calibration.json"   # 모델별 토큰 추정 보정값
+TRIAGE_MAX_RETRIES = 3      # 일시 장애(429/5xx/연결) 또는 단일 논문 실패 시 재시도 횟수
+TRIAGE_BACKOFF_BASE = 1.0   # 재시도·분할 대기 시간 기준 (초, 1 → 2 → 4 ...)
+
+# 헤지 요청 (LLM_SECONDARY 지정 시): 주 provider 응답이 최근 응답 시간의 p95를 넘으면
+# 같은 배치를 보조 provider에도 보내 먼저 끝난 결과를 씁니다 (표본이 부족하면 TRIAGE_LATENCY_SLO 기준).
+TRIAGE_HEDGE_QUANTILE    = 0.95
+TRIAGE_HEDGE_WINDOW      = 50     # 응답 시간 표본 수 (모델별, TOKEN_CALIBRATION_FILE에 저장)
+TRIAGE_HEDGE_MIN_SAMPLES = 5      # 이보다 적으면 p95 대신 TRIAGE_LATENCY_SLO 사용
+
+# LLM 호출 계측 (llm_usage.py) - 배치(호출)별 토큰·캐시 토큰·응답 시간·비용을 실행 단위로
+# MongoDB runs 컬렉션과 logs/runs/{run_id}.json에 저장하고, 실행 끝에 요약 표를 출력합니다.
+RUNS_COLLECTION = "runs"
+RUN_MAX_CALLS   = 2000    # 실행 문서에 남길 호출 기록 최대 수 (집계는 전체 기준, Batch 결과 반영 대비)
+# 모델별 가격 (USD / 100만 토큰): (입력, 캐시된 입력, 출력). 목록에 없는 모델은 비용 0으로 집계
+LLM_PRICES = {
+    "gpt-4o":                  (2.50, 1.25, 10.00),
+    "gpt-4o-mini":             (0.15, 0.075, 0.60),
+    "models/gemini-2.5-flash": (0.30, 0.075, 2.50),
+}
+BATCH_PRICE_FACTOR = 0.5  # Batch API 요금 할인 (동기 요청 대비)
+
+# 트리아지 결과 캐시 (MongoDB) - 키: (정규 ID, 초록 해시, 모델명, 시스템 프롬프트 해시)
+# 논문 내용·모델·프롬프트가 같으면 재실행/재시도/--reset 후에도 LLM을 다시 부르지 않습니다.
+TRIAGE_CACHE_COLLECTION = "triage_cache"
+
+# 대량 재트리아지 (run_briefing.py --batch-triage / --batch-collect, triage_batch.py)
+# 요청을 JSONL 파일로 써서 provider Batch API에 제출하고, 완료되면 결과를 MongoDB에 반영합니다.
+TRIAGE_BATCH_JOBS_COLLECTION = "triage_batches"   # 제출한 배치 작업 (요청 ↔ 논문 ID 목록)
+BATCH_DIR           = "data/batch"     # 제출한 요청 JSONL 파일 보관 위치
+BATCH_MAX_REQUESTS  = 5000             # 작업 1개당 최대 요청 수 (API 한도 50000, 작업 문서 16MB 제한 고려)
+BATCH_POLL_INTERVAL = float(os.getenv("BATCH_POLL_INTERVAL", 60))   # 완료 확인 주기 (초)
+BATCH_WRITE_CHUNK   = 500              # 결과 반영 bulk_write 한 번에 보낼 논문 수
+
+# 로컬 관련도 모델 (relevance.py) - 과거 LLM 점수로 학습한 해시 n-gram 선형 회귀
+# 모델 파일이 있으면 수집 단계에서 예측 점수가 낮은 후보를 빼고 예측 점수 순으로 선택합니다.
+RELEVANCE_GATE       = os.getenv("RELEVANCE_GATE", "on")    # "off"면 모델이 있어도 사용 안 함
+RELEVANCE_MODEL_FILE = "data/relevance_model.npz"
+RELEVANCE_MIN_SCORE  = float(os.getenv("RELEVANCE_MIN_SCORE", 1.5))   # 예측 점수(0~5)가 이보다 낮으면 후보 제외
+RELEVANCE_FEATURES   = 2 ** 18     # 해시 특징 차원 (단어 + 바이그램)
+RELEVANCE_MIN_TRAIN  = 200         # 학습에 필요한 최소 논문 수 (점수가 있는 논문)
+
 # ── Zotero 설정 (선택) ────────────────────────────────────────────────────────
 ZOTERO_SCORE_THRESHOLD = 4.0   # 이 점수 이상인 논문만 Zotero에 저장
 
+# ── 저장소 (storage.py) ──────────────────────────────────────────────────────
+# "mongo": MongoDB (기본) / "sqlite": 서버 없는 내장 SQLite 파일 (WAL 모드, 소규모 배포·CI용)
+# sqlite에서는 논문·북마크만 저장하고 MongoDB 전용 기능(트리아지/인용수 캐시 등)은 건너뜁니다.
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "mongo").lower()
+SQLITE_PATH     = os.getenv("SQLITE_PATH", "data/papers.db")
+
 # ── MongoDB 설정 ───────────────────────────────────────────────────────────────
-import os
 MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017/")
 MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "arxiv_papers")
 MONGODB_COLLECTION = os.getenv("MONGODB_COLLECTION", "papers")
+SAVE_CHUNK = int(os.getenv("SAVE_CHUNK", "1000"))   # save_papers bulk_write 한 번에 보낼 논문 수
+
+# 프로세스당 MongoClient 하나를 공유합니다 (db.py, 파이프라인·웹앱 공용). 연결 풀 크기:
+# 수집 워커(FETCH_WORKERS) + 트리아지/인용수 스레드, 웹앱은 동시 요청 수 정도면 충분
+MONGODB_MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", "20"))
+MONGODB_MIN_POOL_SIZE = int(os.getenv("MONGODB_MIN_POOL_SIZE", "0"))
+MONGODB_MAX_IDLE_MS   = int(os.getenv("MONGODB_MAX_IDLE_MS", "300000"))   # 유휴 연결 정리 (5분)
+MONGODB_TIMEOUT_MS    = int(os.getenv("MONGODB_TIMEOUT_MS", "5000"))      # 서버 선택 대기
+
+HARVEST_STATE_COLLECTION = "harvest_state"   # 쿼리별 arXiv 수집 high-water mark
+BOOKMARKS_COLLECTION     = "bookmarks"       # 웹앱 '나중에 볼 논문'
+
+# ── 스냅샷 일괄 적재 (run_briefing.py --ingest) ───────────────────────────────
+# arXiv 메타데이터 스냅샷(JSON lines) / OAI-PMH XML을 로컬에서 필터링해 적재합니다.
+# papers 컬렉션(= 처리 완료 목록)과 섞이지 않도록 별도 컬렉션에 저장합니다.
+SNAPSHOT_COLLECTION = os.getenv("SNAPSHOT_COLLECTION", "snapshot_papers")
+INGEST_CHUNK        = 1000   # bulk_write 한 번에 보낼 문서 수 (메모리 사용량 상한)
 
 # ── 상태 파일 ─────────────────────────────────────────────────────────────────
 STATE_FILE = "data/seen_papers.json"
@@ -0,0 +1,115 @@
+"""MongoDB 연결 관리 - 프로세스 공용 연결 풀 + 인덱스 일괄 생성.
+
+MongoClient는 스레드 안전한 연결 풀이므로 프로세스마다 하나만 만들어
+파이프라인(state.py 등)과 웹앱(webapp/app.py)이 함께 씁니다.
+조회에 필요한 인덱스는 INDEXES에 모두 선언하고, 배포 시 한 번 ensure_indexes()로
+만듭니다 (요청·호출마다 create_index를 부르지 않음).
+
+  python run_briefing.py --init-db       # 인덱스 생성 (이미 있으면 그대로)
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from pymongo import ASCENDING, DESCENDING, MongoClient
+from pymongo.errors import ConnectionFailure
+
+from .config import (
+    BOOKMARKS_COLLECTION,
+    CITATION_CACHE_COLLECTION,
+    MONGODB_COLLECTION,
+    MONGODB_DB_NAME,
+    MONGODB_MAX_IDLE_MS,
+    MONGODB_MAX_POOL_SIZE,
+    MONGODB_MIN_POOL_SIZE,
+    MONGODB_TIMEOUT_MS,
+    MONGODB_URI,
+    SNAPSHOT_COLLECTION,
+    STORAGE_BACKEND,
+    TRIAGE_BATCH_JOBS_COLLECTION,
+)
+
+# {컬렉션: [(키, 옵션)]} - 조회·정렬에 쓰는 모든 인덱스 (_id 조회만 하는 컬렉션은 없음)
+INDEXES: Dict[str, List[Tuple[list, dict]]] = {
+    MONGODB_COLLECTION: [
+        ([("id", ASCENDING)], {"unique": True}),                  # upsert / seen 확인 / 상세 페이지
+        ([("saved_date", DESCENDING), ("score", DESCENDING)], {}),  # 웹앱 날짜별 목록 (날짜 일치 + 점수순)
+        ([("score", DESCENDING)], {}),                            # 웹앱 검색 정렬
+        ([("citation_expires_at", ASCENDING)], {}),               # 인용수 갱신 대상 (만료 오래된 순)
+    ],
+    SNAPSHOT_COLLECTION: [
+        ([("id", ASCENDING)], {}),
+        ([("published", ASCENDING)], {}),
+    ],
+    CITATION_CACHE_COLLECTION: [
+        ([("expires_at", ASCENDING)], {}),
+    ],
+    TRIAGE_BATCH_JOBS_COLLECTION: [
+        ([("applied_at", ASCENDING)], {}),                        # 반영 전 작업 조회
+    ],
+    BOOKMARKS_COLLECTION: [
+        ([("paper_id", ASCENDING)], {"unique": True}),
+    ],
+}
+
+_client: Optional[MongoClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> MongoClient:
+    """프로세스 공용 MongoClient (처음 한 번만 연결 확인).
+
+    STORAGE_BACKEND=sqlite면 연결을 시도하지 않고 바로 ConnectionFailure를 올립니다
+    (MongoDB 전용 기능은 호출 측의 기존 실패 처리로 건너뜀).
+    """
+    global _client
+    if STORAGE_BACKEND == "sqlite":
+        raise ConnectionFailure("STORAGE_BACKEND=sqlite (MongoDB 사용 안 함)")
+    with _client_lock:
+        if _client is None:
+            client = MongoClient(
+                MONGODB_URI,
+                maxPoolSize=MONGODB_MAX_POOL_SIZE,
+                minPoolSize=MONGODB_MIN_POOL_SIZE,
+                maxIdleTimeMS=MONGODB_MAX_IDLE_MS,
+                serverSelectionTimeoutMS=MONGODB_TIMEOUT_MS,
+            )
+            try:
+                client.admin.command("ping")
+            except ConnectionFailure as e:
+                client.close()
+                print(f"[MongoDB] 연결 실패: {e}")
+                raise
+            _client = client
+    return _client
+
+
+def get_db():
+    """MongoDB 데이터베이스를 반환합니다."""
+    return get_client()[MONGODB_DB_NAME]
+
+
+def close_client() -> None:
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+def ensure_indexes(db=None) -> Dict[str, List[str]]:
+    """INDEXES에 선언된 인덱스를 만듭니다 (이미 있으면 그대로, 배포 시 한 번).
+
+    Returns:
+        {컬렉션: [인덱스 이름]}
+    """
+    db = db if db is not None else get_db()
+    created: Dict[str, List[str]] = {}
+    for name, indexes in INDEXES.items():
+        collection = db[name]
+        created[name] = [collection.create_index(keys, **options) for keys, options in indexes]
+        print(f"[MongoDB] {name}: {', '.join(created[name])}")
+    return created
+
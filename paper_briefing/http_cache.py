@@ -0,0 +1,174 @@
+"""arXiv / Semantic Scholar 응답을 디스크에 캐시합니다 (재실행·오프라인 재현용)."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .config import HTTP_CACHE_DIR, HTTP_CACHE_TTL
+
+
+class OfflineCacheMiss(requests.RequestException):
+    """오프라인 모드에서 캐시에 없는 요청."""
+
+
+# 실행 단위 설정 (run_briefing.py의 --offline / --cache-ttl 이 configure()로 변경)
+_settings = {
+    "dir": HTTP_CACHE_DIR,
+    "ttl": HTTP_CACHE_TTL,
+    "offline": os.getenv("HTTP_OFFLINE", "") == "1",
+    "enabled": HTTP_CACHE_TTL > 0,
+}
+_stats = {"hits": 0, "misses": 0, "stores": 0}
+_stats_lock = threading.Lock()   # 수집·인용수 워커 스레드가 동시에 갱신
+
+
+def configure(offline: Optional[bool] = None, ttl: Optional[float] = None,
+              cache_dir: Optional[str] = None) -> None:
+    """캐시 동작을 설정합니다.
+
+    Args:
+        offline: True면 네트워크 요청 없이 캐시만 사용 (신선도 무시)
+        ttl: 캐시 유효 시간 (초). 0이면 캐시를 쓰지 않음 (offline 제외)
+        cache_dir: 캐시 디렉터리
+    """
+    if offline is not None:
+        _settings["offline"] = offline
+    if ttl is not None:
+        _settings["ttl"] = ttl
+        _settings["enabled"] = ttl > 0
+    if cache_dir is not None:
+        _settings["dir"] = cache_dir
+
+
+def is_offline() -> bool:
+    return _settings["offline"]
+
+
+def cache_stats() -> dict:
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _count(name: str) -> None:
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def cache_key(method: str, url: str, body: Optional[bytes] = None) -> str:
+    """요청 내용(메서드 + 쿼리/페이지를 포함한 URL + 본문)의 SHA-256."""
+    h = hashlib.sha256()
+    h.update(method.upper().encode())
+    h.update(b"\n")
+    h.update(url.encode())
+    h.update(b"\n")
+    h.update(body or b"")
+    return h.hexdigest()
+
+
+def _paths(key: str):
+    base = os.path.join(_settings["dir"], key[:2], key)
+    return base + ".json", base + ".bin"
+
+
+def _load(key: str, max_age: Optional[float]) -> Optional[requests.Response]:
+    meta_path, body_path = _paths(key)
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        if max_age is not None and time.time() - meta["fetched_at"] > max_age:
+            return None
+        with open(body_path, "rb") as f:
+            body = f.read()
+    except (OSError, ValueError, KeyError):
+        return None
+
+    resp = requests.Response()
+    resp.status_code = meta["status"]
+    resp.headers = CaseInsensitiveDict(meta.get("headers", {}))
+    resp.url = meta["url"]
+    resp.encoding = meta.get("encoding")
+    resp._content = body
+    resp.from_cache = True
+    return resp
+
+
+def _store(key: str, resp: requests.Response) -> None:
+    meta_path, body_path = _paths(key)
+    os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+    meta = {
+        "url": resp.url,
+        "status": resp.status_code,
+        "headers": {k: v for k, v in resp.headers.items() if k.lower() == "content-type"},
+        "encoding": resp.encoding,
+        "fetched_at": time.time(),
+    }
+    # 본문 → 메타 순서로 원자적 교체 (메타가 있으면 본문도 완전함).
+    # 임시 파일은 쓰기마다 고유 이름이라 같은 키를 여러 스레드·프로세스가 동시에 써도 섞이지 않음
+    for path, data in ((body_path, resp.content), (meta_path, json.dumps(meta).encode("utf-8"))):
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(path), suffix=".tmp", delete=False) as f:
+            f.write(data)
+        try:
+            os.replace(f.name, path)
+        except OSError:
+            os.unlink(f.name)
+            raise
+    _count("stores")
+
+
+def lookup(method: str, url: str, body: Optional[bytes] = None) -> Optional[requests.Response]:
+    """유효한 캐시 응답을 반환합니다 (오프라인이면 신선도 무시). 없으면 None."""
+    if not (_settings["enabled"] or _settings["offline"]):
+        return None
+    max_age = None if _settings["offline"] else _settings["ttl"]
+    return _load(cache_key(method, url, body), max_age)
+
+
+class CachedSession(requests.Session):
+    """GET/POST 응답(200만)을 디스크에 캐시하는 requests.Session.
+
+    - 캐시 키: 메서드 + 전체 URL(쿼리·페이지 offset 포함) + 요청 본문
+    - 유효 시간: HTTP_CACHE_TTL (초)
+    - 오프라인 모드: 캐시에 없으면 OfflineCacheMiss
+    """
+
+    def _key_parts(self, method, url, params=None, json=None, data=None):
+        prepared = self.prepare_request(requests.Request(
+            method=method, url=url, params=params, json=json, data=data,
+        ))
+        body = prepared.body.encode() if isinstance(prepared.body, str) else prepared.body
+        return prepared.url, body
+
+    def cached_response(self, method, url, params=None, json=None, data=None):
+        """네트워크 요청 없이 캐시된 응답만 조회합니다 (rate limit 생략 판단용)."""
+        full_url, body = self._key_parts(method, url, params, json, data)
+        return lookup(method, full_url, body)
+
+    def request(self, method, url, *args, **kwargs):
+        full_url, body = self._key_parts(
+            method, url, kwargs.get("params"), kwargs.get("json"), kwargs.get("data")
+        )
+
+        cached = lookup(method, full_url, body)
+        if cached is not None:
+            _count("hits")
+            return cached
+        if _settings["offline"]:
+            raise OfflineCacheMiss(f"오프라인 모드: 캐시 없음 {method} {full_url}")
+
+        _count("misses")
+        resp = super().request(method, url, *args, **kwargs)
+        if _settings["enabled"] and resp.status_code == 200:
+            try:
+                _store(cache_key(method, full_url, body), resp)
+            except OSError as e:
+                print(f"[http_cache] 저장 실패: {e}")
+        return resp
@@ -0,0 +1,19 @@
+"""arXiv ID 정규화 유틸리티."""
+
+from __future__ import annotations
+
+import re
+
+# 버전 접미사: "2401.12345v2" → "v2", "cs/0112017v1" → "v1"
+_VERSION_RE = re.compile(r"v\d+$")
+
+
+def canonical_id(arxiv_id: str) -> str:
+    """버전 번호를 제거한 정규 arXiv ID를 반환합니다.
+
+    예) "2401.12345v1" → "2401.12345", "cs/0112017v3" → "cs/0112017"
+
+    기존 코드의 ``split('v')[0]``는 "solv-int/9901001"처럼 카테고리에 'v'가
+    들어간 구형 ID를 잘못 자르므로, 끝의 ``v<숫자>``만 제거합니다.
+    """
+    return _VERSION_RE.sub("", arxiv_id.strip())
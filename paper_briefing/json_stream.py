@@ -0,0 +1,82 @@
+"""LLM 트리아지 응답 JSON의 증분 파서 - 스트리밍 조각에서 닫힌 논문 객체를 바로 꺼냅니다.
+
+  {"papers": [{"id": ..., "summary": ...}, {...}, ...]}   → 객체가 닫힐 때마다 하나씩
+  [{...}, {...}]                                          → 배열 직접 (같은 방식)
+
+괄호 깊이와 문자열 상태만 따라가므로 응답 전체를 모을 필요가 없고, 응답이 중간에 끊기거나
+일부 객체가 깨져도 그 전까지 완성된 객체는 모두 건집니다. 마크다운 코드 펜스 등
+JSON 바깥 텍스트는 무시합니다.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import List, Optional
+
+
+class JsonItemStream:
+    """배열 원소인 객체(최상위 배열, 또는 최상위 객체의 배열 값)를 닫히는 즉시 반환합니다.
+
+    feed()에 응답 조각을 순서대로 넣으면 그 조각에서 완성된 객체 리스트를 돌려줍니다.
+      complete: 최상위 JSON 값이 닫혔는지 (False면 응답이 잘림)
+      corrupt:  닫혔지만 JSON으로 읽을 수 없었던 객체 수
+    """
+
+    def __init__(self):
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._item: Optional[List[str]] = None   # 읽는 중인 객체의 문자들
+        self._item_level = 0                     # 객체가 열리기 전 스택 깊이
+        self.complete = False
+        self.corrupt = 0
+
+    def feed(self, text: str) -> List[dict]:
+        items: List[dict] = []
+        for ch in text:
+            if self._item is not None:
+                self._item.append(ch)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            if ch == '"':
+                if self._stack:
+                    self._in_string = True
+            elif ch == "{" or ch == "[":
+                if ch == "{" and self._item is None and self._stack and self._stack[-1] == "[" and len(self._stack) <= 2:
+                    self._item = ["{"]
+                    self._item_level = len(self._stack)
+                elif not self._stack:
+                    self.complete = False   # 새 최상위 값 (앞 값 뒤에 이어진 경우)
+                self._stack.append(ch)
+            elif ch == "}" or ch == "]":
+                if not self._stack:
+                    continue
+                self._stack.pop()
+                if self._item is not None and len(self._stack) == self._item_level:
+                    item = self._close_item()
+                    if item is not None:
+                        items.append(item)
+                if not self._stack:
+                    self.complete = True
+        return items
+
+    def _close_item(self) -> Optional[dict]:
+        raw = "".join(self._item)
+        self._item = None
+        try:
+            item = json.loads(raw)
+        except ValueError:
+            self.corrupt += 1
+            return None
+        return item if isinstance(item, dict) else None
+
+    @property
+    def ok(self) -> bool:
+        """응답이 끝까지 왔고 깨진 객체가 없는지."""
+        return self.complete and not self.corrupt
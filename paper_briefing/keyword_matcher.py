@@ -0,0 +1,118 @@
+"""TOPIC_KEYWORDS를 제목·초록에서 로컬로 매칭합니다 (단어 단위 Aho-Corasick).
+
+arXiv의 ``abs:"..."`` 구문 검색처럼 소문자 영숫자 토큰 단위로 비교하므로
+"vision-language-action"과 "vision language action"은 같은 키워드로 취급됩니다.
+모든 키워드를 하나의 오토마톤으로 합쳐 텍스트를 한 번만 훑으며,
+키워드 어휘에 없는 토큰은 상태 전이 없이 바로 루트로 돌아갑니다.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .config import TOPIC_KEYWORDS
+
+# ASCII 영숫자 외 바이트(구두점, 하이픈, UTF-8 멀티바이트)는 모두 공백으로.
+# bytes.translate + split 이 정규식 findall보다 3배 이상 빠릅니다.
+_SEPARATORS = bytes.maketrans(
+    bytes(range(256)),
+    bytes(c if c < 128 and chr(c).isalnum() else 0x20 for c in range(256)),
+)
+
+
+def tokenize(text: str) -> List[bytes]:
+    """소문자 ASCII 영숫자 토큰 목록 (예: "Sim-to-Real" → [b"sim", b"to", b"real"])."""
+    return text.encode("utf-8", "replace").lower().translate(_SEPARATORS).split()
+
+
+class KeywordHits(NamedTuple):
+    keywords: Dict[str, int]   # {키워드: 등장 횟수}
+    topics: Dict[str, int]     # {주제: 해당 주제 키워드 등장 횟수 합} (TOPIC_KEYWORDS 순서)
+
+
+class KeywordMatcher:
+    """여러 키워드 구문을 한 번에 찾는 단어 단위 Aho-Corasick 오토마톤."""
+
+    def __init__(self, topic_keywords: Dict[str, List[str]] = TOPIC_KEYWORDS):
+        self._topic_order = list(topic_keywords)
+        self._keyword_topics: Dict[str, List[str]] = {}
+        for topic, keywords in topic_keywords.items():
+            for kw in keywords:
+                self._keyword_topics.setdefault(kw, []).append(topic)
+
+        # goto[state] = {토큰: 다음 상태}, out[state] = 이 상태에서 끝나는 키워드들
+        self._goto: List[Dict[bytes, int]] = [{}]
+        self._out: List[Tuple[str, ...]] = [()]
+        for kw in self._keyword_topics:
+            tokens = tokenize(kw)
+            if not tokens:
+                continue
+            state = 0
+            for tok in tokens:
+                nxt = self._goto[state].get(tok)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][tok] = nxt
+                    self._goto.append({})
+                    self._out.append(())
+                state = nxt
+            self._out[state] += (kw,)
+
+        # 실패 링크 (BFS) - 접미사가 다른 키워드인 경우 출력도 합침
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())   # 깊이 1 상태의 실패 링크는 루트
+        while queue:
+            state = queue.popleft()
+            for tok, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and tok not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(tok, 0)
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+        self._vocab = frozenset(tok for edges in self._goto for tok in edges)
+
+    def count(self, *texts: str) -> Dict[str, int]:
+        """텍스트들에서 키워드별 등장 횟수를 셉니다 (텍스트 경계를 넘는 구문은 무시)."""
+        goto, fail, out, vocab = self._goto, self._fail, self._out, self._vocab
+        counts: Dict[str, int] = {}
+        for text in texts:
+            state = 0
+            for tok in text.encode("utf-8", "replace").lower().translate(_SEPARATORS).split():
+                if tok not in vocab:
+                    state = 0
+                    continue
+                while state and tok not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(tok, 0)
+                for kw in out[state]:
+                    counts[kw] = counts.get(kw, 0) + 1
+        return counts
+
+    def match(self, *texts: str) -> KeywordHits:
+        """키워드별·주제별 등장 횟수를 반환합니다."""
+        counts = self.count(*texts)
+        topics: Dict[str, int] = {}
+        for kw, n in counts.items():
+            for topic in self._keyword_topics[kw]:
+                topics[topic] = topics.get(topic, 0) + n
+        ordered = {t: topics[t] for t in self._topic_order if t in topics}
+        return KeywordHits(counts, ordered)
+
+
+_matcher: Optional[KeywordMatcher] = None
+
+
+def get_keyword_matcher() -> KeywordMatcher:
+    """TOPIC_KEYWORDS로 만든 프로세스 공용 매처."""
+    global _matcher
+    if _matcher is None:
+        _matcher = KeywordMatcher()
+    return _matcher
+
+
+def match_keywords(title: str, abstract: str) -> KeywordHits:
+    """제목과 초록에서 TOPIC_KEYWORDS를 찾습니다."""
+    return get_keyword_matcher().match(title, abstract)
@@ -0,0 +1,192 @@
+"""LLM 호출 계측 - 배치(호출)마다 토큰·캐시 토큰·응답 시간·비용을 실행 단위로 모읍니다.
+
+TriageProvider.complete()(실패한 요청, 헤지에서 져서 취소한 요청의 추정 사용량 포함)와 Batch API 결과 반영
+(triage_batch.py)이 호출마다 record()를 부르고, run_briefing.py가 실행 끝에 요약 표를 출력한 뒤
+MongoDB `runs` 컬렉션과 logs/runs/{run_id}.json에 저장합니다.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .config import BATCH_PRICE_FACTOR, LLM_PRICES, RUN_MAX_CALLS, RUNS_COLLECTION
+
+RUN_LOG_DIR = os.path.join("logs", "runs")
+
+
+def call_cost(model: str, prompt_tokens: int, cached_tokens: int, completion_tokens: int, batch: bool = False) -> float:
+    """호출 1회 비용 (USD). cached_tokens는 prompt_tokens에 포함된 캐시 적중분."""
+    price_in, price_cached, price_out = LLM_PRICES.get(model, (0.0, 0.0, 0.0))
+    cost = ((prompt_tokens - cached_tokens) * price_in + cached_tokens * price_cached
+            + completion_tokens * price_out) / 1_000_000
+    return cost * BATCH_PRICE_FACTOR if batch else cost
+
+
+def _quantile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class RunUsage:
+    """한 번의 실행(run)에서 일어난 LLM 호출 기록 (스레드 안전)."""
+
+    def __init__(self):
+        self.started_at = datetime.now()
+        self.run_id = self.started_at.strftime("%Y%m%d-%H%M%S")
+        self.calls: List[dict] = []
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        provider: str,
+        model: str,
+        papers: int,
+        usage=None,
+        latency: Optional[float] = None,
+        status: str = "ok",
+        kind: str = "sync",
+        error: str = "",
+    ) -> dict:
+        """호출 1회를 기록합니다.
+
+        Args:
+            usage: prompt_tokens / completion_tokens (/ cached_tokens) 속성을 가진 객체, 모르면 None
+            latency: 요청~응답 시간 (초, Batch API는 None)
+            status: "ok" / "partial"(잘리거나 일부 논문 누락) / "error" / "cancelled"(헤지에서 져서 취소)
+            kind: "sync" (동기 요청) / "batch" (Batch API)
+        """
+        prompt = getattr(usage, "prompt_tokens", 0) or 0
+        completion = getattr(usage, "completion_tokens", 0) or 0
+        cached = getattr(usage, "cached_tokens", 0) or 0
+        call = {
+            "at": datetime.now(),
+            "kind": kind,
+            "provider": provider,
+            "model": model,
+            "papers": papers,
+            "status": status,
+            "prompt_tokens": prompt,
+            "cached_tokens": cached,
+            "completion_tokens": completion,
+            "latency": round(latency, 3) if latency is not None else None,
+            "cost": call_cost(model, prompt, cached, completion, batch=kind == "batch"),
+        }
+        if error:
+            call["error"] = error[:200]
+        with self._lock:
+            self.calls.append(call)
+        return call
+
+    # ── 집계 ──────────────────────────────────────────────────────────────
+    def summary(self) -> List[dict]:
+        """(종류, provider, 모델)별 집계."""
+        with self._lock:
+            calls = list(self.calls)
+        groups: Dict[tuple, List[dict]] = {}
+        for call in calls:
+            groups.setdefault((call["kind"], call["provider"], call["model"]), []).append(call)
+
+        rows = []
+        for (kind, provider, model), group in groups.items():
+            latencies = [c["latency"] for c in group if c["latency"] is not None]
+            rows.append({
+                "kind": kind,
+                "provider": provider,
+                "model": model,
+                "calls": len(group),
+                "errors": sum(c["status"] == "error" for c in group),
+                "partial": sum(c["status"] == "partial" for c in group),
+                "cancelled": sum(c["status"] == "cancelled" for c in group),
+                "papers": sum(c["papers"] for c in group),
+                "prompt_tokens": sum(c["prompt_tokens"] for c in group),
+                "cached_tokens": sum(c["cached_tokens"] for c in group),
+                "completion_tokens": sum(c["completion_tokens"] for c in group),
+                "latency_p50": _quantile(latencies, 0.5),
+                "latency_p95": _quantile(latencies, 0.95),
+                "latency_max": max(latencies) if latencies else None,
+                "cost": sum(c["cost"] for c in group),
+            })
+        return rows
+
+    def totals(self) -> dict:
+        rows = self.summary()
+        keys = ("calls", "errors", "partial", "cancelled", "papers", "prompt_tokens", "cached_tokens", "completion_tokens", "cost")
+        return {key: sum(row[key] for row in rows) for key in keys}
+
+    def print_table(self) -> None:
+        rows = self.summary()
+        if not rows:
+            return
+
+        def seconds(value: Optional[float]) -> str:
+            return "-" if value is None else f"{value:.1f}s"
+
+        header = (f"  {'provider':<16} {'model':<24} {'calls':>5} {'err':>4} {'part':>4} {'cxl':>4} {'papers':>6} "
+                  f"{'input':>9} {'cached':>8} {'output':>8} {'p50':>6} {'p95':>6} {'cost$':>8}")
+        print(f"\n[usage] LLM 호출 요약 (run {self.run_id})")
+        print(header)
+        print("  " + "-" * (len(header) - 2))
+        for row in rows:
+            name = row["provider"] if row["kind"] == "sync" else f"{row['provider']} (batch)"
+            print(
+                f"  {name:<16} {row['model'][:24]:<24} {row['calls']:>5} {row['errors']:>4} {row['partial']:>4} "
+                f"{row['cancelled']:>4} {row['papers']:>6} {row['prompt_tokens']:>9,} {row['cached_tokens']:>8,} "
+                f"{row['completion_tokens']:>8,} {seconds(row['latency_p50']):>6} {seconds(row['latency_p95']):>6} {row['cost']:>8.4f}"
+            )
+        total = self.totals()
+        print(
+            f"  {'합계':<15} {'':<24} {total['calls']:>5} {total['errors']:>4} {total['partial']:>4} "
+            f"{total['cancelled']:>4} {total['papers']:>6} {total['prompt_tokens']:>9,} {total['cached_tokens']:>8,} "
+            f"{total['completion_tokens']:>8,} {'':>6} {'':>6} {total['cost']:>8.4f}"
+        )
+
+    # ── 저장 ──────────────────────────────────────────────────────────────
+    def to_doc(self, mode: str, extra: Optional[dict] = None) -> dict:
+        with self._lock:
+            calls = list(self.calls)
+        return {
+            "_id": self.run_id,
+            "mode": mode,
+            "started_at": self.started_at,
+            "finished_at": datetime.now(),
+            "totals": self.totals(),
+            "by_model": self.summary(),
+            "calls": calls[:RUN_MAX_CALLS],
+            "calls_truncated": len(calls) > RUN_MAX_CALLS,
+            **(extra or {}),
+        }
+
+    def save(self, mode: str, extra: Optional[dict] = None) -> dict:
+        """실행 기록을 MongoDB runs 컬렉션과 logs/runs/{run_id}.json에 저장합니다 (같은 run은 덮어씀)."""
+        doc = self.to_doc(mode, extra)
+        try:
+            from .state import _get_db
+            _get_db()[RUNS_COLLECTION].replace_one({"_id": doc["_id"]}, doc, upsert=True)
+        except Exception as e:
+            print(f"[usage] runs 저장 실패: {e}")
+
+        os.makedirs(RUN_LOG_DIR, exist_ok=True)
+        path = os.path.join(RUN_LOG_DIR, f"{self.run_id}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(doc, f, ensure_ascii=False, indent=2, default=str)
+        print(f"[usage] 실행 기록 저장: {RUNS_COLLECTION} / {path}")
+        return doc
+
+
+_run: Optional[RunUsage] = None
+_run_lock = threading.Lock()
+
+
+def get_run_usage() -> RunUsage:
+    """이번 실행의 공용 호출 기록."""
+    global _run
+    with _run_lock:
+        if _run is None:
+            _run = RunUsage()
+    return _run
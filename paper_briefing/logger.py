@@ -34,6 +34,11 @@ def save_log(papers: List[Paper]) -> str:
             "journal_ref": p.journal_ref,
             "comment": p.comment,
             "conference": p.conference,
+            "venue_year": p.venue_year,
+            "venue_status": p.venue_status,
+            "topics": p.topics,
+            "topic_hits": p.topic_hits,
+            "relevance": p.relevance,
         }
         for p in papers
     ]
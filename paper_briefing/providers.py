@@ -0,0 +1,448 @@
+"""LLM 트리아지 provider (OpenAI / Gemini / 로컬 mock)와 헤지 요청.
+
+provider는 배치를 보내고 응답 텍스트 조각을 차례로 내주는 _stream()만 구현하면 됩니다.
+응답은 배치의 ID / _TAGS만 허용하는 JSON 스키마로 강제합니다 (triage._response_schema).
+요청 속도 제한(provider별 RPM/TPM limiter), 토큰 추정 보정, 응답 시간 기록, 증분 JSON 파싱
+(json_stream.py), 결과 검증·논문 매칭(triage._ResultMatcher)은 TriageProvider.complete()가
+공통으로 처리하고, 논문 객체는 닫히는 즉시 on_item 콜백으로 넘깁니다.
+
+  LLM_PROVIDER=openai LLM_SECONDARY=gemini python run_briefing.py
+
+LLM_SECONDARY가 있으면 HedgedProvider로 감쌉니다:
+  - 주 provider 응답이 최근 응답 시간의 p95(TRIAGE_HEDGE_QUANTILE)를 넘으면 같은 배치를
+    보조 provider에도 보내고 먼저 성공한 결과를 씁니다 (헤지, 기준 시간은 limiter 통과 후부터).
+    진 요청은 스트림을 닫고 받은 만큼의 추정 사용량을 "cancelled"로 기록합니다
+  - 주 provider 요청이 실패하면 곧바로 보조 provider로 보냅니다 (장애 전환)
+  - 주 provider의 API 키가 없으면 보조 provider만 씁니다
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeout, wait
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Union
+
+from openai import OpenAI
+
+from .arxiv_fetcher import Paper
+from .config import (
+    GEMINI_MODEL,
+    LLM_PROVIDER,
+    LLM_SECONDARY,
+    OPENAI_MODEL,
+    TRIAGE_CONCURRENCY,
+    TRIAGE_HEDGE_QUANTILE,
+    TRIAGE_LATENCY_SLO,
+)
+from .json_stream import JsonItemStream
+from .keyword_matcher import match_keywords
+from .llm_usage import get_run_usage
+from .rate_limit import get_llm_limiter
+from .token_budget import TokenEstimator, get_estimator
+
+_openai_client: OpenAI | None = None
+_gemini_client = None
+
+
+def _get_openai_client() -> OpenAI | None:
+    global _openai_client
+    api_key = os.environ.get("OPENAI_API_KEY", "")
+    if not api_key:
+        return None
+    if _openai_client is None:
+        _openai_client = OpenAI(api_key=api_key)
+    return _openai_client
+
+
+def _get_gemini_client():
+    global _gemini_client
+    api_key = os.environ.get("GEMINI_API_KEY", "")
+    if not api_key:
+        return None
+    if _gemini_client is None:
+        try:
+            from google import genai
+            client = genai.Client(api_key=api_key)
+            _gemini_client = client
+        except ImportError:
+            print("[triage] google-genai 패키지가 설치되지 않았습니다.")
+            print("[triage] 설치: pip install google-genai")
+            return None
+    return _gemini_client
+
+
+class Usage(NamedTuple):
+    """응답 토큰 사용량 (OpenAI usage와 같은 필드명, cached_tokens는 prompt_tokens 중 캐시 적중분)."""
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+    cached_tokens: int = 0
+
+
+ItemCallback = Callable[[dict], None]
+_STREAM_CHUNK = 64   # MockProvider 응답 조각 크기 (문자)
+
+
+class TriageProvider:
+    """배치 하나를 LLM에 보내고 논문별 결과를 돌려주는 백엔드.
+
+    하위 클래스는 _stream(batch, user_msg)만 구현합니다: 응답 텍스트 조각(str)을 순서대로 yield하고,
+    사용량을 알면 마지막에 Usage를 yield합니다.
+    """
+
+    name = ""
+
+    def __init__(self, model: str, estimator: Optional[TokenEstimator] = None):
+        self.model = model
+        self.estimator = estimator or get_estimator(model)
+        self.limiter = get_llm_limiter(self.name)
+
+    @property
+    def models(self) -> List[str]:
+        """결과를 낼 수 있는 모델 (트리아지 캐시 조회 순서)."""
+        return [self.model]
+
+    def _stream(self, batch: List[Paper], user_msg: str) -> Iterator[Union[str, Usage]]:
+        raise NotImplementedError
+
+    def complete(
+        self,
+        batch: List[Paper],
+        on_item: Optional[ItemCallback] = None,
+        acquired: Optional[threading.Event] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> List[dict]:
+        """배치 하나를 보내고 논문별 결과를 반환합니다 (워커 스레드에서 실행).
+
+        응답을 스트리밍으로 받아 논문 객체가 닫힐 때마다 on_item(item)을 부릅니다.
+        응답이 잘리거나 일부가 깨지거나 스트림이 중간에 끊겨도 완성된 결과는 반환하고,
+        빠진 논문은 호출 측(_triage_batch)이 그 논문만 다시 요청합니다.
+        완성된 결과가 하나도 없을 때만 예외를 그대로 올립니다 (일시 장애 재시도 판단용).
+        결과마다 "_model"(응답한 모델명)을 붙여 캐시 저장 시 어느 모델의 결과인지 구분합니다.
+        호출마다 토큰·응답 시간·비용을 llm_usage에 기록합니다 (실패한 호출 포함).
+
+        acquired: limiter를 통과해 요청을 보내기 직전에 set (헤지 기준 시간의 시작점)
+        cancel: set되면 다음 조각에서 스트림을 닫고 받은 만큼의 추정 사용량을 "cancelled"로 기록
+        """
+        from .triage import _SYSTEM_PROMPT, _ResultMatcher, _build_user_prompt, _estimate_tokens
+
+        user_msg = _build_user_prompt(batch)
+        reserved = _estimate_tokens(batch, user_msg, self.estimator)
+        self.limiter.acquire(reserved)
+        if acquired is not None:
+            acquired.set()
+        if cancel is not None and cancel.is_set():   # limiter를 기다리는 사이 헤지에서 이미 짐 → 보내지 않음
+            self.limiter.settle(reserved, 0)
+            return []
+
+        started = time.monotonic()
+        parser = JsonItemStream()
+        matcher = _ResultMatcher(batch)
+        items: List[dict] = []
+        usage: Optional[Usage] = None
+        text: List[str] = []
+        finished = cancelled = False
+        stream = self._stream(batch, user_msg)
+        try:
+            for part in stream:
+                if isinstance(part, Usage):
+                    usage = part
+                    continue
+                text.append(part)
+                for item in filter(None, map(matcher.match, parser.feed(part))):
+                    item["_model"] = self.model
+                    items.append(item)
+                    if on_item is not None:
+                        on_item(item)
+                if cancel is not None and cancel.is_set():
+                    cancelled = True
+                    stream.close()
+                    break
+            finished = not cancelled
+        except Exception as exc:
+            if not items:
+                get_run_usage().record(
+                    self.name, self.model, len(batch), usage, time.monotonic() - started, "error", error=str(exc),
+                )
+                raise
+            print(f"[triage] {self.name} 스트림 중단 ({exc}) → 완성된 {len(items)}/{len(batch)}편만 사용")
+        finally:
+            if cancelled and usage is None:
+                # 취소한 스트림은 사용량이 오지 않으므로 보낸 입력과 받은 출력으로 추정
+                prompt = self.estimator.input_tokens(_SYSTEM_PROMPT + user_msg)
+                completion = self.estimator.raw_count("".join(text)) if text else 0
+                usage = Usage(prompt, completion, prompt + completion)
+            # 실패·중단한 요청도 예약한 TPM 토큰을 정산 (사용량을 모르면 끝까지 받았을 때만 예약분을 씀)
+            self.limiter.settle(reserved, usage.total_tokens if usage else (reserved if finished else 0))
+        if cancelled:
+            # 잘린 응답 시간은 헤지 기준(p95)·보정에 쓰지 않음
+            get_run_usage().record(self.name, self.model, len(batch), usage, None, "cancelled")
+            return items
+        if finished and not parser.ok:
+            received = sum(map(len, text))
+            print(
+                f"[triage] {self.name} 응답 불완전 ({received}자 수신, 완성 {len(items)}/{len(batch)}편, "
+                f"손상 {parser.corrupt}개) → 빠진 논문만 재시도"
+            )
+        latency = time.monotonic() - started
+        matcher.report(f"{self.name} 응답")
+        self.estimator.observe(self.estimator.raw_count(_SYSTEM_PROMPT + user_msg), len(batch), usage, latency)
+        get_run_usage().record(
+            self.name, self.model, len(batch), usage, latency,
+            "ok" if parser.ok and len(items) == len(batch) else "partial",
+        )
+        return items
+
+    def save(self) -> None:
+        self.estimator.save()
+
+    def close(self) -> None:
+        pass
+
+
+class OpenAIProvider(TriageProvider):
+    name = "openai"
+
+    def __init__(self, client: OpenAI, model: str = OPENAI_MODEL, estimator: Optional[TokenEstimator] = None):
+        super().__init__(model, estimator)
+        self.client = client
+
+    def _stream(self, batch: List[Paper], user_msg: str) -> Iterator[Union[str, Usage]]:
+        from .triage import _chat_request
+
+        stream = self.client.chat.completions.create(
+            **_chat_request(batch, self.model, user_msg), stream=True, stream_options={"include_usage": True},
+        )
+        try:
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                usage = getattr(chunk, "usage", None)   # 마지막 조각 (choices 비어 있음)
+                if usage is not None:
+                    details = getattr(usage, "prompt_tokens_details", None)
+                    yield Usage(
+                        usage.prompt_tokens, usage.completion_tokens, usage.total_tokens,
+                        getattr(details, "cached_tokens", 0) or 0,
+                    )
+        finally:
+            stream.close()   # 취소(헤지에서 짐)·중단 시 연결을 바로 끊어 출력 토큰 생성을 멈춤
+
+
+class GeminiProvider(TriageProvider):
+    name = "gemini"
+
+    def __init__(self, client, model: str = GEMINI_MODEL, estimator: Optional[TokenEstimator] = None):
+        super().__init__(model, estimator)
+        self.client = client
+
+    def _stream(self, batch: List[Paper], user_msg: str) -> Iterator[Union[str, Usage]]:
+        from .triage import _SYSTEM_PROMPT, _response_schema
+
+        meta = None
+        for chunk in self.client.models.generate_content_stream(
+            model=self.model,
+            contents=f"{_SYSTEM_PROMPT}\n\n{user_msg}",
+            config={
+                "temperature": 0.2,
+                "response_mime_type": "application/json",
+                "response_json_schema": _response_schema(batch),
+            },
+        ):
+            if chunk.text:
+                yield chunk.text
+            meta = getattr(chunk, "usage_metadata", None) or meta   # 누적값, 마지막 조각 기준
+        if meta is not None and meta.prompt_token_count and meta.candidates_token_count:
+            yield Usage(
+                meta.prompt_token_count, meta.candidates_token_count,
+                meta.total_token_count or meta.prompt_token_count + meta.candidates_token_count,
+                getattr(meta, "cached_content_token_count", 0) or 0,
+            )
+
+
+_PAPER_RE = re.compile(r"^id: (.+)\ntitle: (.*)\nabstract: (.*)$", re.M)
+
+
+def mock_response(user_msg: str) -> str:
+    """user 메시지의 논문마다 키워드 매칭 기반 결과를 만듭니다 (항상 같은 결과)."""
+    papers = []
+    for pid, title, abstract in _PAPER_RE.findall(user_msg):
+        hits = match_keywords(title, abstract)
+        papers.append({
+            "id": pid,
+            "summary": f"[mock] {title}",
+            "tags": list(hits.topics)[:3],
+            "score": float(min(5, sum(hits.topics.values()))),
+        })
+    return json.dumps({"papers": papers}, ensure_ascii=False)
+
+
+class MockProvider(TriageProvider):
+    """네트워크 없이 키워드 매칭으로 답하는 로컬 provider (개발·테스트·헤지 실험용).
+
+    latency: 응답 지연 (초) 또는 user 메시지 → 지연을 돌려주는 함수 (조각마다 나눠서 대기)
+    """
+
+    name = "mock"
+
+    def __init__(
+        self,
+        model: str = "mock-keywords",
+        latency: Union[float, Callable[[str], float]] = 0.0,
+        estimator: Optional[TokenEstimator] = None,
+    ):
+        super().__init__(model, estimator)
+        self.latency = latency
+
+    def _stream(self, batch: List[Paper], user_msg: str) -> Iterator[Union[str, Usage]]:
+        from .triage import _SYSTEM_PROMPT
+
+        delay = self.latency(user_msg) if callable(self.latency) else self.latency
+        raw = mock_response(user_msg)
+        chunks = [raw[i:i + _STREAM_CHUNK] for i in range(0, len(raw), _STREAM_CHUNK)]
+        for chunk in chunks:
+            if delay:
+                time.sleep(delay / len(chunks))
+            yield chunk
+        # 글자 수 기반 모의 사용량 (계측·토큰 보정 경로를 네트워크 없이 확인하기 위함)
+        prompt, completion = len(_SYSTEM_PROMPT + user_msg) // 4 + 1, len(raw) // 4 + 1
+        yield Usage(prompt, completion, prompt + completion)
+
+
+class HedgedProvider(TriageProvider):
+    """주 provider가 느리면 보조 provider에 같은 배치를 보내고, 실패하면 보조 provider로 전환합니다."""
+
+    def __init__(self, primary: TriageProvider, secondary: TriageProvider, concurrency: int = TRIAGE_CONCURRENCY):
+        self.primary = primary
+        self.secondary = secondary
+        self.name = f"{primary.name}+{secondary.name}"
+        self.model = primary.model
+        self.estimator = primary.estimator
+        # 배치마다 주·보조 요청이 동시에 떠 있을 수 있으므로 배치 동시 실행 수의 2배
+        self._pool = ThreadPoolExecutor(max_workers=2 * max(1, concurrency), thread_name_prefix="hedge")
+        self._lock = threading.Lock()
+        self.stats = {"hedged": 0, "secondary_wins": 0, "failovers": 0}
+
+    @property
+    def models(self) -> List[str]:
+        return [self.primary.model, self.secondary.model]
+
+    def hedge_after(self) -> float:
+        """헤지 기준 시간 (주 provider의 최근 응답 시간 p95, 표본이 부족하면 TRIAGE_LATENCY_SLO)."""
+        p95 = self.primary.estimator.latency_quantile(TRIAGE_HEDGE_QUANTILE)
+        return p95 if p95 is not None else TRIAGE_LATENCY_SLO
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def complete(self, batch: List[Paper], on_item: Optional[ItemCallback] = None) -> List[dict]:
+        delay = self.hedge_after()
+        winner: List[TriageProvider] = []   # 결과를 쓰기로 한 provider (정해진 뒤 진 쪽 콜백은 무시)
+        cancel = {self.primary: threading.Event(), self.secondary: threading.Event()}
+
+        def forward(provider: TriageProvider) -> Optional[ItemCallback]:
+            if on_item is None:
+                return None
+            return lambda item: on_item(item) if not winner or winner[0] is provider else None
+
+        acquired = threading.Event()
+        first = self._pool.submit(
+            self.primary.complete, batch, forward(self.primary), acquired, cancel[self.primary],
+        )
+        first.add_done_callback(lambda _: acquired.set())
+        # 헤지 기준 시간은 주 provider가 limiter를 통과한 뒤부터 (RPM·TPM 대기는 응답 지연이 아님)
+        acquired.wait()
+        try:
+            return first.result(timeout=delay)
+        except FutureTimeout:
+            self._count("hedged")
+            print(
+                f"[triage] {self.primary.name} 응답이 {delay:.2f}s를 넘음 "
+                f"→ {self.secondary.name}에도 같은 배치 요청 ({len(batch)}편)"
+            )
+        except Exception as exc:
+            self._count("failovers")
+            print(f"[triage] {self.primary.name} 실패 ({exc}) → {self.secondary.name}로 전환 ({len(batch)}편)")
+            return self.secondary.complete(batch, on_item)
+
+        second = self._pool.submit(
+            self.secondary.complete, batch, forward(self.secondary), None, cancel[self.secondary],
+        )
+        pending = {first, second}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    winner.append(self.primary if future is first else self.secondary)
+                    if future is second:
+                        self._count("secondary_wins")
+                    # 진 요청은 스트림을 닫아 출력 토큰을 더 쓰지 않게 함 (받은 만큼은 llm_usage에 기록됨)
+                    for provider, event in cancel.items():
+                        if provider is not winner[0]:
+                            event.set()
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def save(self) -> None:
+        self.primary.save()
+        self.secondary.save()
+
+    def close(self) -> None:
+        # 헤지에서 진 요청은 취소했으므로 다음 조각에서 끝남 → 기다려서 사용량 기록까지 마친 뒤 요약
+        self._pool.shutdown(wait=True)
+        s = self.stats
+        if any(s.values()):
+            print(
+                f"[triage] 헤지 {s['hedged']}회 ({self.secondary.name} 먼저 완료 {s['secondary_wins']}회), "
+                f"장애 전환 {s['failovers']}회"
+            )
+
+
+_providers: Dict[str, Optional[TriageProvider]] = {}
+_providers_lock = threading.Lock()
+
+
+def get_provider(name: str) -> Optional[TriageProvider]:
+    """이름별 공용 provider (API 키가 없거나 패키지가 없으면 None)."""
+    with _providers_lock:
+        if name not in _providers:
+            _providers[name] = _create_provider(name)
+        return _providers[name]
+
+
+def _create_provider(name: str) -> Optional[TriageProvider]:
+    if name == "openai":
+        client = _get_openai_client()
+        if client is None:
+            print("[triage] OPENAI_API_KEY 미설정 → openai provider 사용 불가")
+            return None
+        return OpenAIProvider(client)
+    if name == "gemini":
+        client = _get_gemini_client()
+        if client is None:
+            print("[triage] GEMINI_API_KEY 미설정 또는 패키지 미설치 → gemini provider 사용 불가")
+            return None
+        return GeminiProvider(client)
+    if name == "mock":
+        return MockProvider()
+    print(f"[triage] 알 수 없는 provider: {name!r} (openai / gemini / mock)")
+    return None
+
+
+def build_triage_provider(primary: str = LLM_PROVIDER, secondary: str = LLM_SECONDARY) -> Optional[TriageProvider]:
+    """설정의 주·보조 provider로 트리아지 provider를 만듭니다 (둘 다 쓸 수 없으면 None)."""
+    main = get_provider(primary)
+    backup = get_provider(secondary) if secondary and secondary != primary else None
+    if main is None:
+        if backup is not None:
+            print(f"[triage] {primary} 사용 불가 → {secondary}만 사용")
+        return backup
+    if backup is None:
+        return main
+    return HedgedProvider(main, backup)
@@ -0,0 +1,62 @@
+"""arXiv 검색 쿼리를 주제/카테고리별 샤드로 나눕니다."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List
+
+from .config import (
+    ARXIV_CATEGORIES,
+    KEYWORD_FILTER,
+    QUERY_SHARDING,
+    SEARCH_QUERY,
+    TOPIC_KEYWORDS,
+)
+
+
+@dataclass(frozen=True)
+class QueryShard:
+    name: str    # 샤드 이름 = 논문에 남길 출처 (예: "VLA", "cs.RO"). 샤딩 없으면 ""
+    query: str   # 연도 범위를 제외한 arXiv 검색식
+    local_filter: bool = False   # True면 키워드 조건을 로컬 매처로 적용 (검색식은 카테고리만)
+
+
+def _cat_clause(categories: List[str]) -> str:
+    return " OR ".join(f"cat:{c}" for c in categories)
+
+
+def _kw_clause(keywords: List[str]) -> str:
+    return " OR ".join(f'abs:"{kw}"' for kw in keywords)
+
+
+def plan_shards(mode: str = QUERY_SHARDING, keyword_filter: str = KEYWORD_FILTER) -> List[QueryShard]:
+    """검색을 샤드 목록으로 나눕니다.
+
+    Args:
+        mode: "topic" (TOPIC_KEYWORDS 주제별), "category" (ARXIV_CATEGORIES별),
+            "none" (SEARCH_QUERY 하나)
+        keyword_filter: "query" (abs: 절로 arXiv가 필터) / "local" (카테고리만 검색,
+            키워드는 keyword_matcher로 로컬 필터). local에서 "topic"은 "category"로 동작
+
+    Returns:
+        QueryShard 리스트. 모든 샤드의 합집합은 SEARCH_QUERY와 같습니다.
+    """
+    if keyword_filter == "local":
+        if mode == "none":
+            return [QueryShard("", f"({_cat_clause(ARXIV_CATEGORIES)})", local_filter=True)]
+        return [QueryShard(cat, f"cat:{cat}", local_filter=True) for cat in ARXIV_CATEGORIES]
+    if keyword_filter != "query":
+        print(f"[query] 알 수 없는 KEYWORD_FILTER={keyword_filter!r} → 검색식 필터 사용")
+
+    if mode == "topic":
+        cat_q = _cat_clause(ARXIV_CATEGORIES)
+        return [
+            QueryShard(topic, f"({cat_q}) AND ({_kw_clause(keywords)})")
+            for topic, keywords in TOPIC_KEYWORDS.items()
+        ]
+    if mode == "category":
+        kw_q = _kw_clause([kw for kws in TOPIC_KEYWORDS.values() for kw in kws])
+        return [QueryShard(cat, f"cat:{cat} AND ({kw_q})") for cat in ARXIV_CATEGORIES]
+    if mode != "none":
+        print(f"[query] 알 수 없는 QUERY_SHARDING={mode!r} → 샤딩 없이 실행")
+    return [QueryShard("", SEARCH_QUERY)]
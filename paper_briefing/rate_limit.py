@@ -0,0 +1,111 @@
+"""외부 API 호출 속도를 프로세스 전역에서 제한하는 토큰 버킷."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from .config import ARXIV_BURST, ARXIV_MIN_INTERVAL, TRIAGE_RPM, TRIAGE_TPM
+
+
+class TokenBucket:
+    """스레드 안전한 토큰 버킷 rate limiter.
+
+    초당 ``rate``개의 토큰이 채워지고, 최대 ``capacity``개까지 쌓입니다.
+    ``acquire()``는 토큰이 생길 때까지 대기한 뒤 실제로 기다린 시간(초)을 반환합니다.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0:
+            raise ValueError("rate는 0보다 커야 합니다.")
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """토큰을 소비합니다. 부족하면 채워질 때까지 sleep 합니다.
+
+        Returns:
+            대기한 시간 (초)
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                # 토큰을 미리 예약하지 않고, 부족분이 찰 때까지만 잠든 뒤 재시도
+                to_sleep = (tokens - self._tokens) / self.rate
+            time.sleep(to_sleep)
+            waited += to_sleep
+
+    def refund(self, tokens: float) -> None:
+        """토큰을 되돌립니다. 음수면 추가로 차감합니다 (다음 acquire가 그만큼 더 대기)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens + tokens)
+
+
+class ApiRateLimiter:
+    """분당 요청 수(RPM)와 분당 토큰 수(TPM)를 함께 지키는 limiter.
+
+    요청 전에 예상 토큰을 ``acquire()``로 예약하고, 응답의 실제 사용량을
+    ``settle()``로 알려 주면 차이만큼 TPM 버킷을 보정합니다.
+    """
+
+    def __init__(self, rpm: float, tpm: float):
+        self._requests = TokenBucket(rate=rpm / 60.0, capacity=rpm)
+        self._tokens = TokenBucket(rate=tpm / 60.0, capacity=tpm)
+
+    def acquire(self, tokens: float) -> float:
+        """요청 1회 + 예상 토큰을 예약합니다. 대기한 시간(초)을 반환합니다.
+
+        한 요청이 TPM 전체보다 크면 버킷 크기만큼만 예약합니다 (무한 대기 방지).
+        """
+        waited = self._requests.acquire(1)
+        waited += self._tokens.acquire(min(tokens, self._tokens.capacity))
+        return waited
+
+    def settle(self, reserved: float, used: float) -> None:
+        """실제 사용 토큰이 예약보다 많으면 초과분을 차감하고, 적으면 돌려줍니다."""
+        self._tokens.refund(min(reserved, self._tokens.capacity) - used)
+
+
+_arxiv_limiter: TokenBucket | None = None
+_arxiv_limiter_lock = threading.Lock()
+
+
+def get_arxiv_limiter() -> TokenBucket:
+    """arXiv API 공용 limiter를 반환합니다 (프로세스당 1개).
+
+    arXiv 이용 약관: "3초에 1회 이하로 요청" → 기본 ARXIV_MIN_INTERVAL=3.0, 버스트 1.
+    """
+    global _arxiv_limiter
+    with _arxiv_limiter_lock:
+        if _arxiv_limiter is None:
+            _arxiv_limiter = TokenBucket(
+                rate=1.0 / ARXIV_MIN_INTERVAL, capacity=ARXIV_BURST
+            )
+    return _arxiv_limiter
+
+
+_llm_limiters: dict = {}
+_llm_limiter_lock = threading.Lock()
+
+
+def get_llm_limiter(provider: str = "openai") -> ApiRateLimiter:
+    """LLM provider별 공용 limiter를 반환합니다 (TRIAGE_RPM / TRIAGE_TPM, 한도는 provider마다 따로)."""
+    with _llm_limiter_lock:
+        if provider not in _llm_limiters:
+            _llm_limiters[provider] = ApiRateLimiter(rpm=TRIAGE_RPM, tpm=TRIAGE_TPM)
+    return _llm_limiters[provider]
@@ -0,0 +1,237 @@
+"""로컬 관련도 모델 - LLM 트리아지 전에 후보를 값싸게 거릅니다 (CPU, NumPy).
+
+제목+초록의 단어·바이그램을 해시해 RELEVANCE_FEATURES차원 벡터로 만들고(hashing trick),
+MongoDB에 쌓인 과거 LLM 점수(score 0~5)로 선형 회귀(L2)를 학습합니다.
+예측은 논문 묶음 전체를 한 번에 계산하므로 초록 10만 편도 몇 초면 끝납니다.
+
+  python run_briefing.py --train-relevance   # 저장된 점수로 학습 → RELEVANCE_MODEL_FILE
+
+모델 파일이 있으면 fetch_and_select_papers()가 수집 중에 예측 점수가
+RELEVANCE_MIN_SCORE 미만인 후보를 빼고, 같은 학회 우선순위 안에서는 예측 점수 순으로
+할당량만큼만 골라 LLM으로 보냅니다.
+"""
+
+from __future__ import annotations
+
+import os
+import zlib
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .config import (
+    MONGODB_COLLECTION,
+    RELEVANCE_FEATURES,
+    RELEVANCE_GATE,
+    RELEVANCE_MIN_TRAIN,
+    RELEVANCE_MODEL_FILE,
+    SNAPSHOT_COLLECTION,
+)
+from .ids import canonical_id
+from .keyword_matcher import _SEPARATORS
+
+_BIGRAM_MIX = np.uint64(0x9E3779B97F4A7C15)   # 바이그램 해시 결합 상수 (64비트 황금비)
+_EPOCHS = 300
+_LEARNING_RATE = 0.5
+_L2 = 1e-5
+_CHUNK_DOCS = 8192        # 특징 추출 한 번에 처리할 문서 수 (중간 배열 메모리 상한)
+
+
+class _TokenIds(dict):
+    """토큰 → 32비트 해시 (crc32, 실행마다 같은 값). 처음 본 토큰만 계산하고 기억합니다."""
+
+    def __missing__(self, token: bytes) -> int:
+        value = self[token] = zlib.crc32(token)
+        return value
+
+
+# 문서 경계 표시: 묶음을 이어 붙여 한 번에 토큰화할 때 문서 사이에 끼우는 바이트.
+# 영숫자가 아니므로 원래 텍스트의 토큰과 섞이지 않고, crc32 범위(32비트) 밖의 값으로 구분합니다.
+_BOUNDARY = "\x01"
+_BOUNDARY_ID = 1 << 32
+_BATCH_SEPARATORS = bytes(c if c == ord(_BOUNDARY) else x for c, x in enumerate(_SEPARATORS))
+_token_ids = _TokenIds({_BOUNDARY.encode(): _BOUNDARY_ID})
+
+
+def _token_stream(texts: Sequence[str]) -> np.ndarray:
+    """텍스트 묶음 전체의 토큰 해시 (문서 사이에 _BOUNDARY_ID).
+
+    keyword_matcher.tokenize()와 같은 규칙(소문자 ASCII 영숫자)이지만, 문서마다 부르는 대신
+    묶음을 이어 붙여 encode/lower/translate/split을 한 번씩만 합니다.
+    """
+    joined = f" {_BOUNDARY} ".join(texts)
+    if joined.count(_BOUNDARY) != len(texts) - 1:   # 원문에 경계 바이트가 있으면 지우고 다시
+        joined = f" {_BOUNDARY} ".join(t.replace(_BOUNDARY, " ") for t in texts)
+    tokens = joined.encode("utf-8", "replace").lower().translate(_BATCH_SEPARATORS).split()
+    return np.fromiter(map(_token_ids.__getitem__, tokens), dtype=np.uint64, count=len(tokens))
+
+
+def _featurize_chunk(texts: Sequence[str], n_features: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    stream = _token_stream(texts)
+    boundary = stream == _BOUNDARY_ID
+    doc_of = np.cumsum(boundary)              # 경계 토큰마다 문서 번호 +1
+    tokens, doc_of = stream[~boundary], doc_of[~boundary]
+
+    same_doc = doc_of[1:] == doc_of[:-1]
+    bigrams = (tokens[:-1] * _BIGRAM_MIX + tokens[1:])[same_doc] >> np.uint64(16)
+    features = np.concatenate([tokens, bigrams]) % np.uint64(n_features)
+    docs = np.concatenate([doc_of, doc_of[1:][same_doc]])
+
+    per_doc = np.bincount(docs, minlength=len(texts))
+    values = (1.0 / np.sqrt(np.maximum(per_doc, 1)))[docs].astype(np.float32)
+    return docs, features.astype(np.int64), values
+
+
+def featurize(texts: Sequence[str], n_features: int = RELEVANCE_FEATURES) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """텍스트 묶음을 해시 특징 (문서 번호, 특징 번호, 값) 배열로 바꿉니다.
+
+    특징 = 단어 + 연속 두 단어. 값은 문서별 특징 수의 제곱근으로 나눠(≈ L2 정규화)
+    초록 길이에 따라 점수가 커지지 않게 합니다. 같은 특징이 여러 번 나오면 여러 항목으로 남고
+    선형 모델에서는 합쳐져 등장 횟수가 됩니다.
+    """
+    parts = []
+    for start in range(0, len(texts), _CHUNK_DOCS):
+        docs, features, values = _featurize_chunk(texts[start:start + _CHUNK_DOCS], n_features)
+        parts.append((docs + start, features, values))
+    if not parts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+    return tuple(np.concatenate(arrays) for arrays in zip(*parts))
+
+
+def paper_text(title: str, abstract: str) -> str:
+    return f"{title}\n{abstract}"
+
+
+class RelevanceModel:
+    """해시 n-gram 선형 회귀 (예측값은 0~5로 자름)."""
+
+    MAX_SCORE = 5.0
+
+    def __init__(self, weights: np.ndarray, bias: float, trained_on: int = 0, trained_at: str = ""):
+        self.weights = weights.astype(np.float32)
+        self.bias = float(bias)
+        self.trained_on = trained_on
+        self.trained_at = trained_at
+
+    @property
+    def n_features(self) -> int:
+        return len(self.weights)
+
+    def _raw(self, docs: np.ndarray, features: np.ndarray, values: np.ndarray, n: int) -> np.ndarray:
+        return self.bias + np.bincount(docs, weights=self.weights[features] * values, minlength=n)
+
+    def predict(self, texts: Sequence[str]) -> np.ndarray:
+        """텍스트마다 예측 관련도 (0~5)."""
+        if not texts:
+            return np.zeros(0)
+        docs, features, values = featurize(texts, self.n_features)
+        return np.clip(self._raw(docs, features, values, len(texts)), 0.0, self.MAX_SCORE)
+
+    def score_texts(self, items: Sequence[Tuple[str, str]]) -> List[float]:
+        """(제목, 초록)마다 예측 점수 (묶음 전체를 predict 한 번으로)."""
+        return [round(float(score), 3) for score in self.predict([paper_text(t, a) for t, a in items])]
+
+    def score_papers(self, papers: List) -> None:
+        """Paper.relevance에 예측 점수를 채웁니다."""
+        for paper, score in zip(papers, self.score_texts([(p.title, p.abstract) for p in papers])):
+            paper.relevance = score
+
+    @classmethod
+    def fit(
+        cls, texts: Sequence[str], scores: Sequence[float],
+        n_features: int = RELEVANCE_FEATURES, epochs: int = _EPOCHS,
+    ) -> "RelevanceModel":
+        """평균 제곱 오차 + L2를 전체 배치 AdaGrad로 최소화합니다."""
+        y = np.asarray(scores, dtype=np.float64)
+        n = len(y)
+        docs, features, values = featurize(texts, n_features)
+        model = cls(np.zeros(n_features, dtype=np.float32), float(y.mean()), trained_on=n)
+        weights = np.zeros(n_features)
+        grad_sq = np.full(n_features, 1e-8)
+        for _ in range(epochs):
+            model.weights = weights
+            err = model._raw(docs, features, values, n) - y
+            grad = np.bincount(features, weights=err[docs] * values, minlength=n_features) / n + _L2 * weights
+            grad_sq += grad * grad
+            weights -= _LEARNING_RATE * grad / np.sqrt(grad_sq)
+            model.bias -= _LEARNING_RATE * err.mean()
+        model.weights = weights.astype(np.float32)
+        model.trained_at = datetime.now().isoformat(timespec="seconds")
+        return model
+
+    # ── 저장 / 불러오기 ────────────────────────────────────────────────────
+    def save(self, path: str = RELEVANCE_MODEL_FILE) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez_compressed(
+            path, weights=self.weights, bias=self.bias,
+            trained_on=self.trained_on, trained_at=self.trained_at,
+        )
+
+    @classmethod
+    def load(cls, path: str = RELEVANCE_MODEL_FILE) -> "RelevanceModel":
+        with np.load(path) as data:
+            return cls(data["weights"], float(data["bias"]), int(data["trained_on"]), str(data["trained_at"]))
+
+
+def load_training_data(collections: Sequence[str] = (MONGODB_COLLECTION, SNAPSHOT_COLLECTION)) -> Tuple[List[str], List[float]]:
+    """LLM 트리아지 점수가 있는 저장 논문을 (텍스트, 점수) 목록으로 읽습니다.
+
+    요약이 없거나 "요약 없음"(트리아지 실패, 점수 0)인 논문은 제외하고,
+    여러 컬렉션에 있는 논문은 정규 ID로 한 번만 씁니다.
+    """
+    from .state import _get_db
+
+    db = _get_db()
+    rows: Dict[str, Tuple[str, float]] = {}
+    query = {"summary": {"$nin": [None, "", "요약 없음"]}, "score": {"$type": "number"}}
+    for name in collections:
+        for doc in db[name].find(query, {"id": 1, "title": 1, "abstract": 1, "score": 1}):
+            rows.setdefault(canonical_id(doc["id"]), (paper_text(doc.get("title", ""), doc.get("abstract", "")), doc["score"]))
+    texts = [text for text, _ in rows.values()]
+    scores = [score for _, score in rows.values()]
+    return texts, scores
+
+
+def train_relevance_model(path: str = RELEVANCE_MODEL_FILE, holdout: float = 0.1) -> Optional[RelevanceModel]:
+    """MongoDB의 과거 점수로 모델을 학습해 저장합니다 (검증용으로 holdout 비율을 떼어 오차 출력)."""
+    texts, scores = load_training_data()
+    if len(texts) < RELEVANCE_MIN_TRAIN:
+        print(f"[relevance] 학습 데이터 부족: {len(texts)}편 (최소 {RELEVANCE_MIN_TRAIN}편) → 학습 건너뜀")
+        return None
+
+    y = np.asarray(scores, dtype=np.float64)
+    order = np.random.default_rng(0).permutation(len(texts))
+    n_test = max(1, int(len(texts) * holdout))
+    test, train = order[:n_test], order[n_test:]
+    model = RelevanceModel.fit([texts[i] for i in train], y[train])
+    pred = model.predict([texts[i] for i in test])
+    mae = float(np.abs(pred - y[test]).mean())
+    baseline = float(np.abs(y[train].mean() - y[test]).mean())
+    print(f"[relevance] 검증 {n_test}편: MAE {mae:.2f} (평균값 예측 {baseline:.2f})")
+
+    model = RelevanceModel.fit(texts, y)   # 전체 데이터로 다시 학습해 저장
+    model.save(path)
+    print(f"[relevance] ✅ {len(texts)}편으로 학습 → {path}")
+    return model
+
+
+_model: Optional[RelevanceModel] = None
+_model_loaded = False
+
+
+def get_relevance_model() -> Optional[RelevanceModel]:
+    """수집 게이트용 모델 (RELEVANCE_GATE="off"이거나 모델 파일이 없으면 None)."""
+    global _model, _model_loaded
+    if not _model_loaded:
+        _model_loaded = True
+        if RELEVANCE_GATE == "off":
+            return None
+        try:
+            _model = RelevanceModel.load()
+            print(f"[relevance] 모델 로드: {_model.trained_on}편 학습 ({_model.trained_at})")
+        except FileNotFoundError:
+            print("[relevance] 모델 파일 없음 → 관련도 게이트 없이 선택 (--train-relevance로 학습)")
+        except (OSError, KeyError, ValueError) as e:
+            print(f"[relevance] 모델 로드 실패 ({e}) → 관련도 게이트 없이 선택")
+    return _model
@@ -0,0 +1,274 @@
+"""arXiv 메타데이터 스냅샷 파일을 검색 API 없이 MongoDB에 일괄 적재합니다.
+
+지원 형식 (gzip 압축 가능, 파일 첫 글자로 자동 판별):
+  - JSON lines: 한 줄에 논문 하나 (arxiv-metadata-oai-snapshot.json)
+  - OAI-PMH XML: ListRecords 응답 (metadataPrefix=arXiv 또는 arXivRaw)
+
+파일을 한 레코드씩 스트리밍하며 ARXIV_CATEGORIES / TOPIC_KEYWORDS 조건을 로컬에서
+적용하고, 통과한 논문만 INGEST_CHUNK개씩 bulk_write 하므로 파일 크기와 무관하게
+메모리 사용량이 일정합니다.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import re
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from pymongo import UpdateOne
+
+from .arxiv_fetcher import Paper, parse_venue
+from .config import ARXIV_CATEGORIES, INGEST_CHUNK, SNAPSHOT_COLLECTION
+from .ids import canonical_id
+from .keyword_matcher import match_keywords
+from .state import _get_db
+
+_CATEGORIES = set(ARXIV_CATEGORIES)
+# 카테고리 문자열이 한 번도 안 나오는 줄은 JSON 파싱 없이 건너뜀 (대부분의 레코드)
+_CATEGORY_BYTES = re.compile(b"|".join(re.escape(c.encode()) for c in ARXIV_CATEGORIES))
+
+_PROGRESS_EVERY = 100_000
+
+
+# ── 레코드 읽기 ─────────────────────────────────────────────────────────────
+# 두 형식 모두 JSON 스냅샷과 같은 모양의 dict로 맞춰서 돌려줍니다:
+#   id, title, abstract, categories(공백 구분), comments, journal-ref,
+#   authors_parsed([[성, 이름, 접미사], ...]), published("YYYY-MM-DD"), version("v2")
+
+def _open(path: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb", buffering=1 << 20)
+
+
+def _first_version(versions: List[dict]) -> tuple:
+    """JSON 스냅샷 versions 필드에서 (v1 제출일, 최신 버전)을 구합니다."""
+    if not versions:
+        return "", ""
+    try:
+        published = parsedate_to_datetime(versions[0]["created"]).strftime("%Y-%m-%d")
+    except (KeyError, TypeError, ValueError):
+        published = ""
+    return published, versions[-1].get("version", "")
+
+
+def iter_json_records(f) -> Iterator[dict]:
+    """JSON lines 스냅샷에서 카테고리 후보 레코드만 읽습니다."""
+    for line in f:
+        if not _CATEGORY_BYTES.search(line):
+            continue
+        try:
+            rec = json.loads(line)
+        except ValueError:
+            continue
+        rec["published"], rec["version"] = _first_version(rec.get("versions") or [])
+        if not rec["published"]:
+            rec["published"] = (rec.get("update_date") or "")[:10]
+        yield rec
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _xml_record(meta: ET.Element) -> dict:
+    """OAI-PMH <arXiv> / <arXivRaw> 메타데이터를 JSON 스냅샷 모양으로 바꿉니다."""
+    rec: dict = {}
+    versions: List[dict] = []
+    for child in meta:
+        name = _local(child.tag)
+        if name == "authors" and len(child):
+            # arXiv 형식: <author><keyname/><forenames/><suffix/></author>
+            rec["authors_parsed"] = [
+                [
+                    "".join(e.text or "" for e in author if _local(e.tag) == part)
+                    for part in ("keyname", "forenames", "suffix")
+                ]
+                for author in child
+            ]
+        elif name == "version":
+            # arXivRaw 형식: <version version="v1"><date>RFC 2822</date>...</version>
+            date = next((e.text for e in child if _local(e.tag) == "date"), "")
+            versions.append({"version": child.get("version", ""), "created": date})
+        else:
+            rec[name] = (child.text or "").strip()
+
+    if versions:
+        rec["published"], rec["version"] = _first_version(versions)
+    else:
+        rec["published"], rec["version"] = rec.get("created", "")[:10], ""
+    return rec
+
+
+def iter_oai_records(f) -> Iterator[dict]:
+    """OAI-PMH XML에서 레코드를 하나씩 읽고, 처리한 요소는 바로 버립니다."""
+    context = ET.iterparse(f, events=("start", "end"))
+    _, root = next(context)
+    container = root
+    for event, elem in context:
+        if event == "start":
+            if _local(elem.tag) == "ListRecords":
+                container = elem
+            continue
+        if _local(elem.tag) != "record":
+            continue
+        header = next((e for e in elem if _local(e.tag) == "header"), None)
+        metadata = next((e for e in elem if _local(e.tag) == "metadata"), None)
+        if header is not None and header.get("status") == "deleted":
+            metadata = None
+        if metadata is not None and len(metadata):
+            rec = _xml_record(metadata[0])
+            if any(c in rec.get("categories", "") for c in ARXIV_CATEGORIES):
+                yield rec
+        container.clear()   # 읽은 레코드 해제 (파일 크기와 무관한 메모리 사용)
+
+
+def iter_records(path: str) -> Iterator[dict]:
+    """파일 형식을 판별해 레코드를 스트리밍합니다."""
+    with _open(path) as f:
+        head = f.peek(64)[:64].lstrip()
+        if head.startswith(b"<"):
+            yield from iter_oai_records(f)
+        else:
+            yield from iter_json_records(f)
+
+
+# ── Paper 변환 ───────────────────────────────────────────────────────────────
+
+def _author_names(rec: dict) -> List[str]:
+    parsed = rec.get("authors_parsed")
+    if parsed:
+        return [" ".join(p for p in (first, last, *rest) if p)
+                for last, first, *rest in parsed]
+    raw = rec.get("authors") or ""
+    return [a.strip() for a in re.split(r",\s*|\s+and\s+", raw) if a.strip()]
+
+
+def paper_from_record(rec: dict) -> Optional[Paper]:
+    """필터를 통과한 레코드를 Paper로 변환합니다 (통과하지 못하면 None).
+
+    _create_paper_from_result()와 같은 정규화를 적용합니다 (버전 포함 ID,
+    공백 정리된 제목·초록, 저자 최대 3명, v1 제출일, 학회 정보).
+    """
+    categories = (rec.get("categories") or "").split()
+    if not _CATEGORIES.intersection(categories):
+        return None
+    title = " ".join((rec.get("title") or "").split())
+    abstract = " ".join((rec.get("abstract") or "").split())
+    hits = match_keywords(title, abstract)
+    if not hits.keywords:
+        return None
+
+    arxiv_id = (rec.get("id") or "").strip()
+    if not arxiv_id:
+        return None
+    short_id = f"{arxiv_id}{rec.get('version') or ''}"
+    journal_ref = " ".join((rec.get("journal-ref") or "").split())
+    comment = " ".join((rec.get("comments") or "").split())
+    venue = parse_venue(journal_ref, comment)
+
+    return Paper(
+        id=short_id,
+        title=title,
+        abstract=abstract,
+        authors=_author_names(rec)[:3],
+        published=rec.get("published", ""),
+        arxiv_url=f"http://arxiv.org/abs/{short_id}",
+        pdf_url=f"http://arxiv.org/pdf/{short_id}",
+        categories=categories,
+        journal_ref=journal_ref,
+        comment=comment,
+        conference=venue.conference,
+        venue_year=venue.year,
+        venue_status=venue.status,
+        topics=list(hits.topics),
+        keyword_hits=hits.keywords,
+        topic_hits=hits.topics,
+    )
+
+
+def iter_papers(paths: Iterable[str], stats: Optional[Dict[str, int]] = None) -> Iterator[Paper]:
+    """여러 스냅샷 파일에서 조건을 만족하는 Paper를 스트리밍합니다."""
+    stats = stats if stats is not None else {}
+    stats.setdefault("read", 0)
+    stats.setdefault("matched", 0)
+    for path in paths:
+        for rec in iter_records(path):
+            stats["read"] += 1
+            if stats["read"] % _PROGRESS_EVERY == 0:
+                print(f"[ingest] 후보 {stats['read']:,}건 읽음 / 조건 통과 {stats['matched']:,}편")
+            paper = paper_from_record(rec)
+            if paper is not None:
+                stats["matched"] += 1
+                yield paper
+
+
+# ── MongoDB 적재 ─────────────────────────────────────────────────────────────
+
+def _snapshot_doc(paper: Paper, now: datetime) -> dict:
+    return {
+        "id": paper.id,
+        "title": paper.title,
+        "abstract": paper.abstract,
+        "authors": paper.authors,
+        "published": paper.published,
+        "arxiv_url": paper.arxiv_url,
+        "pdf_url": paper.pdf_url,
+        "categories": paper.categories,
+        "journal_ref": paper.journal_ref,
+        "comment": paper.comment,
+        "conference": paper.conference,
+        "venue_year": paper.venue_year,
+        "venue_status": paper.venue_status,
+        "topics": paper.topics,
+        "keyword_hits": paper.keyword_hits,
+        "topic_hits": paper.topic_hits,
+        "source": "snapshot",
+        "ingested_at": now,
+    }
+
+
+def ingest_snapshot(paths: List[str], chunk_size: int = INGEST_CHUNK) -> Dict[str, int]:
+    """스냅샷 파일들을 SNAPSHOT_COLLECTION에 적재합니다.
+
+    문서 키(_id)는 정규 arXiv ID라서 같은 파일(또는 더 새 스냅샷)을 다시 적재해도
+    중복 없이 최신 버전으로 덮어씁니다.
+
+    Args:
+        paths: 스냅샷 파일 경로 (.json / .xml, .gz 가능)
+        chunk_size: bulk_write 한 번에 보낼 문서 수
+
+    Returns:
+        {"read": 카테고리 후보 레코드 수, "matched": 조건 통과, "written": 적재 문서 수}
+    """
+    collection = _get_db()[SNAPSHOT_COLLECTION]
+
+    stats = {"read": 0, "matched": 0, "written": 0}
+    now = datetime.now()
+    ops: List[UpdateOne] = []
+
+    def flush() -> None:
+        if ops:
+            result = collection.bulk_write(ops, ordered=False)
+            stats["written"] += result.upserted_count + result.modified_count
+            ops.clear()
+
+    for paper in iter_papers(paths, stats):
+        ops.append(UpdateOne(
+            {"_id": canonical_id(paper.id)},
+            {"$set": _snapshot_doc(paper, now)},
+            upsert=True,
+        ))
+        if len(ops) >= chunk_size:
+            flush()
+    flush()
+
+    print(
+        f"[ingest] ✅ 완료: 후보 {stats['read']:,}건 / 조건 통과 {stats['matched']:,}편 "
+        f"/ 적재 {stats['written']:,}편 → '{SNAPSHOT_COLLECTION}' 컬렉션"
+    )
+    return stats
@@ -1,86 +1,178 @@
-"""이미 처리한 논문을 MongoDB에 저장해 중복 전송을 막습니다."""
+"""이미 처리한 논문을 저장소(MongoDB / SQLite, storage.py)에 저장해 중복 전송을 막습니다."""
 
 from __future__ import annotations
 
+import threading
+import time
 from datetime import datetime
-from typing import List, Set
+from typing import Dict, Iterable, List, Set
 
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure
+from .config import MONGODB_COLLECTION, SAVE_CHUNK
+from .db import get_db
+from .llm_usage import get_run_usage
+from .storage import PaperStore, get_store, saved_day
 
-from .config import MONGODB_URI, MONGODB_DB_NAME, MONGODB_COLLECTION
+
+def _get_db():
+    """MongoDB 데이터베이스를 반환합니다 (프로세스 공용 연결 풀, db.py)."""
+    return get_db()
 
 
 def _get_collection():
-    """MongoDB 컬렉션을 반환합니다."""
-    try:
-        client = MongoClient(MONGODB_URI, serverSelectionTimeoutMS=5000)
-        # 연결 테스트
-        client.admin.command('ping')
-        db = client[MONGODB_DB_NAME]
-        collection = db[MONGODB_COLLECTION]
-        # ID에 인덱스 생성 (빠른 조회를 위해)
-        collection.create_index("id", unique=True)
-        return collection
-    except ConnectionFailure as e:
-        print(f"[MongoDB] 연결 실패: {e}")
-        raise
+    """MongoDB 컬렉션을 반환합니다 (인덱스는 db.ensure_indexes()에서 한 번 생성)."""
+    return _get_db()[MONGODB_COLLECTION]
+
+
+class SeenIndex:
+    """이미 처리한 논문 ID 조회 (set 대용, 서버 측 확인).
 
+    전체 ID를 메모리로 가져오는 대신, 수집한 페이지의 후보 ID만 `id` 인덱스로
+    한 번에 확인합니다 (MongoDB `{"id": {"$in": [...]}}` / SQLite `IN`, PaperStore.seen_ids).
+    arxiv_fetcher가 페이지마다 prefetch를 호출하며, 조회 비용은 후보 수에만 비례하고
+    누적 논문 수와 무관합니다.
+    `in` / add / update는 set과 같게 동작하며, add한 ID는 이번 실행 안에서만 기억합니다.
+    """
 
-def load_seen() -> Set[str]:
-    """MongoDB에서 이미 처리된 논문 ID 집합을 반환합니다."""
+    def __init__(self, store: PaperStore):
+        self._store = store
+        self._seen: Set[str] = set()      # 저장돼 있거나 이번 실행에서 추가된 ID
+        self._checked: Set[str] = set()   # 서버에 확인을 마친 ID
+        self._lock = threading.Lock()
+        self.queries = 0
+
+    def prefetch(self, ids: Iterable[str]) -> None:
+        """아직 확인하지 않은 ID를 한 번의 쿼리로 확인합니다."""
+        with self._lock:
+            pending = [pid for pid in dict.fromkeys(ids) if pid not in self._checked]
+        if not pending:
+            return
+        found = self._store.seen_ids(pending)
+        with self._lock:
+            self.queries += 1
+            self._seen.update(found)
+            self._checked.update(pending)
+
+    def __contains__(self, paper_id: str) -> bool:
+        with self._lock:
+            if paper_id in self._seen:
+                return True
+            checked = paper_id in self._checked
+        if not checked:
+            self.prefetch([paper_id])   # 페이지 단위 prefetch를 거치지 않은 ID
+        with self._lock:
+            return paper_id in self._seen
+
+    def add(self, paper_id: str) -> None:
+        with self._lock:
+            self._seen.add(paper_id)
+            self._checked.add(paper_id)
+
+    def update(self, ids: Iterable[str]) -> None:
+        for paper_id in ids:
+            self.add(paper_id)
+
+    def __len__(self) -> int:
+        """저장된 논문 수 (MongoDB는 컬렉션 메타데이터 기준 추정치)."""
+        return self._store.count_papers()
+
+
+def load_seen() -> SeenIndex:
+    """이미 처리된 논문 ID 조회 객체를 반환합니다 (저장소 사용 불가 시 빈 set)."""
     try:
-        collection = _get_collection()
-        # 모든 논문의 ID만 가져오기
-        seen_ids = collection.distinct("id")
-        return set(seen_ids)
+        store = get_store()
+        store.count_papers()   # 연결 확인
+        return SeenIndex(store)
     except Exception as e:
-        print(f"[MongoDB] load_seen 오류: {e}")
+        print(f"[storage] load_seen 오류: {e}")
         return set()
 
 
-def save_papers(papers: List) -> None:
-    """논문 전체 정보를 MongoDB에 저장합니다 (upsert).
-    
+def _paper_doc(paper, saved_at: str, run_id: str = "") -> dict:
+    """Paper 객체를 papers 컬렉션 문서로 변환합니다."""
+    return {
+        "id": paper.id,
+        "title": paper.title,
+        "abstract": paper.abstract,
+        "authors": paper.authors,
+        "published": paper.published,
+        "arxiv_url": paper.arxiv_url,
+        "pdf_url": paper.pdf_url,
+        "categories": paper.categories,
+        "journal_ref": paper.journal_ref,
+        "comment": paper.comment,
+        "conference": paper.conference,
+        "venue_year": paper.venue_year,
+        "venue_status": paper.venue_status,
+        "topics": paper.topics,  # 검색 샤드 출처
+        "keyword_hits": paper.keyword_hits,  # 로컬 키워드 매칭 {키워드: 횟수}
+        "topic_hits": paper.topic_hits,      # {주제: 횟수}
+        "relevance": paper.relevance,        # 로컬 관련도 모델 예측 점수 (0~5)
+        "citation_count": paper.citation_count,  # 인용수
+        "summary": paper.summary,
+        "tags": paper.tags,
+        "score": paper.score,
+        "triage_model": paper.triage_model,  # 결과를 낸 LLM 모델
+        "saved_at": saved_at,  # 저장 날짜/시각 추가
+        "saved_date": saved_day(saved_at),  # 저장 날짜 (날짜별 조회용, 인덱스)
+        "run_id": run_id,      # 저장한 실행 (llm_usage 실행 기록과 같은 ID)
+    }
+
+
+def save_papers(papers: Iterable, chunk_size: int = SAVE_CHUNK) -> Dict[str, int]:
+    """논문 전체 정보를 저장소에 저장합니다 (upsert).
+
+    chunk_size편씩 묶어 한 번에 씁니다 (MongoDB: unordered bulk_write, SQLite: 트랜잭션 하나).
+    한 청크에서 일부 쓰기가 실패해도 나머지 문서와 다음 청크는 계속 저장하고
+    실패 건수와 첫 오류를 출력합니다. 연결 오류 등 다른 예외는 그대로 올립니다.
+
     Args:
-        papers: Paper 객체 리스트 (AI 트리아지 결과 포함)
+        papers: Paper 객체 리스트 또는 이터러블 (AI 트리아지 결과 포함)
+        chunk_size: 한 번에 보낼 논문 수
+
+    Returns:
+        {"papers": 보낸 논문 수, "upserted": 새로 추가, "matched": 기존 문서 일치,
+         "modified": 실제 변경, "failed": 쓰기 실패, "chunks": 쓰기 횟수}
     """
+    stats = {"papers": 0, "upserted": 0, "matched": 0, "modified": 0, "failed": 0, "chunks": 0}
     if not papers:
-        return
-    
+        return stats
+
     try:
-        collection = _get_collection()
+        store = get_store()
         saved_at = datetime.now().isoformat()  # 저장 시각 기록
-        
-        for paper in papers:
-            # Paper 객체를 딕셔너리로 변환
-            paper_dict = {
-                "id": paper.id,
-                "title": paper.title,
-                "abstract": paper.abstract,
-                "authors": paper.authors,
-                "published": paper.published,
-                "arxiv_url": paper.arxiv_url,
-                "pdf_url": paper.pdf_url,
-                "categories": paper.categories,
-                "journal_ref": paper.journal_ref,
-                "comment": paper.comment,
-                "conference": paper.conference,
-                "citation_count": paper.citation_count,  # 인용수
-                "summary": paper.summary,
-                "tags": paper.tags,
-                "score": paper.score,
-                "saved_at": saved_at,  # 저장 날짜/시각 추가
-            }
+        run_id = get_run_usage().run_id
+        started = time.monotonic()
+        docs: List[dict] = []
+
+        def flush() -> None:
+            if not docs:
+                return
+            stats["chunks"] += 1
             # upsert: id가 같으면 업데이트, 없으면 새로 추가
-            collection.update_one(
-                {"id": paper.id},
-                {"$set": paper_dict},
-                upsert=True
-            )
-        print(f"[MongoDB] {len(papers)}개 논문 저장 완료")
+            counts = store.upsert_papers(docs)
+            if counts["failed"]:
+                print(f"[storage] save_papers 청크 {stats['chunks']}: {len(docs)}편 중 {counts['failed']}편 실패 "
+                      f"({counts.get('error', '')[:120]})")
+            for key in ("upserted", "matched", "modified", "failed"):
+                stats[key] += counts[key]
+            docs.clear()
+
+        for paper in papers:
+            docs.append(_paper_doc(paper, saved_at, run_id))
+            stats["papers"] += 1
+            if len(docs) >= chunk_size:
+                flush()
+        flush()
+
+        elapsed = time.monotonic() - started
+        print(
+            f"[storage] {stats['papers']}개 논문 저장 완료 (신규 {stats['upserted']} / 갱신 {stats['modified']}"
+            + (f" / 실패 {stats['failed']}" if stats["failed"] else "")
+            + f", {store.name} 쓰기 {stats['chunks']}회, {elapsed:.2f}s)"
+        )
+        return stats
     except Exception as e:
-        print(f"[MongoDB] save_papers 오류: {e}")
+        print(f"[storage] save_papers 오류: {e}")
         raise
 
 
@@ -91,15 +183,57 @@ def filter_new(papers, seen: Set[str]):
     return new_papers
 
 
+def load_harvest_marks() -> Dict[str, dict]:
+    """쿼리별 arXiv 수집 high-water mark를 {키: mark}로 반환합니다.
+
+    오늘 이미 실행해 mark가 갱신된 쿼리는 오늘 첫 실행 시점의 mark(base)를 돌려줍니다.
+    같은 날 재실행하면 같은 위치·같은 페이지를 요청하므로 HTTP 응답 캐시로 재현됩니다.
+    mark는 논문과 같은 저장소(MongoDB / SQLite, PaperStore.harvest_marks)에 둡니다.
+    """
+    today = datetime.now().strftime("%Y-%m-%d")
+    marks: Dict[str, dict] = {}
+    for key, doc in get_store().harvest_marks().items():
+        if doc.get("run_date") == today:
+            if doc.get("base"):
+                marks[key] = doc["base"]
+            # base가 없으면 오늘이 첫 수집 → mark 없이 처음부터
+            continue
+        marks[key] = doc
+    return marks
+
+
+def save_harvest_marks(marks: Dict[str, dict]) -> None:
+    """쿼리별 high-water mark (최신 논문 ID/제출 시각, 다음 offset)를 저장합니다."""
+    if not marks:
+        return
+    store = get_store()
+    stored = store.harvest_marks()
+    now = datetime.now()
+    today = now.strftime("%Y-%m-%d")
+    for key, mark in marks.items():
+        existing = stored.get(key) or {}
+        if existing.get("run_date") == today:
+            base = existing.get("base")
+        else:
+            base = {k: v for k, v in existing.items()
+                    if k in ("newest_id", "newest_published", "offset", "query")} or None
+        mark = {k: v for k, v in mark.items() if k not in ("base", "run_date", "updated_at")}
+        store.put_harvest_mark(key, {**mark, "base": base, "run_date": today, "updated_at": now.isoformat()})
+
+
 def reset_database() -> None:
-    """MongoDB 컬렉션의 모든 데이터를 삭제합니다."""
+    """저장된 논문을 모두 삭제합니다."""
     try:
-        collection = _get_collection()
-        result = collection.delete_many({})
-        print(f"[MongoDB] {result.deleted_count}개 논문 삭제 완료")
+        deleted = get_store().reset_papers()
+        print(f"[storage] {deleted}개 논문 삭제 완료")
     except Exception as e:
-        print(f"[MongoDB] reset_database 오류: {e}")
+        print(f"[storage] reset_database 오류: {e}")
         raise
+    # 수집 위치도 초기화 (처음부터 다시 수집)
+    try:
+        get_store().reset_harvest_marks()
+    except Exception as e:
+        print(f"[storage] 수집 위치 초기화 건너뜀: {e}")
 
 
 # 하위 호환성을 위한 레거시 함수
@@ -0,0 +1,499 @@
+"""논문·북마크 저장소 - MongoDB / 내장 SQLite(WAL) 백엔드 공통 인터페이스.
+
+파이프라인(state.py)과 웹앱(webapp/app.py)은 get_store()만 사용합니다.
+
+  STORAGE_BACKEND=mongo  (기본) MongoDB (db.py의 공용 연결 풀)
+  STORAGE_BACKEND=sqlite 서버 없는 내장 SQLite 파일 (SQLITE_PATH, WAL 모드)
+                         소규모·단일 사용자 배포와 CI용. 트리아지/인용수 캐시,
+                         실행 기록 등 MongoDB 전용 기능은 건너뜁니다.
+
+논문·북마크와 쿼리별 수집 위치(high-water mark)는 두 백엔드 모두 저장합니다.
+
+두 백엔드는 같은 문서(dict) 형태를 주고받고 test_storage.py를 똑같이 통과해야 합니다.
+날짜 조회는 문자열 saved_at이 아니라 saved_date(저장 날짜, MongoDB는 Date 타입) 일치로 하고
+(saved_date, score) 복합 인덱스를 탑니다. saved_date가 없는 예전 문서는
+backfill_saved_date()로 채웁니다 (run_briefing.py --init-db).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from .config import (
+    BOOKMARKS_COLLECTION,
+    HARVEST_STATE_COLLECTION,
+    MONGODB_COLLECTION,
+    SAVE_CHUNK,
+    SQLITE_PATH,
+    STORAGE_BACKEND,
+)
+
+SEARCH_LIMIT = 100
+SORT_FIELDS = {"score": "score", "citation": "citation_count", "published": "published"}
+
+
+def saved_day(saved_at: str) -> Optional[datetime]:
+    """저장 시각(ISO 문자열)의 날짜 (자정 datetime). 형식이 다르면 None."""
+    try:
+        return datetime.strptime((saved_at or "")[:10], "%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+class PaperStore:
+    """저장소 공통 인터페이스. 문서는 papers 컬렉션 문서와 같은 dict (Mongo _id 제외)."""
+
+    name = "base"
+
+    # ── seen 확인 / 저장 ──────────────────────────────────────────────────
+    def seen_ids(self, ids: List[str]) -> Set[str]:
+        """ids 중 이미 저장된 ID."""
+        raise NotImplementedError
+
+    def count_papers(self) -> int:
+        raise NotImplementedError
+
+    def upsert_papers(self, docs: List[dict]) -> Dict[str, int]:
+        """문서 한 묶음을 논문 ID 기준으로 upsert합니다 (기존 문서의 다른 필드는 유지).
+
+        Returns:
+            {"upserted", "matched", "modified", "failed"} (+ 실패 시 "error": 첫 오류 메시지)
+        """
+        raise NotImplementedError
+
+    def reset_papers(self) -> int:
+        """논문을 모두 지우고 지운 수를 반환합니다."""
+        raise NotImplementedError
+
+    def backfill_saved_date(self, batch_size: int = SAVE_CHUNK) -> int:
+        """saved_date가 없는 문서에 saved_at의 날짜를 batch_size편씩 채우고 채운 수를 반환합니다."""
+        raise NotImplementedError
+
+    # ── 조회 (웹앱) ───────────────────────────────────────────────────────
+    def get_paper(self, paper_id: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def papers_by_ids(self, ids: List[str]) -> List[dict]:
+        raise NotImplementedError
+
+    def date_rollups(self) -> List[dict]:
+        """수집 날짜별 [{"_id": 날짜, "count", "avg_score", "conf_count"}] (최신 날짜 먼저)."""
+        raise NotImplementedError
+
+    def papers_on_date(self, date_str: str) -> List[dict]:
+        """그 날짜(YYYY-MM-DD)에 저장된 논문 (점수 높은 순)."""
+        raise NotImplementedError
+
+    def search(self, q: str = "", tag: str = "", conf: str = "", sort_by: str = "score",
+               limit: int = SEARCH_LIMIT) -> List[dict]:
+        """제목·요약·초록 정규식 검색 (대소문자 무시) + 태그·학회 필터, sort_by 내림차순."""
+        raise NotImplementedError
+
+    # ── 참조 링크 ─────────────────────────────────────────────────────────
+    def add_ref(self, paper_id: str, ref: dict) -> List[dict]:
+        raise NotImplementedError
+
+    def delete_ref(self, paper_id: str, ref_id: str) -> List[dict]:
+        raise NotImplementedError
+
+    # ── 북마크 ────────────────────────────────────────────────────────────
+    def bookmarks(self) -> Dict[str, str]:
+        """{paper_id: bookmarked_at}"""
+        raise NotImplementedError
+
+    def toggle_bookmark(self, paper_id: str) -> bool:
+        """북마크를 켜고/끄고, 켜졌으면 True."""
+        raise NotImplementedError
+
+    def count_bookmarks(self) -> int:
+        return len(self.bookmarks())
+
+    # ── 수집 위치 (high-water mark, state.load/save_harvest_marks) ──────────
+    def harvest_marks(self) -> Dict[str, dict]:
+        """{쿼리 키: mark 문서}"""
+        raise NotImplementedError
+
+    def put_harvest_mark(self, key: str, doc: dict) -> None:
+        """쿼리 키의 mark 문서를 통째로 바꿉니다."""
+        raise NotImplementedError
+
+    def reset_harvest_marks(self) -> int:
+        """수집 위치를 모두 지우고 지운 수를 반환합니다."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+# ── MongoDB ──────────────────────────────────────────────────────────────────
+class MongoStore(PaperStore):
+    """MongoDB 백엔드 (db.py 공용 연결 풀, 인덱스는 db.INDEXES)."""
+
+    name = "mongo"
+
+    def __init__(self, db=None):
+        self._db = db
+
+    def _col(self, name: str = MONGODB_COLLECTION):
+        if self._db is None:
+            from .db import get_db
+            return get_db()[name]
+        return self._db[name]
+
+    def seen_ids(self, ids: List[str]) -> Set[str]:
+        return {doc["id"] for doc in self._col().find({"id": {"$in": list(ids)}}, {"id": 1, "_id": 0})}
+
+    def count_papers(self) -> int:
+        return self._col().estimated_document_count()
+
+    def upsert_papers(self, docs: List[dict]) -> Dict[str, int]:
+        from pymongo import UpdateOne
+        from pymongo.errors import BulkWriteError
+
+        ops = [UpdateOne({"id": doc["id"]}, {"$set": doc}, upsert=True) for doc in docs]
+        if not ops:
+            return {"upserted": 0, "matched": 0, "modified": 0, "failed": 0}
+        try:
+            result = self._col().bulk_write(ops, ordered=False)
+            return {"upserted": result.upserted_count, "matched": result.matched_count,
+                    "modified": result.modified_count, "failed": 0}
+        except BulkWriteError as e:
+            details = e.details
+            errors = details.get("writeErrors", [])
+            return {"upserted": details.get("nUpserted", 0), "matched": details.get("nMatched", 0),
+                    "modified": details.get("nModified", 0), "failed": len(errors),
+                    "error": errors[0].get("errmsg", "") if errors else ""}
+
+    def reset_papers(self) -> int:
+        return self._col().delete_many({}).deleted_count
+
+    def backfill_saved_date(self, batch_size: int = SAVE_CHUNK) -> int:
+        from pymongo import UpdateOne
+
+        col = self._col()
+        cursor = col.find({"saved_date": {"$exists": False}}, {"saved_at": 1}).sort("_id", 1).batch_size(batch_size)
+        filled, ops = 0, []
+        for doc in cursor:
+            # 날짜를 읽을 수 없는 문서는 None으로 표시해 다음 실행에서 다시 찾지 않음
+            ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"saved_date": saved_day(doc.get("saved_at"))}}))
+            if len(ops) >= batch_size:
+                filled += col.bulk_write(ops, ordered=False).modified_count
+                ops = []
+        if ops:
+            filled += col.bulk_write(ops, ordered=False).modified_count
+        return filled
+
+    def get_paper(self, paper_id: str) -> Optional[dict]:
+        return self._col().find_one({"id": paper_id}, {"_id": 0})
+
+    def papers_by_ids(self, ids: List[str]) -> List[dict]:
+        return list(self._col().find({"id": {"$in": list(ids)}}, {"_id": 0}))
+
+    def date_rollups(self) -> List[dict]:
+        rows = self._col().aggregate([
+            {"$match": {"saved_date": {"$type": "date"}}},
+            {"$group": {
+                "_id": "$saved_date",
+                "count": {"$sum": 1},
+                "avg_score": {"$avg": "$score"},
+                "conf_count": {"$sum": {"$cond": [{"$gt": ["$conference", ""]}, 1, 0]}},
+            }},
+            {"$sort": {"_id": -1}},
+        ])
+        return [{**row, "_id": row["_id"].strftime("%Y-%m-%d")} for row in rows]
+
+    def papers_on_date(self, date_str: str) -> List[dict]:
+        day = saved_day(date_str)
+        if day is None:
+            return []
+        return list(self._col().find({"saved_date": day}, {"_id": 0}).sort("score", -1))
+
+    def search(self, q: str = "", tag: str = "", conf: str = "", sort_by: str = "score",
+               limit: int = SEARCH_LIMIT) -> List[dict]:
+        query: dict = {}
+        if q:
+            query["$or"] = [
+                {"title":    {"$regex": q, "$options": "i"}},
+                {"summary":  {"$regex": q, "$options": "i"}},
+                {"abstract": {"$regex": q, "$options": "i"}},
+            ]
+        if tag:
+            query["tags"] = tag
+        if conf:
+            query["conference"] = conf
+        field = SORT_FIELDS.get(sort_by, "score")
+        return list(self._col().find(query, {"_id": 0}).sort([(field, -1)]).limit(limit))
+
+    def add_ref(self, paper_id: str, ref: dict) -> List[dict]:
+        self._col().update_one({"id": paper_id}, {"$push": {"refs": ref}})
+        return (self._col().find_one({"id": paper_id}, {"refs": 1, "_id": 0}) or {}).get("refs", [])
+
+    def delete_ref(self, paper_id: str, ref_id: str) -> List[dict]:
+        self._col().update_one({"id": paper_id}, {"$pull": {"refs": {"ref_id": ref_id}}})
+        return (self._col().find_one({"id": paper_id}, {"refs": 1, "_id": 0}) or {}).get("refs", [])
+
+    def bookmarks(self) -> Dict[str, str]:
+        return {doc["paper_id"]: doc.get("bookmarked_at", "")
+                for doc in self._col(BOOKMARKS_COLLECTION).find({}, {"_id": 0})}
+
+    def toggle_bookmark(self, paper_id: str) -> bool:
+        col = self._col(BOOKMARKS_COLLECTION)
+        if col.delete_one({"paper_id": paper_id}).deleted_count:
+            return False
+        col.insert_one({"paper_id": paper_id, "bookmarked_at": datetime.now().isoformat()})
+        return True
+
+    def count_bookmarks(self) -> int:
+        return self._col(BOOKMARKS_COLLECTION).count_documents({})
+
+    def harvest_marks(self) -> Dict[str, dict]:
+        return {doc.pop("_id"): doc for doc in self._col(HARVEST_STATE_COLLECTION).find({})}
+
+    def put_harvest_mark(self, key: str, doc: dict) -> None:
+        self._col(HARVEST_STATE_COLLECTION).replace_one({"_id": key}, doc, upsert=True)
+
+    def reset_harvest_marks(self) -> int:
+        return self._col(HARVEST_STATE_COLLECTION).delete_many({}).deleted_count
+
+
+# ── SQLite (내장, WAL) ────────────────────────────────────────────────────────
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    id             TEXT PRIMARY KEY,
+    saved_at       TEXT NOT NULL DEFAULT '',
+    saved_date     TEXT,                      -- YYYY-MM-DD (saved_at의 날짜)
+    score          REAL,
+    citation_count INTEGER,
+    published      TEXT,
+    conference     TEXT,
+    doc            TEXT NOT NULL              -- 문서 전체 (JSON)
+);
+CREATE INDEX IF NOT EXISTS papers_score ON papers (score DESC);
+CREATE TABLE IF NOT EXISTS bookmarks (
+    paper_id      TEXT PRIMARY KEY,
+    bookmarked_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS harvest_state (
+    key TEXT PRIMARY KEY,                     -- 쿼리 키 (arxiv_fetcher._harvest_key)
+    doc TEXT NOT NULL                         -- mark 문서 (JSON)
+);
+"""
+_COLUMNS = ("saved_at", "saved_date", "score", "citation_count", "published", "conference")
+# saved_date 열이 없던 예전 파일도 열을 추가한 뒤 만듦
+_DATE_INDEX = "CREATE INDEX IF NOT EXISTS papers_saved_date_score ON papers (saved_date DESC, score DESC)"
+_DAY_SQL = ("CASE WHEN substr(saved_at, 1, 10) GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'"
+            " THEN substr(saved_at, 1, 10) ELSE '' END")
+
+
+def _sqlite_doc(doc: dict) -> dict:
+    """SQLite에 둘 문서 (saved_date는 YYYY-MM-DD 문자열로)."""
+    day = doc.get("saved_date")
+    return {**doc, "saved_date": day.strftime("%Y-%m-%d")} if isinstance(day, datetime) else doc
+
+
+def _regexp(pattern: str, value: Optional[str]) -> bool:
+    return value is not None and re.search(pattern, value, re.IGNORECASE) is not None
+
+
+class SqliteStore(PaperStore):
+    """내장 SQLite 백엔드 (WAL 모드, 스레드마다 연결 하나).
+
+    문서는 JSON 그대로 `doc` 열에 두고, 정렬·필터에 쓰는 필드만 열로 꺼내 인덱스를 겁니다.
+    SQLite에는 날짜 타입이 없어 saved_date는 YYYY-MM-DD 문자열로 저장합니다.
+    upsert는 기존 문서에 최상위 필드를 덮어써(한 트랜잭션) MongoDB $set과 같게 동작합니다.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str = SQLITE_PATH):
+        self.path = path
+        self._local = threading.local()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+        if "saved_date" not in {row[1] for row in conn.execute("PRAGMA table_info(papers)")}:
+            conn.execute("ALTER TABLE papers ADD COLUMN saved_date TEXT")
+        conn.execute(_DATE_INDEX)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.create_function("REGEXP", 2, _regexp, deterministic=True)
+            self._local.conn = conn
+        return conn
+
+    def _docs(self, sql: str, params=()) -> List[dict]:
+        return [json.loads(row[0]) for row in self._conn().execute(sql, params)]
+
+    def seen_ids(self, ids: List[str]) -> Set[str]:
+        ids = list(ids)
+        found: Set[str] = set()
+        for i in range(0, len(ids), 500):   # SQLite 바인딩 변수 수 제한
+            part = ids[i:i + 500]
+            rows = self._conn().execute(f"SELECT id FROM papers WHERE id IN ({','.join('?' * len(part))})", part)
+            found.update(row[0] for row in rows)
+        return found
+
+    def count_papers(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+
+    def upsert_papers(self, docs: List[dict]) -> Dict[str, int]:
+        if not docs:
+            return {"upserted": 0, "matched": 0, "modified": 0, "failed": 0}
+        merged: Dict[str, dict] = {}
+        for doc in docs:
+            merged[doc["id"]] = {**merged.get(doc["id"], {}), **_sqlite_doc(doc)}
+        conn = self._conn()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            existing = {doc["id"]: doc for doc in self.papers_by_ids(list(merged))}
+            # 저장된 JSON과 같은 문서는 다시 쓰지 않음 (MongoDB $set처럼 바뀐 문서만 modified)
+            rows = []
+            for pid, doc in merged.items():
+                doc = {**existing.get(pid, {}), **doc}
+                text = json.dumps(doc, ensure_ascii=False, default=str)
+                if pid not in existing or json.loads(text) != existing[pid]:
+                    rows.append((pid, *(doc.get(c) for c in _COLUMNS), text))
+            conn.executemany(
+                f"INSERT OR REPLACE INTO papers (id, {', '.join(_COLUMNS)}, doc)"
+                f" VALUES (?, {', '.join('?' * len(_COLUMNS))}, ?)",
+                rows,
+            )
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            conn.execute("ROLLBACK")
+            return {"upserted": 0, "matched": 0, "modified": 0, "failed": len(docs), "error": str(e)}
+        return {"upserted": len(merged) - len(existing), "matched": len(existing),
+                "modified": len(rows) - (len(merged) - len(existing)), "failed": 0}
+
+    def reset_papers(self) -> int:
+        return self._conn().execute("DELETE FROM papers").rowcount
+
+    def backfill_saved_date(self, batch_size: int = SAVE_CHUNK) -> int:
+        conn = self._conn()
+        filled = 0
+        while True:
+            # 날짜를 읽을 수 없는 문서는 ''로 표시해 다음 배치에서 다시 찾지 않음
+            count = conn.execute(
+                f"""UPDATE papers SET saved_date = {_DAY_SQL}, doc = json_set(doc, '$.saved_date', {_DAY_SQL})
+                    WHERE rowid IN (SELECT rowid FROM papers WHERE saved_date IS NULL LIMIT ?)""",
+                (batch_size,),
+            ).rowcount
+            if not count:
+                return filled
+            filled += count
+
+    def get_paper(self, paper_id: str) -> Optional[dict]:
+        docs = self._docs("SELECT doc FROM papers WHERE id = ?", (paper_id,))
+        return docs[0] if docs else None
+
+    def papers_by_ids(self, ids: List[str]) -> List[dict]:
+        ids = list(ids)
+        docs: List[dict] = []
+        for i in range(0, len(ids), 500):
+            part = ids[i:i + 500]
+            docs += self._docs(f"SELECT doc FROM papers WHERE id IN ({','.join('?' * len(part))})", part)
+        return docs
+
+    def date_rollups(self) -> List[dict]:
+        rows = self._conn().execute(
+            """SELECT saved_date, COUNT(*), AVG(score), SUM(CASE WHEN conference > '' THEN 1 ELSE 0 END)
+               FROM papers WHERE saved_date > '' GROUP BY saved_date ORDER BY saved_date DESC"""
+        )
+        return [{"_id": day, "count": count, "avg_score": avg, "conf_count": conf}
+                for day, count, avg, conf in rows]
+
+    def papers_on_date(self, date_str: str) -> List[dict]:
+        return self._docs("SELECT doc FROM papers WHERE saved_date = ? ORDER BY score DESC", (date_str,))
+
+    def search(self, q: str = "", tag: str = "", conf: str = "", sort_by: str = "score",
+               limit: int = SEARCH_LIMIT) -> List[dict]:
+        where, params = [], []
+        if q:
+            where.append("(json_extract(doc, '$.title') REGEXP ? OR json_extract(doc, '$.summary') REGEXP ?"
+                         " OR json_extract(doc, '$.abstract') REGEXP ?)")
+            params += [q, q, q]
+        if tag:
+            where.append("EXISTS (SELECT 1 FROM json_each(papers.doc, '$.tags') WHERE value = ?)")
+            params.append(tag)
+        if conf:
+            where.append("conference = ?")
+            params.append(conf)
+        field = SORT_FIELDS.get(sort_by, "score")
+        sql = "SELECT doc FROM papers" + (f" WHERE {' AND '.join(where)}" if where else "")
+        return self._docs(f"{sql} ORDER BY {field} DESC LIMIT ?", (*params, limit))
+
+    def _update_refs(self, paper_id: str, change) -> List[dict]:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            doc = self.get_paper(paper_id)
+            if doc is None:
+                conn.execute("COMMIT")
+                return []
+            doc["refs"] = change(doc.get("refs", []))
+            conn.execute("UPDATE papers SET doc = ? WHERE id = ?", (json.dumps(doc, ensure_ascii=False), paper_id))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return doc["refs"]
+
+    def add_ref(self, paper_id: str, ref: dict) -> List[dict]:
+        return self._update_refs(paper_id, lambda refs: refs + [ref])
+
+    def delete_ref(self, paper_id: str, ref_id: str) -> List[dict]:
+        return self._update_refs(paper_id, lambda refs: [r for r in refs if r.get("ref_id") != ref_id])
+
+    def bookmarks(self) -> Dict[str, str]:
+        return dict(self._conn().execute("SELECT paper_id, bookmarked_at FROM bookmarks"))
+
+    def toggle_bookmark(self, paper_id: str) -> bool:
+        conn = self._conn()
+        if conn.execute("DELETE FROM bookmarks WHERE paper_id = ?", (paper_id,)).rowcount:
+            return False
+        conn.execute("INSERT INTO bookmarks (paper_id, bookmarked_at) VALUES (?, ?)",
+                     (paper_id, datetime.now().isoformat()))
+        return True
+
+    def count_bookmarks(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM bookmarks").fetchone()[0]
+
+    def harvest_marks(self) -> Dict[str, dict]:
+        return {key: json.loads(doc) for key, doc in self._conn().execute("SELECT key, doc FROM harvest_state")}
+
+    def put_harvest_mark(self, key: str, doc: dict) -> None:
+        self._conn().execute("INSERT OR REPLACE INTO harvest_state (key, doc) VALUES (?, ?)",
+                             (key, json.dumps(doc, ensure_ascii=False)))
+
+    def reset_harvest_marks(self) -> int:
+        return self._conn().execute("DELETE FROM harvest_state").rowcount
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+_store: Optional[PaperStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> PaperStore:
+    """STORAGE_BACKEND에 따른 공용 저장소."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SqliteStore() if STORAGE_BACKEND == "sqlite" else MongoStore()
+    return _store
@@ -0,0 +1,226 @@
+"""트리아지 배치를 토큰 예산 기준으로 묶습니다 (입력 + 예상 출력, 응답 시간 목표).
+
+토큰 수는 tiktoken이 설치되어 있으면 그것으로, 없으면 글자 수로 추정합니다.
+응답마다 실제 사용량(usage)과 소요 시간을 기록해 추정치를 보정하고,
+보정값은 모델별로 TOKEN_CALIBRATION_FILE에 저장되어 다음 실행에도 이어집니다.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import deque
+from typing import Callable, List, Optional
+
+from .config import (
+    TOKEN_CALIBRATION_FILE,
+    TRIAGE_BATCH,
+    TRIAGE_CONTEXT_TOKENS,
+    TRIAGE_HEDGE_MIN_SAMPLES,
+    TRIAGE_HEDGE_WINDOW,
+    TRIAGE_LATENCY_SLO,
+    TRIAGE_MAX_OUTPUT_TOKENS,
+    TRIAGE_OUTPUT_TOKENS_PER_PAPER,
+    TRIAGE_OUTPUT_TPS,
+)
+
+_CHARS_PER_TOKEN = 4.0   # tiktoken이 없을 때의 초기 추정 (영문 기준)
+_EMA = 0.3               # 보정값 지수 이동 평균 가중치 (최근 관측 비중)
+_SAFETY = 0.9            # 예산의 90%까지만 채움
+_TPS_RANGE = (5.0, 500.0)  # 출력 속도 관측값 허용 범위 (토큰/초)
+
+
+def _load_encoder(model: str) -> Optional[Callable[[str], int]]:
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        enc = tiktoken.encoding_for_model(model)
+    except KeyError:
+        enc = tiktoken.get_encoding("o200k_base")
+    return lambda text: len(enc.encode(text))
+
+
+class TokenEstimator:
+    """모델별 토큰 추정기 (관측값으로 스스로 보정).
+
+    보정값:
+      - input_ratio: 실제 입력 토큰 / 로컬 추정치
+      - output_per_paper: 논문 1편당 실제 출력 토큰
+      - output_tps: 출력 토큰 / 응답 시간 (초) → 응답 시간 목표를 출력 토큰 상한으로 환산
+      - latencies: 최근 TRIAGE_HEDGE_WINDOW회 응답 시간 → 헤지 기준 (rolling p95)
+    """
+
+    def __init__(self, model: str, path: str = TOKEN_CALIBRATION_FILE):
+        self.model = model
+        self.path = path
+        self._encode = _load_encoder(model)
+        self._lock = threading.Lock()
+        self.input_ratio = 1.0
+        self.output_per_paper = float(TRIAGE_OUTPUT_TOKENS_PER_PAPER)
+        self.output_tps = float(TRIAGE_OUTPUT_TPS)
+        self.observations = 0
+        self.latencies: deque = deque(maxlen=TRIAGE_HEDGE_WINDOW)
+        self._load()
+
+    # ── 저장 / 불러오기 ────────────────────────────────────────────────────
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                saved = json.load(f).get(self.model, {})
+        except (OSError, ValueError):
+            return
+        # 토크나이저가 바뀌면(설치/제거) 입력 보정값은 의미가 없으므로 버림
+        if saved.get("tokenizer") == self.tokenizer:
+            self.input_ratio = saved.get("input_ratio", self.input_ratio)
+        self.output_per_paper = saved.get("output_per_paper", self.output_per_paper)
+        self.output_tps = saved.get("output_tps", self.output_tps)
+        self.observations = saved.get("observations", 0)
+        self.latencies.extend(saved.get("latencies", []))
+
+    def save(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        data[self.model] = {
+            "tokenizer": self.tokenizer,
+            "input_ratio": round(self.input_ratio, 4),
+            "output_per_paper": round(self.output_per_paper, 1),
+            "output_tps": round(self.output_tps, 1),
+            "observations": self.observations,
+            "latencies": [round(x, 2) for x in self.latencies],
+        }
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+        except OSError as e:
+            print(f"[token] 보정값 저장 실패: {e}")
+
+    # ── 추정 ──────────────────────────────────────────────────────────────
+    @property
+    def tokenizer(self) -> str:
+        return "tiktoken" if self._encode else "chars"
+
+    def raw_count(self, text: str) -> int:
+        """보정 전 로컬 추정치."""
+        if self._encode:
+            return self._encode(text)
+        return int(len(text) / _CHARS_PER_TOKEN) + 1
+
+    def input_tokens(self, text: str) -> int:
+        return int(self.raw_count(text) * self.input_ratio) + 1
+
+    def output_tokens(self, n_papers: int) -> int:
+        return int(self.output_per_paper * n_papers) + 1
+
+    def max_output_tokens(self) -> int:
+        """한 요청의 출력 토큰 상한 (모델 한도와 응답 시간 목표 중 작은 값)."""
+        return int(min(TRIAGE_MAX_OUTPUT_TOKENS, TRIAGE_LATENCY_SLO * self.output_tps) * _SAFETY)
+
+    def latency_quantile(self, q: float) -> Optional[float]:
+        """최근 응답 시간의 q 분위수 (표본이 TRIAGE_HEDGE_MIN_SAMPLES개 미만이면 None)."""
+        with self._lock:
+            samples = sorted(self.latencies)
+        if len(samples) < TRIAGE_HEDGE_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    # ── 보정 ──────────────────────────────────────────────────────────────
+    def observe(self, raw_input: int, n_papers: int, usage, latency: float) -> None:
+        """응답 시간을 기록하고, 실제 사용량으로 보정값을 갱신합니다.
+
+        Args:
+            raw_input: 요청 입력의 raw_count() 합
+            n_papers: 배치 논문 수
+            usage: 응답 usage (prompt_tokens / completion_tokens), 없으면 보정 생략
+            latency: 요청~응답 시간 (초)
+        """
+        with self._lock:
+            self.latencies.append(latency)
+        prompt = getattr(usage, "prompt_tokens", None)
+        completion = getattr(usage, "completion_tokens", None)
+        if not prompt or not completion or n_papers <= 0:
+            return
+        with self._lock:
+            self.input_ratio += _EMA * (prompt / max(raw_input, 1) - self.input_ratio)
+            self.output_per_paper += _EMA * (completion / n_papers - self.output_per_paper)
+            if latency > 0:
+                # 캐시 응답·네트워크 지연 등 이상치가 목표 시간 환산을 흔들지 않도록 범위 제한
+                tps = min(max(completion / latency, _TPS_RANGE[0]), _TPS_RANGE[1])
+                self.output_tps += _EMA * (tps - self.output_tps)
+            self.observations += 1
+
+
+def pack_batches(
+    papers: List,
+    prompt_of: Callable[[object], str],
+    estimator: TokenEstimator,
+    fixed_tokens: int,
+    max_papers: int = TRIAGE_BATCH,
+) -> List[List]:
+    """논문을 요청 수가 가장 적도록 토큰 예산 안에서 묶습니다.
+
+    제약 (요청 1회당):
+      - 입력 + 예상 출력 ≤ TRIAGE_CONTEXT_TOKENS
+      - 예상 출력 ≤ 모델 출력 한도, 응답 시간 목표(TRIAGE_LATENCY_SLO × 출력 속도)
+      - 논문 수 ≤ max_papers
+
+    먼저 순서대로 채워 필요한 요청 수 k를 구한 뒤, 같은 k개 안에서 배치 크기를
+    고르게 나눕니다 (동시 실행 시 가장 느린 배치가 전체 시간을 결정하므로).
+
+    Args:
+        prompt_of: 논문 1편의 프롬프트 조각을 만드는 함수
+        fixed_tokens: 시스템 프롬프트 등 요청마다 고정된 입력 토큰
+    """
+    if not papers:
+        return []
+    cost = [estimator.input_tokens(prompt_of(p)) for p in papers]
+    per_out = estimator.output_per_paper
+    max_out = estimator.max_output_tokens()
+    budget = TRIAGE_CONTEXT_TOKENS * _SAFETY
+
+    def fits(n: int, input_sum: int) -> bool:
+        out = per_out * n
+        return n <= max_papers and (n == 1 or (out <= max_out and fixed_tokens + input_sum + out <= budget))
+
+    # 1) 순서대로 채우기 → 최소 요청 수
+    greedy: List[List[int]] = [[]]
+    used = 0
+    for i, c in enumerate(cost):
+        if greedy[-1] and not fits(len(greedy[-1]) + 1, used + c):
+            greedy.append([])
+            used = 0
+        greedy[-1].append(i)
+        used += c
+    k = len(greedy)
+
+    # 2) 같은 요청 수로 고르게 나누기 (제약을 어기면 1의 결과 사용)
+    size, extra = divmod(len(papers), k)
+    balanced: List[List[int]] = []
+    start = 0
+    for b in range(k):
+        end = start + size + (1 if b < extra else 0)
+        balanced.append(list(range(start, end)))
+        start = end
+    if all(fits(len(b), sum(cost[i] for i in b)) for b in balanced):
+        groups = balanced
+    else:
+        groups = greedy
+    return [[papers[i] for i in g] for g in groups]
+
+
+_estimators: dict = {}
+_estimators_lock = threading.Lock()
+
+
+def get_estimator(model: str) -> TokenEstimator:
+    """모델별 공용 TokenEstimator."""
+    with _estimators_lock:
+        if model not in _estimators:
+            _estimators[model] = TokenEstimator(model)
+        return _estimators[model]
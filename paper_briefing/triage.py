@@ -1,52 +1,31 @@
-"""OpenAI API로 논문 목록을 일괄 트리아지합니다 (요약 / 태그 / 점수)."""
+"""LLM으로 논문 목록을 일괄 트리아지합니다 (요약 / 태그 / 점수).
+
+배치는 토큰 예산으로 크기를 정해(token_budget.py) TRIAGE_CONCURRENCY개까지 동시에 보내고,
+provider(providers.py: OpenAI / Gemini / mock)가 provider별 RPM/TPM limiter로 속도를 맞춥니다.
+"""
 
 from __future__ import annotations
 
-import json
-import os
-from typing import List
+import hashlib
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional
 
-from openai import OpenAI
+from openai import APIConnectionError
 
 from .arxiv_fetcher import Paper
 from .config import (
     ABSTRACT_CHARS,
     OPENAI_MODEL,
-    GEMINI_MODEL,
-    LLM_PROVIDER,
     TOPIC_KEYWORDS,
-    TRIAGE_BATCH,
+    TRIAGE_BACKOFF_BASE,
+    TRIAGE_CONCURRENCY,
+    TRIAGE_MAX_RETRIES,
 )
-
-_openai_client: OpenAI | None = None
-_gemini_client = None
-
-
-def _get_openai_client() -> OpenAI | None:
-    global _openai_client
-    api_key = os.environ.get("OPENAI_API_KEY", "")
-    if not api_key:
-        return None
-    if _openai_client is None:
-        _openai_client = OpenAI(api_key=api_key)
-    return _openai_client
-
-
-def _get_gemini_client():
-    global _gemini_client
-    api_key = os.environ.get("GEMINI_API_KEY", "")
-    if not api_key:
-        return None
-    if _gemini_client is None:
-        try:
-            from google import genai
-            client = genai.Client(api_key=api_key)
-            _gemini_client = client
-        except ImportError:
-            print("[triage] google-genai 패키지가 설치되지 않았습니다.")
-            print("[triage] 설치: pip install google-genai")
-            return None
-    return _gemini_client
+from .ids import canonical_id
+from .json_stream import JsonItemStream
+from .token_budget import TokenEstimator, pack_batches
 
 
 _TAGS = list(TOPIC_KEYWORDS.keys())  # ["AD", "VLA", "Manipulation", "Sim", "Safety"]
@@ -64,174 +43,393 @@ Example: {{"papers": [{{"id": "2401.12345", "summary": "...", "tags": ["VLA"], "
 Return valid JSON only, no markdown fences."""
 
 
-def _build_user_prompt(papers: List[Paper]) -> str:
-    items = []
-    for p in papers:
-        abstract_trunc = p.abstract[:ABSTRACT_CHARS]
-        items.append(
-            f'id: {p.id}\ntitle: {p.title}\nabstract: {abstract_trunc}'
-        )
-    return "\n\n---\n\n".join(items)
+_PAPER_SEPARATOR = "\n\n---\n\n"
 
 
-def triage_papers(papers: List[Paper]) -> List[Paper]:
-    """papers 리스트에 summary/tags/score를 채워 반환합니다."""
-    if not papers:
-        return papers
+def _paper_prompt(p: Paper) -> str:
+    abstract_trunc = p.abstract[:ABSTRACT_CHARS]
+    return f'id: {p.id}\ntitle: {p.title}\nabstract: {abstract_trunc}'
 
-    # Provider에 따라 적절한 함수 호출
-    if LLM_PROVIDER == "gemini":
-        return _triage_with_gemini(papers)
-    else:
-        return _triage_with_openai(papers)
 
+def _build_user_prompt(papers: List[Paper]) -> str:
+    return _PAPER_SEPARATOR.join(_paper_prompt(p) for p in papers)
 
-def _triage_with_openai(papers: List[Paper]) -> List[Paper]:
-    """OpenAI API를 사용한 논문 트리아지."""
-    client = _get_openai_client()
-    if client is None:
-        print("[triage] OPENAI_API_KEY 미설정 → 트리아지 건너뜀.")
-        return papers
 
-    results: dict[str, dict] = {}
+_PROMPT_HASH = hashlib.sha256(_SYSTEM_PROMPT.encode("utf-8")).hexdigest()[:16]
 
-    # 배치 처리
-    for i in range(0, len(papers), TRIAGE_BATCH):
-        batch = papers[i : i + TRIAGE_BATCH]
-        user_msg = _build_user_prompt(batch)
 
-        try:
-            resp = client.chat.completions.create(
-                model=OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": _SYSTEM_PROMPT},
-                    {"role": "user", "content": user_msg},
-                ],
-                temperature=0.2,
-                response_format={"type": "json_object"},
-            )
-            raw = resp.choices[0].message.content or "{}"
-            parsed = json.loads(raw)
-
-            # 응답 형식 처리: {"papers": [...]} 또는 배열 직접
-            if isinstance(parsed, list):
-                items = parsed
-            elif "papers" in parsed and isinstance(parsed["papers"], list):
-                items = parsed["papers"]
-            else:
-                # 첫 번째 리스트 값 찾기 (fallback)
-                items = next(
-                    (v for v in parsed.values() if isinstance(v, list)), []
-                )
-
-            for item in items:
-                # item이 딕셔너리가 아니면 건너뛰기
-                if not isinstance(item, dict):
-                    print(f"[triage] 경고: 예상치 않은 item 타입 {type(item)}: {item}")
-                    continue
-                
-                pid = str(item.get("id", "")).strip()
-                if pid:
-                    results[pid] = item
-                    # 버전 번호 없이도 매칭할 수 있도록 추가 저장
-                    pid_without_version = pid.split('v')[0] if 'v' in pid else pid
-                    if pid_without_version != pid:
-                        results[pid_without_version] = item
+def triage_papers(papers: List[Paper]) -> List[Paper]:
+    """papers 리스트에 summary/tags/score를 채워 반환합니다.
 
-        except Exception as exc:
-            print(f"[triage] OpenAI batch {i//TRIAGE_BATCH + 1} 실패: {exc}")
-            # 디버깅을 위해 raw 응답 일부 출력
-            if 'raw' in locals():
-                print(f"[triage] 응답 일부: {raw[:200]}...")
+    트리아지 캐시(정규 ID + 초록 해시 + 모델 + 프롬프트 해시)를 먼저 확인하고,
+    캐시에 없는 논문만 LLM으로 보냅니다. MongoDB를 쓸 수 없으면 전부 LLM으로 보냅니다.
+    주·보조 provider가 모두 있으면 두 모델의 캐시를 차례로 확인합니다.
+    """
+    if not papers:
+        return papers
 
-    # 결과 주입
-    for paper in papers:
-        info = results.get(paper.id, {})
-        
-        # 버전 번호 없이도 시도 (예: 2401.12345v1 → 2401.12345)
-        if not info:
-            paper_id_without_version = paper.id.split('v')[0] if 'v' in paper.id else paper.id
-            info = results.get(paper_id_without_version, {})
-        
-        # 매칭 실패 시 디버깅 정보 출력
-        if not info:
-            print(f"[triage] 경고: 논문 {paper.id} ({paper.title[:50]}...)의 요약을 찾을 수 없음")
-        
-        paper.summary = info.get("summary", "요약 없음")
-        paper.tags = info.get("tags", [])
-        try:
-            paper.score = float(info.get("score", 0.0))
-        except (TypeError, ValueError):
-            paper.score = 0.0
+    from .providers import build_triage_provider
+    provider = build_triage_provider()
+    if provider is None:
+        print("[triage] 사용할 수 있는 LLM provider 없음 → 트리아지 건너뜀.")
+        return papers
 
-    return papers
-    """Gemini API를 사용한 논문 트리아지."""
-    client = _get_gemini_client()
-    if client is None:
-        print("[triage] GEMINI_API_KEY 미설정 또는 패키지 미설치 → 트리아지 건너뜀.")
+    misses = papers
+    try:
+        from .triage_cache import load_cached_triage, record_lookup
+        hits = 0
+        for model in provider.models:
+            # 모델마다 남은 논문을 다시 확인하므로 통계는 끝에 한 번만 기록 (미적중 중복 집계 방지)
+            cached, misses = load_cached_triage(misses, model, _PROMPT_HASH, count=False)
+            _apply_results(papers, cached, warn=False)
+            hits += len(cached)
+            if not misses:
+                break
+        record_lookup(hits, len(misses))
+        print(f"[triage] 캐시 적중 {hits}편 / LLM 요청 {len(misses)}편")
+    except Exception as e:
+        print(f"[triage] 캐시 조회 실패 ({e}) → 전체 LLM 요청")
+
+    if not misses:
+        provider.close()
         return papers
 
-    results: dict[str, dict] = {}
+    _triage_with_provider(misses, provider)
+
+    try:
+        from .triage_cache import store_triage
+        by_model: Dict[str, List[Paper]] = {}
+        for paper in misses:
+            if paper.triage_model:
+                by_model.setdefault(paper.triage_model, []).append(paper)
+        for model, group in by_model.items():
+            store_triage(group, model, _PROMPT_HASH)
+    except Exception as e:
+        print(f"[triage] 캐시 저장 실패: {e}")
+    return papers
 
-    # 배치 처리
-    for i in range(0, len(papers), TRIAGE_BATCH):
-        batch = papers[i : i + TRIAGE_BATCH]
-        user_msg = _build_user_prompt(batch)
-        full_prompt = f"{_SYSTEM_PROMPT}\n\n{user_msg}"
 
-        try:
-            response = client.models.generate_content(
-                model=GEMINI_MODEL,
-                contents=full_prompt,
-                config={
-                    "temperature": 0.2,
-                    "response_mime_type": "application/json",
-                }
-            )
-            raw = response.text
-            parsed = json.loads(raw)
-
-            # 응답 형식 처리: {"papers": [...]} 또는 배열 직접
-            if isinstance(parsed, list):
-                items = parsed
-            elif "papers" in parsed and isinstance(parsed["papers"], list):
-                items = parsed["papers"]
-            else:
-                # 첫 번째 리스트 값 찾기 (fallback)
-                items = next(
-                    (v for v in parsed.values() if isinstance(v, list)), []
-                )
-
-            for item in items:
-                pid = str(item.get("id", "")).strip()
-                if pid:
-                    results[pid] = item
-                    # 버전 번호 없이도 매칭할 수 있도록 추가 저장
-                    pid_without_version = pid.split('v')[0] if 'v' in pid else pid
-                    if pid_without_version != pid:
-                        results[pid_without_version] = item
+def _estimate_tokens(batch: List[Paper], prompt: str, estimator: TokenEstimator) -> int:
+    """TPM 예약용 토큰 추정치 (보정된 입력 추정 + 논문당 예상 출력)."""
+    return estimator.input_tokens(_SYSTEM_PROMPT + prompt) + estimator.output_tokens(len(batch))
+
+
+def _plan_batches(papers: List[Paper], estimator: TokenEstimator) -> List[List[Paper]]:
+    """토큰 예산(입력 + 예상 출력, 응답 시간 목표) 안에서 요청 수가 가장 적게 묶습니다."""
+    batches = pack_batches(
+        papers,
+        lambda p: _paper_prompt(p) + _PAPER_SEPARATOR,
+        estimator,
+        fixed_tokens=estimator.input_tokens(_SYSTEM_PROMPT),
+    )
+    print(
+        f"[triage] 토큰 예산 배치: {len(papers)}편 → {len(batches)}개 "
+        f"(배치당 최대 {max(len(b) for b in batches)}편, 출력 상한 {estimator.max_output_tokens()}토큰, "
+        f"논문당 출력 ~{estimator.output_per_paper:.0f}토큰, 토크나이저 {estimator.tokenizer}, "
+        f"보정 {estimator.observations}회)"
+    )
+    return batches
+
+
+def _parse_items(raw: str) -> List[dict]:
+    """LLM 응답 JSON에서 논문별 결과 리스트를 꺼냅니다.
+
+    {"papers": [...]} 또는 배열 직접. 응답이 잘리거나 일부 객체가 깨져도
+    완성된 객체는 모두 반환합니다 (json_stream.JsonItemStream).
+    """
+    stream = JsonItemStream()
+    items = stream.feed(raw)
+    if not stream.ok:
+        print(f"[triage] 응답 불완전 (완성 {len(items)}개, 손상 {stream.corrupt}개): {raw[:200]}...")
+    return items
+
+
+def _response_schema(batch: List[Paper]) -> dict:
+    """배치 응답 JSON 스키마 - id는 이 배치의 논문 ID, tags는 _TAGS 중에서만 고르게 강제합니다.
+
+    OpenAI strict 모드 요구사항대로 모든 필드를 required, additionalProperties=false로 둡니다.
+    """
+    return {
+        "type": "object",
+        "properties": {
+            "papers": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "id": {"type": "string", "enum": list(dict.fromkeys(p.id for p in batch))},
+                        "summary": {"type": "string"},
+                        "tags": {"type": "array", "items": {"type": "string", "enum": _TAGS}},
+                        "score": {"type": "number"},
+                    },
+                    "required": ["id", "summary", "tags", "score"],
+                    "additionalProperties": False,
+                },
+            },
+        },
+        "required": ["papers"],
+        "additionalProperties": False,
+    }
+
+
+def _chat_request(batch: List[Paper], model: str = OPENAI_MODEL, user_msg: Optional[str] = None) -> dict:
+    """chat completions 요청 본문 (동기 호출과 Batch API 요청 파일이 함께 사용)."""
+    return {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": _SYSTEM_PROMPT},
+            {"role": "user", "content": user_msg if user_msg is not None else _build_user_prompt(batch)},
+        ],
+        "temperature": 0.2,
+        "response_format": {
+            "type": "json_schema",
+            "json_schema": {"name": "triage_results", "strict": True, "schema": _response_schema(batch)},
+        },
+    }
+
+
+def _norm_title(title: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9]+", title.lower()))
+
+
+def _validate_item(item: dict) -> Optional[dict]:
+    """응답 item의 필드를 검증·정리합니다 (summary 없음 / score 숫자 아님 → None).
+
+    tags는 _TAGS에 있는 것만 최대 3개, score는 0~5로 자릅니다.
+    """
+    summary = item.get("summary")
+    if not isinstance(summary, str) or not summary.strip():
+        return None
+    try:
+        score = min(max(float(item.get("score")), 0.0), 5.0)
+    except (TypeError, ValueError):
+        return None
+    tags = item.get("tags")
+    tags = [t for t in dict.fromkeys(tags) if t in _TAGS][:3] if isinstance(tags, list) else []
+    return {"id": str(item.get("id", "")).strip(), "summary": summary.strip(), "tags": tags, "score": score}
+
+
+class _ResultMatcher:
+    """배치 응답 item을 검증하고 배치의 논문에 붙입니다 (스트리밍 중 item마다 match() 호출).
+
+    매칭 순서: ID 정확히 일치 → 버전 번호 무시 → 제목 (id 자리에 제목이 온 경우)
+    → 응답 안 위치 (i번째 item ↔ i번째 논문). 붙인 item의 id는 논문 ID로 바꾸므로
+    이후 병합·누락 판단(_merge_results / _unmatched)은 정확히 일치로 동작합니다.
+    """
+
+    def __init__(self, batch: List[Paper]):
+        self.batch = batch
+        self._by_id = {p.id: p for p in batch}
+        self._by_canonical = {canonical_id(p.id): p for p in batch}
+        self._by_title = {_norm_title(p.title): p for p in batch}
+        self._claimed: set = set()
+        self._index = 0
+        self.rescued = 0   # ID가 맞지 않아 제목·위치로 붙인 수
+        self.dropped = 0   # 검증 실패·매칭 실패·중복으로 버린 수
+
+    def match(self, item: dict) -> Optional[dict]:
+        index = self._index
+        self._index += 1
+        result = _validate_item(item)
+        if result is None:
+            self.dropped += 1
+            return None
 
+        pid = result["id"]
+        paper = self._by_id.get(pid) or self._by_canonical.get(canonical_id(pid))
+        if paper is None:
+            paper = self._by_title.get(_norm_title(str(item.get("title") or pid)))
+            if paper is None and index < len(self.batch):
+                paper = self.batch[index]
+            if paper is not None and paper.id not in self._claimed:
+                self.rescued += 1
+        if paper is None or paper.id in self._claimed:
+            self.dropped += 1
+            return None
+        self._claimed.add(paper.id)
+        result["id"] = paper.id
+        return result
+
+    def match_all(self, items: List[dict]) -> List[dict]:
+        return [r for r in map(self.match, items) if r is not None]
+
+    def report(self, label: str) -> None:
+        if self.rescued or self.dropped:
+            print(f"[triage] {label}: ID 불일치 {self.rescued}편은 제목·위치로 매칭, {self.dropped}개 버림")
+
+
+# 같은 배치를 그대로 재시도할 일시 장애 (그 외 실패는 배치를 나눠 원인 논문을 찾음)
+_TRANSIENT_STATUS = {408, 409, 429, 500, 502, 503, 504}
+_MAX_BACKOFF = 30.0
+
+
+def _is_transient(exc: Exception) -> bool:
+    if isinstance(exc, APIConnectionError):   # 연결 실패 / 타임아웃
+        return True
+    status = getattr(exc, "status_code", None) or getattr(exc, "code", None)
+    return status in _TRANSIENT_STATUS
+
+
+def _backoff(step: int) -> float:
+    return 0.0 if step <= 0 else min(TRIAGE_BACKOFF_BASE * 2 ** (step - 1), _MAX_BACKOFF)
+
+
+def _unmatched(papers: List[Paper], items: List[dict]) -> List[Paper]:
+    """응답 items에서 결과를 찾지 못한 논문들."""
+    results = _merge_results([items])
+    return [
+        p for p in papers
+        if p.id not in results and canonical_id(p.id) not in results
+    ]
+
+
+def _triage_batch(
+    call: Callable[[List[Paper]], List[dict]],
+    batch: List[Paper],
+    provider: str,
+    label: str,
+    depth: int = 0,
+) -> List[dict]:
+    """배치 하나를 처리하고, 결과가 없는 논문만 골라 재시도합니다.
+
+    - 일시 장애(429/5xx/연결 오류): 같은 배치를 지수 backoff 후 최대 TRIAGE_MAX_RETRIES회 재시도
+    - 그 외 실패(JSON 파싱 오류, 일부 ID 누락): 누락된 논문만 절반씩 나눠 재귀 호출
+      → 배치 안의 문제 논문 하나를 log2(배치 크기) 단계 만에 격리
+    - 1편만 남으면 그 논문만 backoff 후 재시도하고, 한도를 넘기면 포기
+    """
+    items: List[dict] = []
+    pending = list(batch)
+    for attempt in range(TRIAGE_MAX_RETRIES + 1):
+        # 분할된 하위 배치는 깊이만큼, 같은 배치 재시도는 시도 횟수만큼 대기
+        delay = _backoff(attempt) if attempt else _backoff(depth)
+        if delay:
+            time.sleep(delay)
+        try:
+            got = call(pending)
         except Exception as exc:
-            print(f"[triage] Gemini batch {i//TRIAGE_BATCH + 1} 실패: {exc}")
-
-    # 결과 주입
+            print(f"[triage] {provider} {label} 실패 ({len(pending)}편, 시도 {attempt + 1}): {exc}")
+            if _is_transient(exc):
+                continue
+            got = []
+        items.extend(got)
+        pending = _unmatched(pending, got)
+        if len(pending) != 1:
+            break
+    else:
+        if pending:
+            print(f"[triage] {provider} {label}: {len(pending)}편 재시도 한도 초과 → 포기")
+        return items
+
+    if len(pending) > 1:
+        mid = len(pending) // 2
+        print(f"[triage] {provider} {label}: 결과 없는 {len(pending)}편을 {mid}+{len(pending) - mid}편으로 나눠 재시도")
+        items += _triage_batch(call, pending[:mid], provider, f"{label}a", depth + 1)
+        items += _triage_batch(call, pending[mid:], provider, f"{label}b", depth + 1)
+    return items
+
+
+def _run_batches(
+    batches: List[List[Paper]],
+    call: Callable[[List[Paper]], List[dict]],
+    provider: str,
+    concurrency: int = TRIAGE_CONCURRENCY,
+) -> List[List[dict]]:
+    """배치들을 최대 concurrency개까지 동시에 실행합니다.
+
+    요청 속도는 call 안에서 provider별 RPM/TPM limiter로 제한되고, 배치별 재시도는
+    _triage_batch()가 담당합니다. 반환 리스트는 완료 순서와 무관하게 배치 순서와 같습니다.
+    """
+    outputs: List[List[dict]] = [[] for _ in batches]
+    started = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(batches)))) as pool:
+        futures = {
+            pool.submit(_triage_batch, call, batch, provider, f"batch {n + 1}"): n
+            for n, batch in enumerate(batches)
+        }
+        for future in as_completed(futures):
+            n = futures[future]
+            try:
+                outputs[n] = future.result()
+            except Exception as exc:
+                print(f"[triage] {provider} batch {n + 1} 실패: {exc}")
+
+    print(
+        f"[triage] {provider} {len(batches)}개 배치 완료 "
+        f"(동시 {min(concurrency, len(batches))}개, 소요 {time.monotonic() - started:.1f}s)"
+    )
+    return outputs
+
+
+def _merge_results(outputs: List[List[dict]]) -> Dict[str, dict]:
+    """배치 결과를 배치 순서대로 합칩니다 (같은 ID는 뒤 배치가 덮어씀 → 항상 같은 결과)."""
+    results: Dict[str, dict] = {}
+    for items in outputs:
+        for item in items:
+            pid = str(item.get("id", "")).strip()
+            if pid:
+                results[pid] = item
+                # 버전 번호 없이도 매칭할 수 있도록 추가 저장
+                pid_without_version = canonical_id(pid)
+                if pid_without_version != pid:
+                    results[pid_without_version] = item
+    return results
+
+
+def _apply_results(papers: List[Paper], results: Dict[str, dict], warn: bool = True) -> None:
+    """트리아지 결과를 Paper 객체에 주입합니다 (warn=False면 결과 있는 논문만 갱신)."""
     for paper in papers:
         info = results.get(paper.id, {})
         
         # 버전 번호 없이도 시도 (예: 2401.12345v1 → 2401.12345)
         if not info:
-            paper_id_without_version = paper.id.split('v')[0] if 'v' in paper.id else paper.id
-            info = results.get(paper_id_without_version, {})
+            info = results.get(canonical_id(paper.id), {})
         
+        if not info and not warn:
+            continue
         # 매칭 실패 시 디버깅 정보 출력
         if not info:
-            print(f"[triage] 경고: 논문 {paper.id} ({paper.title[:50]})의 요약을 찾을 수 없음")
+            print(f"[triage] 경고: 논문 {paper.id} ({paper.title[:50]}...)의 요약을 찾을 수 없음")
         
         paper.summary = info.get("summary", "요약 없음")
         paper.tags = info.get("tags", [])
+        paper.triage_model = info.get("_model", "")
         try:
             paper.score = float(info.get("score", 0.0))
         except (TypeError, ValueError):
             paper.score = 0.0
 
+
+def _triage_with_provider(papers: List[Paper], provider) -> List[Paper]:
+    """provider로 논문 트리아지 (토큰 예산 배치, 동시 실행, 실패 시 재시도·분할).
+
+    스트리밍 응답에서 논문 객체가 닫히는 대로 해당 Paper에 바로 반영하고,
+    모든 배치가 끝나면 배치 순서대로 다시 합쳐 최종 결과를 정합니다.
+    """
+    by_id = {p.id: p for p in papers}
+    by_id.update({canonical_id(p.id): p for p in papers})
+    started = time.monotonic()
+    first_result: List[float] = []
+
+    def on_item(item: dict) -> None:
+        pid = str(item.get("id", "")).strip()
+        paper = by_id.get(pid) or by_id.get(canonical_id(pid))
+        if paper is None:
+            return
+        if not first_result:
+            first_result.append(time.monotonic() - started)
+        _apply_results([paper], {paper.id: item})
+
+    try:
+        outputs = _run_batches(
+            _plan_batches(papers, provider.estimator),
+            lambda batch: provider.complete(batch, on_item),
+            provider.name,
+        )
+    finally:
+        provider.close()
+    provider.save()
+    if first_result:
+        print(f"[triage] 첫 결과까지 {first_result[0]:.1f}s")
+    _apply_results(papers, _merge_results(outputs))
     return papers
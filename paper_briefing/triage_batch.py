@@ -0,0 +1,363 @@
+"""대량 재트리아지를 provider Batch API로 처리합니다 (JSONL 요청 파일 → 제출 → 완료 확인 → 결과 반영).
+
+수천 편을 동기 chat completions로 보내면 RPM/TPM 한도에 묶여 오래 걸리고 비쌉니다.
+Batch API는 요청 파일 하나를 받아 최대 24시간 안에 처리하며 요금이 절반입니다.
+
+  1. submit_backfill(): 저장된 논문 중 트리아지 캐시에 없는 것만 골라 요청 파일을 쓰고 제출
+     (요청 ID ↔ 논문 ID 목록은 TRIAGE_BATCH_JOBS_COLLECTION에 저장)
+  2. collect_backfill(): 작업 상태를 확인하고, 끝난 작업의 결과 파일을 줄 단위로 읽어
+     BATCH_WRITE_CHUNK편씩 논문 컬렉션과 트리아지 캐시에 반영
+
+결과 반영은 논문 ID 기준 $set이라 같은 작업을 다시 반영해도 결과가 같고,
+실패한 요청의 논문은 캐시에 남지 않으므로 다음 submit_backfill()에서 다시 제출됩니다.
+오프라인 테스트는 batch_server.LocalBatchServer (같은 파일/상태 확인 프로토콜)로 합니다.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from .arxiv_fetcher import Paper
+from .config import (
+    BATCH_DIR,
+    BATCH_MAX_REQUESTS,
+    BATCH_POLL_INTERVAL,
+    BATCH_WRITE_CHUNK,
+    MONGODB_COLLECTION,
+    OPENAI_MODEL,
+    TRIAGE_BATCH_JOBS_COLLECTION,
+)
+from .llm_usage import get_run_usage
+from .state import _get_db
+from .providers import Usage, _get_openai_client
+from .token_budget import get_estimator
+from .triage import (
+    _PROMPT_HASH,
+    _ResultMatcher,
+    _apply_results,
+    _chat_request,
+    _merge_results,
+    _parse_items,
+    _plan_batches,
+)
+from .triage_cache import load_cached_triage, store_triage
+
+_ENDPOINT = "/v1/chat/completions"
+_FINISHED = {"completed", "failed", "expired", "cancelled"}   # 더 이상 바뀌지 않는 상태
+
+
+# ── 파일 / 제출 / 상태 확인 (provider 프로토콜) ──────────────────────────────
+def write_batch_file(batches: List[List[Paper]], path: str, prefix: str = "req") -> Dict[str, List[str]]:
+    """배치마다 chat completions 요청 한 줄씩 JSONL 파일을 씁니다.
+
+    Returns:
+        {요청 ID(custom_id): [논문 ID, ...]}
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    requests: Dict[str, List[str]] = {}
+    with open(path, "w", encoding="utf-8") as f:
+        for n, batch in enumerate(batches):
+            custom_id = f"{prefix}-{n:05d}"
+            line = {
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": _ENDPOINT,
+                "body": _chat_request(batch),
+            }
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+            requests[custom_id] = [p.id for p in batch]
+    return requests
+
+
+def submit_batch_file(client, path: str, metadata: Optional[Dict[str, str]] = None):
+    """요청 파일을 올리고 배치 작업을 만듭니다 (반환: provider의 Batch 객체)."""
+    with open(path, "rb") as f:
+        uploaded = client.files.create(file=f, purpose="batch")
+    return client.batches.create(
+        input_file_id=uploaded.id,
+        endpoint=_ENDPOINT,
+        completion_window="24h",
+        metadata=metadata or {},
+    )
+
+
+def wait_for_batch(client, batch_id: str, interval: float = BATCH_POLL_INTERVAL,
+                   timeout: Optional[float] = None):
+    """작업이 끝날 때까지(또는 timeout초까지) interval초마다 상태를 확인합니다."""
+    started = time.monotonic()
+    last = None
+    while True:
+        batch = client.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        progress = f"{counts.completed + counts.failed}/{counts.total}" if counts else "-"
+        if batch.status != last:
+            print(f"[batch] {batch_id}: {batch.status} ({progress})")
+            last = batch.status
+        if batch.status in _FINISHED:
+            return batch
+        if timeout is not None and time.monotonic() - started + interval > timeout:
+            return batch
+        time.sleep(interval)
+
+
+def _iter_file_lines(client, file_id: str) -> Iterator[dict]:
+    """결과 파일을 내려받으며 한 줄씩 JSON으로 돌려줍니다 (파일 전체를 메모리에 올리지 않음)."""
+    with client.with_streaming_response.files.content(file_id) as resp:
+        for line in resp.iter_lines():
+            if line.strip():
+                yield json.loads(line)
+
+
+def _body_usage(body: dict) -> Optional[Usage]:
+    """결과 파일 응답 본문의 usage (없으면 None)."""
+    usage = body.get("usage")
+    if not usage:
+        return None
+    details = usage.get("prompt_tokens_details") or {}
+    return Usage(usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0),
+                 usage.get("total_tokens", 0), details.get("cached_tokens", 0) or 0)
+
+
+def iter_batch_results(client, batch, stats: Dict[str, int]) -> Iterator[Tuple[str, List[dict]]]:
+    """끝난 작업의 (요청 ID, 논문별 결과 리스트)를 결과 파일 순서대로 돌려줍니다.
+
+    실패한 요청(HTTP 오류, 응답 JSON 파싱 실패, 오류 파일의 줄)은 stats["failed"]에 셉니다.
+    응답마다 토큰 사용량을 실행 기록(llm_usage)에 남깁니다 (응답 시간은 없음).
+    """
+    run_usage = get_run_usage()
+    if batch.output_file_id:
+        for record in _iter_file_lines(client, batch.output_file_id):
+            response = record.get("response") or {}
+            body = response.get("body") or {}
+            usage = _body_usage(body)
+            model = body.get("model") or OPENAI_MODEL
+            if record.get("error") or response.get("status_code") != 200:
+                stats["failed"] += 1
+                run_usage.record("openai", model, 0, usage, status="error", kind="batch",
+                                 error=str(record.get("error") or response.get("status_code")))
+                continue
+            try:
+                raw = body["choices"][0]["message"]["content"] or "{}"
+                items = _parse_items(raw)
+            except (KeyError, IndexError, TypeError, ValueError) as e:
+                print(f"[batch] {record.get('custom_id')} 응답 파싱 실패: {e}")
+                stats["failed"] += 1
+                run_usage.record("openai", model, 0, usage, status="error", kind="batch", error=str(e))
+                continue
+            run_usage.record("openai", model, len(items), usage, kind="batch")
+            yield record["custom_id"], items
+
+    if batch.error_file_id:
+        for record in _iter_file_lines(client, batch.error_file_id):
+            stats["failed"] += 1
+            run_usage.record("openai", OPENAI_MODEL, 0, status="error", kind="batch",
+                             error=str(record.get("error") or record.get("response")))
+            if stats["failed"] <= 3:
+                print(f"[batch] {record.get('custom_id')} 실패: {record.get('error') or record.get('response')}")
+
+
+# ── MongoDB 연동 (제출 / 반영) ────────────────────────────────────────────────
+def _jobs():
+    return _get_db()[TRIAGE_BATCH_JOBS_COLLECTION]
+
+
+_PAPER_FIELDS = ("id", "title", "abstract", "authors", "published", "arxiv_url", "pdf_url", "categories")
+
+
+def _paper_from_doc(doc: dict) -> Paper:
+    return Paper(
+        id=doc["id"],
+        title=doc.get("title", ""),
+        abstract=doc.get("abstract", ""),
+        authors=doc.get("authors", []),
+        published=doc.get("published", ""),
+        arxiv_url=doc.get("arxiv_url", ""),
+        pdf_url=doc.get("pdf_url", ""),
+        categories=doc.get("categories", []),
+    )
+
+
+def _save_results(collection, papers: List[Paper], model: str, now: datetime, cache: bool = True) -> int:
+    """트리아지 결과가 있는 논문만 컬렉션(과 트리아지 캐시)에 반영합니다 (논문 ID 기준 $set)."""
+    done = [p for p in papers if p.summary]
+    if not done:
+        return 0
+    collection.bulk_write([
+        UpdateOne(
+            {"id": p.id},
+            {"$set": {"summary": p.summary, "tags": p.tags, "score": p.score,
+                      "triage_model": model, "triaged_at": now}},
+        )
+        for p in done
+    ], ordered=False)
+    if cache:
+        store_triage(done, model, _PROMPT_HASH)
+    return len(done)
+
+
+def _in_flight_ids() -> set:
+    """아직 반영되지 않은 작업에 들어 있는 논문 ID (중복 제출 방지)."""
+    ids = set()
+    for job in _jobs().find({"applied_at": None}, {"requests": 1}):
+        for paper_ids in job.get("requests", {}).values():
+            ids.update(paper_ids)
+    return ids
+
+
+def submit_backfill(source: str = MONGODB_COLLECTION, limit: Optional[int] = None) -> List[str]:
+    """저장된 논문을 Batch API로 재트리아지하도록 제출합니다.
+
+    현재 모델·프롬프트의 트리아지 캐시에 있는 논문은 바로 반영하고, 나머지만 요청 파일로
+    보냅니다. 반영 전인 다른 작업에 들어 있는 논문은 건너뜁니다.
+
+    Args:
+        source: 논문을 읽을 컬렉션 (papers 또는 SNAPSHOT_COLLECTION)
+        limit: 최대 논문 수 (None이면 전체)
+
+    Returns:
+        제출한 배치 작업 ID 리스트
+    """
+    client = _get_openai_client()
+    if client is None:
+        print("[batch] OPENAI_API_KEY 미설정 → 제출 건너뜀.")
+        return []
+
+    collection = _get_db()[source]
+    in_flight = _in_flight_ids()
+    now = datetime.now()
+    cursor = collection.find({}, {f: 1 for f in _PAPER_FIELDS}).limit(limit or 0)
+
+    misses: List[Paper] = []
+    hits = skipped = 0
+    chunk: List[Paper] = []
+
+    def flush() -> None:
+        nonlocal hits
+        cached, missed = load_cached_triage(chunk, OPENAI_MODEL, _PROMPT_HASH)
+        _apply_results(chunk, cached, warn=False)
+        hits += _save_results(collection, chunk, OPENAI_MODEL, now, cache=False)
+        misses.extend(missed)
+        chunk.clear()
+
+    for doc in cursor:
+        if doc["id"] in in_flight:
+            skipped += 1
+            continue
+        chunk.append(_paper_from_doc(doc))
+        if len(chunk) >= BATCH_WRITE_CHUNK:
+            flush()
+    if chunk:
+        flush()
+    print(f"[batch] '{source}': 캐시 반영 {hits}편 / 진행 중 작업에 포함 {skipped}편 / 제출 대상 {len(misses)}편")
+    if not misses:
+        return []
+
+    batches = _plan_batches(misses, get_estimator(OPENAI_MODEL))
+    stamp = now.strftime("%Y%m%d-%H%M%S-%f")
+    job_ids = []
+    for j in range(0, len(batches), BATCH_MAX_REQUESTS):
+        part = batches[j:j + BATCH_MAX_REQUESTS]
+        path = os.path.join(BATCH_DIR, f"triage-{stamp}-{j // BATCH_MAX_REQUESTS}.jsonl")
+        requests = write_batch_file(part, path)
+        batch = submit_batch_file(client, path, {"source": source, "prompt_hash": _PROMPT_HASH})
+        _jobs().insert_one({
+            "_id": batch.id,
+            "status": batch.status,
+            "source": source,
+            "model": OPENAI_MODEL,
+            "prompt_hash": _PROMPT_HASH,
+            "input_file": path,
+            "input_file_id": batch.input_file_id,
+            "requests": requests,
+            "papers": sum(len(ids) for ids in requests.values()),
+            "created_at": now,
+            "applied_at": None,
+        })
+        job_ids.append(batch.id)
+        print(f"[batch] 제출: {batch.id} (요청 {len(requests)}개, 논문 {sum(len(b) for b in part)}편, {path})")
+    return job_ids
+
+
+def _apply_job(client, job: dict, batch) -> Dict[str, int]:
+    """끝난 작업의 결과 파일을 읽어 BATCH_WRITE_CHUNK편씩 반영합니다."""
+    collection = _get_db()[job["source"]]
+    requests: Dict[str, List[str]] = job["requests"]
+    stats = {"requests": len(requests), "failed": 0, "applied": 0, "missing": 0}
+    now = datetime.now()
+    pending_ids: List[str] = []
+    pending: List[tuple] = []   # (요청의 논문 ID 목록, 응답 items)
+
+    def flush() -> None:
+        docs = collection.find({"id": {"$in": pending_ids}}, {f: 1 for f in _PAPER_FIELDS})
+        by_id = {doc["id"]: _paper_from_doc(doc) for doc in docs}
+        outputs = []
+        for ids, items in pending:
+            # 요청 단위로 검증·매칭 (ID가 어긋난 결과는 제목·위치로 붙임)
+            matcher = _ResultMatcher([by_id[pid] for pid in ids if pid in by_id])
+            outputs.append(matcher.match_all(items))
+        papers = list(by_id.values())
+        _apply_results(papers, _merge_results(outputs), warn=False)
+        stats["applied"] += _save_results(collection, papers, job["model"], now)
+        pending_ids.clear()
+        pending.clear()
+
+    for custom_id, items in iter_batch_results(client, batch, stats):
+        ids = requests.get(custom_id, [])
+        pending_ids.extend(ids)
+        pending.append((ids, items))
+        if len(pending_ids) >= BATCH_WRITE_CHUNK:
+            flush()
+    if pending_ids:
+        flush()
+    stats["missing"] = sum(len(ids) for ids in requests.values()) - stats["applied"]
+    return stats
+
+
+def collect_backfill(wait: bool = False, interval: float = BATCH_POLL_INTERVAL) -> Dict[str, int]:
+    """반영 전인 작업들의 상태를 확인하고, 끝난 작업의 결과를 반영합니다.
+
+    Args:
+        wait: True면 작업이 끝날 때까지 interval초마다 확인 (False면 한 번만 확인)
+
+    Returns:
+        {"jobs": 확인한 작업 수, "pending": 아직 진행 중, "applied": 반영한 논문 수, "failed": 실패 요청 수}
+    """
+    client = _get_openai_client()
+    if client is None:
+        print("[batch] OPENAI_API_KEY 미설정 → 확인 건너뜀.")
+        return {}
+
+    totals = {"jobs": 0, "pending": 0, "applied": 0, "failed": 0}
+    for job in list(_jobs().find({"applied_at": None})):
+        totals["jobs"] += 1
+        if wait:
+            batch = wait_for_batch(client, job["_id"], interval)
+        else:
+            batch = client.batches.retrieve(job["_id"])
+        if batch.status not in _FINISHED:
+            _jobs().update_one({"_id": job["_id"]}, {"$set": {"status": batch.status}})
+            print(f"[batch] {job['_id']}: {batch.status} → 나중에 다시 확인")
+            totals["pending"] += 1
+            continue
+
+        stats = _apply_job(client, job, batch)
+        _jobs().update_one(
+            {"_id": job["_id"]},
+            {"$set": {"status": batch.status, "stats": stats, "applied_at": datetime.now()}},
+        )
+        totals["applied"] += stats["applied"]
+        totals["failed"] += stats["failed"]
+        print(
+            f"[batch] {job['_id']} ({batch.status}): 반영 {stats['applied']}편 / "
+            f"결과 없음 {stats['missing']}편 "
+            f"/ 실패 요청 {stats['failed']}개"
+        )
+    if not totals["jobs"]:
+        print("[batch] 반영할 작업이 없습니다.")
+    return totals
@@ -0,0 +1,101 @@
+"""트리아지 결과 캐시 (MongoDB) - 논문 내용·모델·프롬프트 기준."""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from pymongo import UpdateOne
+
+from .config import TRIAGE_CACHE_COLLECTION
+from .ids import canonical_id
+from .state import _get_db
+
+# 실행 단위 통계 (run_briefing.py 요약 출력용)
+_stats = {"hits": 0, "misses": 0, "stores": 0}
+
+
+def cache_stats() -> dict:
+    return dict(_stats)
+
+
+def record_lookup(hits: int, misses: int) -> None:
+    """캐시 조회 결과를 통계에 더합니다 (여러 모델을 차례로 확인할 때는 마지막에 한 번)."""
+    _stats["hits"] += hits
+    _stats["misses"] += misses
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def triage_key(paper, model: str, prompt_hash: str) -> str:
+    """(정규 ID, 초록 해시, 모델명, 프롬프트 해시) 캐시 키."""
+    return f"{canonical_id(paper.id)}:{text_hash(paper.abstract)}:{model}:{prompt_hash}"
+
+
+def _get_cache():
+    return _get_db()[TRIAGE_CACHE_COLLECTION]
+
+
+def load_cached_triage(
+    papers: List, model: str, prompt_hash: str, count: bool = True,
+) -> Tuple[Dict[str, dict], List]:
+    """캐시에 있는 결과를 찾습니다.
+
+    count=False면 통계를 건드리지 않습니다 (호출 측이 record_lookup으로 한 번 기록).
+
+    Returns:
+        ({paper.id: {"summary", "tags", "score", "_model"}}, 캐시에 없는 논문 리스트)
+    """
+    keys = {paper.id: triage_key(paper, model, prompt_hash) for paper in papers}
+    docs = _get_cache().find(
+        {"_id": {"$in": list(set(keys.values()))}},
+        {"summary": 1, "tags": 1, "score": 1},
+    )
+    by_key = {doc["_id"]: doc for doc in docs}
+
+    hits: Dict[str, dict] = {}
+    misses = []
+    for paper in papers:
+        doc = by_key.get(keys[paper.id])
+        if doc is None:
+            misses.append(paper)
+        else:
+            hits[paper.id] = {"summary": doc["summary"], "tags": doc["tags"], "score": doc["score"], "_model": model}
+
+    if count:
+        record_lookup(len(hits), len(misses))
+    return hits, misses
+
+
+def store_triage(papers: List, model: str, prompt_hash: str) -> int:
+    """트리아지 결과를 캐시에 저장합니다 (요약이 생성된 논문만).
+
+    Returns:
+        저장한 논문 수
+    """
+    now = datetime.now()
+    ops = [
+        UpdateOne(
+            {"_id": triage_key(paper, model, prompt_hash)},
+            {"$set": {
+                "paper_id": canonical_id(paper.id),
+                "abstract_hash": text_hash(paper.abstract),
+                "model": model,
+                "prompt_hash": prompt_hash,
+                "summary": paper.summary,
+                "tags": paper.tags,
+                "score": paper.score,
+                "created_at": now,
+            }},
+            upsert=True,
+        )
+        for paper in papers
+        if paper.summary and paper.summary != "요약 없음"
+    ]
+    if ops:
+        _get_cache().bulk_write(ops, ordered=False)
+        _stats["stores"] += len(ops)
+    return len(ops)
@@ -5,6 +5,13 @@
   python run_briefing.py            # 전체 파이프라인 (fetch → triage → slack → zotero → log)
   python run_briefing.py --dry-run  # Slack/Zotero 전송 없이 결과만 출력
   python run_briefing.py --reset    # seen_papers.json 초기화 후 실행
+  python run_briefing.py --refresh-citations  # 저장된 논문 인용수만 갱신 (만료 오래된 순)
+  python run_briefing.py --dry-run --offline  # arXiv/Semantic Scholar 응답을 캐시에서만 읽음
+  python run_briefing.py --ingest arxiv-metadata-oai-snapshot.json  # 스냅샷 파일 일괄 적재
+  python run_briefing.py --batch-triage 5000  # 저장된 논문 재트리아지를 Batch API로 제출
+  python run_briefing.py --batch-collect --batch-wait  # 제출한 작업 완료를 기다려 결과 반영
+  python run_briefing.py --train-relevance  # 저장된 LLM 점수로 로컬 관련도 모델 학습
+  python run_briefing.py --init-db  # 인덱스 생성 + 예전 문서 saved_date 이전 (배포 시 한 번)
 """
 
 from __future__ import annotations
@@ -18,11 +25,41 @@ from dotenv import load_dotenv
 load_dotenv()  # .env 파일 로드
 
 
+def _report_llm_usage(mode: str, extra: dict | None = None) -> None:
+    """이번 실행의 LLM 호출 요약 표를 출력하고 runs 컬렉션 / logs/runs/에 저장합니다."""
+    from paper_briefing.llm_usage import get_run_usage
+    run_usage = get_run_usage()
+    if not run_usage.calls:
+        return
+    run_usage.print_table()
+    run_usage.save(mode, extra)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Daily arXiv Paper Briefing")
     parser.add_argument("--dry-run", action="store_true", help="Slack/Zotero 전송 없이 출력만")
     parser.add_argument("--reset",   action="store_true", help="seen 상태 초기화 후 실행")
     parser.add_argument("--no-zotero", action="store_true", help="Zotero 저장 건너뜀")
+    parser.add_argument("--refresh-citations", type=int, nargs="?", const=-1, default=None,
+                        metavar="N", help="저장된 논문 인용수만 최대 N편 갱신 후 종료")
+    parser.add_argument("--offline", action="store_true",
+                        help="arXiv/Semantic Scholar 요청 없이 HTTP 응답 캐시만 사용")
+    parser.add_argument("--cache-ttl", type=float, default=None, metavar="SEC",
+                        help="HTTP 응답 캐시 유효 시간 (초, 0이면 캐시 미사용)")
+    parser.add_argument("--ingest", nargs="+", metavar="FILE",
+                        help="arXiv 메타데이터 스냅샷(JSON lines / OAI-PMH XML)을 적재 후 종료")
+    parser.add_argument("--batch-triage", type=int, nargs="?", const=-1, default=None, metavar="N",
+                        help="저장된 논문 최대 N편의 재트리아지를 Batch API로 제출 후 종료")
+    parser.add_argument("--batch-source", default=None, metavar="COLLECTION",
+                        help="--batch-triage로 읽을 컬렉션 (기본: MONGODB_COLLECTION)")
+    parser.add_argument("--batch-collect", action="store_true",
+                        help="제출한 Batch 작업 상태를 확인하고 끝난 결과를 반영 후 종료")
+    parser.add_argument("--batch-wait", action="store_true",
+                        help="--batch-collect에서 작업이 끝날 때까지 기다림")
+    parser.add_argument("--train-relevance", action="store_true",
+                        help="저장된 LLM 점수로 로컬 관련도 모델을 학습 후 종료")
+    parser.add_argument("--init-db", action="store_true",
+                        help="조회에 필요한 인덱스를 만들고 예전 문서에 saved_date를 채운 후 종료 (배포 시 한 번)")
     args = parser.parse_args()
 
     # 지연 import (load_dotenv 이후에 실행)
@@ -33,6 +70,52 @@ def main() -> None:
     from paper_briefing.state import load_seen, save_papers, reset_database
     from paper_briefing.triage import triage_papers
     from paper_briefing.zotero_saver import save_to_zotero
+    from paper_briefing import http_cache
+
+    http_cache.configure(offline=args.offline or None, ttl=args.cache_ttl)
+    if http_cache.is_offline():
+        print("[main] 오프라인 모드: arXiv/Semantic Scholar 응답은 캐시에서만 읽습니다.")
+
+    if args.init_db:
+        from paper_briefing.config import STORAGE_BACKEND
+        from paper_briefing.storage import get_store
+        store = get_store()
+        if STORAGE_BACKEND == "sqlite":
+            print(f"[storage] SQLite 스키마·인덱스 준비 완료: {store.path}")
+        else:
+            from paper_briefing.db import ensure_indexes
+            ensure_indexes()
+        # 예전 문서 이전: saved_at 문자열 → saved_date (이미 있으면 건너뜀)
+        print(f"[storage] saved_date 채움: {store.backfill_saved_date()}편")
+        return
+
+    if args.ingest:
+        from paper_briefing.snapshot_ingest import ingest_snapshot
+        ingest_snapshot(args.ingest)
+        return
+
+    if args.train_relevance:
+        from paper_briefing.relevance import train_relevance_model
+        train_relevance_model()
+        return
+
+    if args.batch_triage is not None or args.batch_collect:
+        from paper_briefing.config import MONGODB_COLLECTION
+        from paper_briefing.triage_batch import collect_backfill, submit_backfill
+        if args.batch_triage is not None:
+            limit = args.batch_triage if args.batch_triage > 0 else None
+            submit_backfill(args.batch_source or MONGODB_COLLECTION, limit)
+        if args.batch_collect:
+            collect_backfill(wait=args.batch_wait)
+        _report_llm_usage("batch")
+        return
+
+    if args.refresh_citations is not None:
+        from paper_briefing.citation_cache import refresh_stored_citations
+        from paper_briefing.config import CITATION_REFRESH_LIMIT
+        limit = args.refresh_citations if args.refresh_citations > 0 else CITATION_REFRESH_LIMIT
+        refresh_stored_citations(limit)
+        return
 
     # ── 0. seen 상태 로드 ──────────────────────────────────────────────────────
     if args.reset:
@@ -48,38 +131,18 @@ def main() -> None:
     print("[main] arXiv 수집 / 중복 필터링 / 논문 선택 중...")
     to_process = fetch_and_select_papers(seen)
     print(f"[main] 최종 처리 대상: {len(to_process)}편")
+    stats = http_cache.cache_stats()
+    print(f"[main] HTTP 캐시: 적중 {stats['hits']}회 / 네트워크 {stats['misses']}회")
 
     if not to_process:
         print("[main] 조건을 만족하는 논문이 없습니다. 종료.")
         return
 
     # ── 3. AI 트리아지 ─────────────────────────────────────────────────────────
+    # 실패한 배치는 triage.py 안에서 결과 없는 논문만 나눠 재시도합니다
     print("[main] AI 트리아지 중...")
     triaged = triage_papers(to_process)
 
-    # 요약이 없는 논문들을 최대 2번 재시도
-    for retry_count in range(1, 3):
-        # 요약이 없는 논문들 찾기 (summary가 비어있거나 "요약 없음"인 경우)
-        missing_summary = [
-            p for p in triaged 
-            if not p.summary or p.summary.strip() == "" or p.summary == "요약 없음"
-        ]
-        
-        if not missing_summary:
-            print(f"[main] 모든 논문에 요약이 생성되었습니다.")
-            break
-            
-        print(f"[main] 재시도 {retry_count}/2: 요약이 없는 논문 {len(missing_summary)}편 재처리 중...")
-        
-        # 요약이 없는 논문들만 다시 트리아지
-        retried = triage_papers(missing_summary)
-        
-        # 결과를 원본 리스트에 반영 (in-place 업데이트)
-        retried_dict = {p.id: p for p in retried}
-        for i, paper in enumerate(triaged):
-            if paper.id in retried_dict:
-                triaged[i] = retried_dict[paper.id]
-    
     # 최종 확인
     still_missing = [
         p for p in triaged 
@@ -87,6 +150,10 @@ def main() -> None:
     ]
     if still_missing:
         print(f"[main] 경고: {len(still_missing)}편의 논문이 여전히 요약이 없습니다.")
+    from paper_briefing.triage_cache import cache_stats as triage_cache_stats
+    tstats = triage_cache_stats()
+    print(f"[main] 트리아지 캐시: 적중 {tstats['hits']}편 / LLM 요청 {tstats['misses']}편")
+    run_extra = {"papers": len(triaged), "missing_summary": len(still_missing), "triage_cache": tstats}
 
     # 결과 미리보기 (상위 5편)
     print("\n[미리보기] 상위 5편:")
@@ -101,6 +168,7 @@ def main() -> None:
     if args.dry_run:
         print("[main] --dry-run 모드: Slack/Zotero 전송 건너뜀.")
         save_papers(triaged)
+        _report_llm_usage("dry-run", run_extra)
         return
 
     # # ── 5. Slack 전송 ──────────────────────────────────────────────────────────
@@ -112,6 +180,15 @@ def main() -> None:
 
     # ── 7. MongoDB에 논문 저장 ────────────────────────────────────────────────
     save_papers(triaged)
+
+    # ── 8. 저장된 논문 인용수 갱신 (만료가 오래된 순) ──────────────────────────
+    try:
+        from paper_briefing.citation_cache import refresh_stored_citations
+        refresh_stored_citations()
+    except Exception as e:
+        print(f"[main] 인용수 갱신 실패 (다음 실행 시 재시도): {e}")
+
+    _report_llm_usage("daily", run_extra)
     print(f"[main] 완료. 누적 처리 논문: {len(seen)}편")
 
 
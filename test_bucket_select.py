@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""연도 그룹 선택 테스트 - 기본 창 전체에서 학회 우선순위로 선택 / 조기 중단 조건 /
+페이지 단위 seen 확인·관련도 예측
+(로컬 arXiv Atom 대역 서버 사용, 네트워크·MongoDB 불필요)"""
+
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from paper_briefing import http_cache, rate_limit
+from paper_briefing.arxiv_fetcher import RateLimitedClient, _fetch_bucket
+from paper_briefing.rate_limit import TokenBucket
+from paper_briefing.relevance import RelevanceModel
+from paper_briefing.state import SeenIndex
+from paper_briefing.storage import SqliteStore
+
+http_cache.configure(ttl=0)   # 매 실행 대역 서버에서 받도록 응답 캐시 미사용
+rate_limit._arxiv_limiter = TokenBucket(rate=1000.0, capacity=1000)
+
+ENTRY = """<entry>
+  <id>http://arxiv.org/abs/{id}</id>
+  <updated>2024-05-{day:02d}T00:00:00Z</updated>
+  <published>2024-05-{day:02d}T00:00:00Z</published>
+  <title>{title}</title>
+  <summary>{title} abstract</summary>
+  <author><name>Author</name></author>
+  <arxiv:journal_ref>{journal_ref}</arxiv:journal_ref>
+  <link href="http://arxiv.org/abs/{id}" rel="alternate" type="text/html"/>
+  <link title="pdf" href="http://arxiv.org/pdf/{id}" rel="related" type="application/pdf"/>
+  <arxiv:primary_category term="cs.RO"/>
+  <category term="cs.RO"/>
+</entry>"""
+
+FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/"
+      xmlns:arxiv="http://arxiv.org/schemas/atom">
+  <title>arXiv Query</title>
+  <id>http://arxiv.org/api/test</id>
+  <updated>2024-05-31T00:00:00Z</updated>
+  <opensearch:totalResults>{total}</opensearch:totalResults>
+  <opensearch:startIndex>{start}</opensearch:startIndex>
+  <opensearch:itemsPerPage>{size}</opensearch:itemsPerPage>
+{entries}
+</feed>"""
+
+results = []     # 검색 결과 (제출일 최신순): (ID, journal_ref, 제목)
+requests = []    # 받은 페이지 요청의 start
+
+
+class StandIn(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        args = parse_qs(urlparse(self.path).query)
+        start, size = int(args["start"][0]), int(args["max_results"][0])
+        requests.append(start)
+        page = results[start:start + size]
+        entries = "\n".join(
+            ENTRY.format(id=pid, day=28 - n % 28, title=title, journal_ref=ref)
+            for n, (pid, ref, title) in enumerate(page, start)
+        )
+        data = FEED.format(total=len(results), start=start, size=len(page), entries=entries).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/atom+xml")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+RateLimitedClient.query_url_format = f"http://127.0.0.1:{server.server_port}/api/query?{{}}"
+
+
+def feed(refs, titles=None):
+    titles = titles or [f"Robot Policy {n}" for n in range(len(refs))]
+    results[:] = [(f"2405.{n:05d}v1", ref, title) for n, (ref, title) in enumerate(zip(refs, titles))]
+    requests.clear()
+
+
+class CountingModel(RelevanceModel):
+    """predict 호출마다 묶음 크기를 기록하는 관련도 모델."""
+
+    calls = []
+
+    def predict(self, texts):
+        self.calls.append(len(texts))
+        return super().predict(texts)
+
+
+def ids(*ns):
+    return [f"2405.{n:05d}v1" for n in ns]
+
+
+print("=== 연도 그룹 선택 테스트 ===\n")
+
+# 1) 낮은 순위 학회 논문이 먼저 quota를 채워도, 창 뒤쪽의 1순위 학회 논문을 놓치지 않음
+feed(["RSS 2024", "IROS 2024", "", "", "", "", "", "NeurIPS 2024", "", ""])
+ranked = _fetch_bucket("2024", 2024, 2024, max_results=10, quota=2)
+
+# 2) 1순위 학회 논문이 먼저 quota편 모이면 창을 다 보지 않고 중단 (다음 페이지 요청 없음)
+feed(["NeurIPS 2024", "NeurIPS 2023"] + [""] * 38)
+early = _fetch_bucket("2024", 2024, 2024, max_results=20, quota=2)
+early_pages = list(requests)
+
+# 3) 실제 SeenIndex(SQLite 저장소): 받은 페이지마다 한 번에 seen 확인, 첫 페이지가 모두 seen이면 다음 페이지로
+feed([""] * 12)
+store = SqliteStore(os.path.join(tempfile.mkdtemp(), "papers.db"))
+store.upsert_papers([{"id": pid, "saved_at": "2024-05-01T00:00:00"} for pid in ids(0, 1, 2, 3)])
+seen = SeenIndex(store)
+paged = _fetch_bucket("2024", 2024, 2024, max_results=4, quota=2, seen=seen)
+paged_pages = list(requests)
+store.close()
+
+# 4) 관련도 모델: 받은 페이지마다 predict 한 번, 예측 미달 후보는 제외하고 예측 점수 순으로 선택
+on_topic, off_topic = "Diffusion policy for dexterous manipulation", "Protein folding with graph networks"
+trained = RelevanceModel.fit([on_topic] * 20 + [off_topic] * 20, [4.5] * 20 + [0.0] * 20)
+model = CountingModel(trained.weights, trained.bias)
+feed([""] * 6, [off_topic, on_topic, off_topic, off_topic + " and policy", on_topic, off_topic])
+gated = _fetch_bucket("2024", 2024, 2024, max_results=3, quota=2, relevance=model)
+
+# 5) quota가 없으면 max_results편 그대로
+feed([""] * 15)
+plain = _fetch_bucket("2024", 2024, 2024, max_results=10)
+print(f"훑은 수: 순위 {ranked.scanned} / 조기 중단 {early.scanned} / quota 없음 {plain.scanned}\n")
+
+checks = [
+    ("기본 창 전체에서 학회 우선순위로 선택", [p.id for p in ranked.selected] == ids(7, 1)),
+    ("낮은 순위 학회로는 조기 중단 안 함",    ranked.scanned == 10),
+    ("1순위 학회 quota편이면 조기 중단",     early.scanned == 2 and [p.id for p in early.selected] == ids(0, 1)),
+    ("조기 중단 시 추가 페이지 요청 없음",     early_pages == [0]),
+    ("seen 논문 건너뛰고 다음 페이지에서 선택", [p.id for p in paged.selected] == ids(4, 5) and paged.skipped == 4),
+    ("페이지마다 seen 조회 1회",              paged_pages == [0, 4] and seen.queries == 2),
+    ("관련도: 페이지마다 predict 한 번",        CountingModel.calls == [3, 3]),
+    ("관련도 미달 후보 제외",                 gated.gated == 3 and [p.id for p in gated.papers] == ids(1, 4)),
+    ("관련도 점수 순 선택",                   [p.id for p in gated.selected] == ids(1, 4)),
+    ("quota 없으면 max_results편 수집",      plain.scanned == 10 and len(plain.papers) == 10),
+]
+all_pass = True
+for condition, passed in checks:
+    print(f"  {'✅' if passed else '❌'} {condition}")
+    all_pass = all_pass and passed
+
+server.shutdown()
+print(f"\n{'✅ 모든 조건 통과' if all_pass else '❌ 일부 조건 미충족'}")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""저장 논문 인용수 갱신 테스트 - 만료된 논문이 만료 시각 없는 새 논문보다 먼저 갱신되는지
+(mongomock + 가짜 인용수 조회기 사용, 네트워크·MongoDB 서버 불필요)"""
+
+from datetime import datetime, timedelta
+
+import mongomock
+
+from paper_briefing import citation_cache
+from paper_briefing.config import CITATION_CACHE_COLLECTION, MONGODB_COLLECTION
+from paper_briefing.db import ensure_indexes
+
+
+class FakeResolver:
+    """resolve 호출마다 요청 ID를 기록하고 인용수 7을 돌려주는 조회기."""
+
+    def __init__(self):
+        self.calls = []
+
+    def resolve(self, ids):
+        ids = list(ids)
+        self.calls.append(ids)
+        return {cid: 7 for cid in ids}
+
+
+db = mongomock.MongoClient()["paper_briefing_citation_test"]
+ensure_indexes(db)
+resolver = FakeResolver()
+citation_cache._get_db = lambda: db
+citation_cache._get_collection = lambda: db[MONGODB_COLLECTION]
+citation_cache.get_citation_resolver = lambda: resolver
+
+now = datetime.now()
+papers = db[MONGODB_COLLECTION]
+# 만료된 논문 3편 (만료가 오래된 순: 2401.00003 → 00001 → 00002), 아직 유효한 논문 1편
+papers.insert_many([
+    {"id": "2401.00001v1", "published": "2024-01-01", "citation_expires_at": now - timedelta(days=2)},
+    {"id": "2401.00002v1", "published": "2024-01-01", "citation_expires_at": now - timedelta(days=1)},
+    {"id": "2401.00003v1", "published": "2024-01-01", "citation_expires_at": now - timedelta(days=3)},
+    {"id": "2401.00009v1", "published": "2024-01-01", "citation_expires_at": now + timedelta(days=3)},
+])
+# 방금 저장된 논문 5편 (citation_expires_at 없음). 그중 하나는 인용수 캐시에 유효한 값이 있음
+papers.insert_many([{"id": f"2405.{n:05d}v1", "published": "2024-05-01"} for n in range(5)])
+db[CITATION_CACHE_COLLECTION].insert_one(
+    {"_id": "2405.00000", "count": 4, "fetched_at": now, "expires_at": now + timedelta(days=1)}
+)
+
+print("=== 저장 논문 인용수 갱신 테스트 ===\n")
+
+first = citation_cache.refresh_stored_citations(limit=4)
+first_calls = [sorted(c) for c in resolver.calls]
+resolver.calls.clear()
+second = citation_cache.refresh_stored_citations(limit=10)
+second_calls = [sorted(c) for c in resolver.calls]
+third = citation_cache.refresh_stored_citations(limit=10)
+
+docs = {d["id"]: d for d in papers.find()}
+print(f"\n1차 {first}편 {first_calls} / 2차 {second}편 {second_calls} / 3차 {third}편\n")
+
+expired = ["2401.00001", "2401.00002", "2401.00003"]
+new = [f"2405.{n:05d}" for n in range(5)]
+checks = [
+    ("만료된 논문이 limit 안에 모두 포함",     first == 4 and first_calls == [expired]),
+    ("새 논문은 남는 자리만 차지",            "citation_updated_at" in docs["2405.00000v1"]
+                                              and all("2405" not in cid for cid in first_calls[0])),
+    ("유효한 논문은 갱신하지 않음",            "citation_updated_at" not in docs["2401.00009v1"]),
+    ("남은 새 논문은 다음 갱신에서 처리",       second == 4 and second_calls == [new[1:]] and third == 0),
+    ("캐시에 유효한 값은 API 조회 없이 사용",   docs["2405.00000v1"]["citation_count"] == 4
+                                              and "2405.00000" not in sum(first_calls + second_calls, [])),
+    ("갱신한 논문에 만료 시각 기록",           all(d.get("citation_expires_at") for d in docs.values())),
+]
+all_pass = True
+for condition, passed in checks:
+    print(f"  {'✅' if passed else '❌'} {condition}")
+    all_pass = all_pass and passed
+
+print(f"\n{'✅ 모든 조건 통과' if all_pass else '❌ 일부 조건 미충족'}")
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Semantic Scholar 배치 인용수 조회 테스트 (로컬 대역 서버 사용, 네트워크 불필요)"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from paper_briefing import http_cache
+from paper_briefing.citations import CitationResolver
+
+http_cache.configure(ttl=0)   # 429/재시도 경로를 매번 검증하도록 응답 캐시 미사용
+
+# 대역 서버가 알고 있는 논문: 배치 엔드포인트에서는 FLAKY가 null로 빠지고,
+# 단건 엔드포인트에서만 조회됨 (fallback 경로 검증용)
+KNOWN = {"2401.00001": 12, "2401.00002": 0, "2401.00003": 7, "cs/0112017": 3}
+FLAKY = "2401.00003"
+REJECT = "2401.00004"   # 배치에 섞이면 서버가 배치 전체를 400으로 거절하는 ID
+
+calls = {"batch": 0, "single": 0, "throttled": 0}
+posted = []             # 배치 요청 크기 (거절 포함)
+mode = {"batch": "ok", "single": "ok"}   # "down"이면 503 (장애), "null"이면 배치 결과 모두 null
+
+
+class StandIn(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _json(self, status, body, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        posted.append(len(body["ids"]))
+        if mode["batch"] == "down":
+            return self._json(503, {"message": "Service Unavailable"})
+        if mode["batch"] == "null":
+            return self._json(200, [None] * len(body["ids"]))
+        if f"ARXIV:{REJECT}" in body["ids"]:
+            return self._json(400, {"error": "Invalid id"})
+        # 첫 배치 요청은 429로 거절 (Retry-After 처리 확인)
+        if calls["throttled"] == 0:
+            calls["throttled"] += 1
+            return self._json(429, {"message": "Too Many Requests"}, {"Retry-After": "0.2"})
+        calls["batch"] += 1
+        out = []
+        for raw in body["ids"]:
+            cid = raw.split(":", 1)[1]
+            if cid in KNOWN and cid != FLAKY:
+                out.append({"paperId": cid, "citationCount": KNOWN[cid]})
+            else:
+                out.append(None)
+        self._json(200, out)
+
+    def do_GET(self):
+        calls["single"] += 1
+        if mode["single"] == "down":
+            return self._json(503, {"message": "Service Unavailable"})
+        cid = self.path.split("ARXIV:", 1)[1].split("?", 1)[0]
+        if cid in KNOWN:
+            return self._json(200, {"paperId": cid, "citationCount": KNOWN[cid]})
+        self._json(404, {"error": "Paper not found"})
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+base_url = f"http://127.0.0.1:{server.server_port}"
+
+print("=== Semantic Scholar 배치 조회 테스트 ===\n")
+print(f"대역 서버: {base_url}\n")
+
+resolver = CitationResolver(base_url=base_url, batch_size=2, min_interval=0.0)
+ids = ["2401.00001v2", "2401.00002v1", "2401.00003v1", "2401.99999v1", "cs/0112017v1"]
+counts = resolver.resolve(ids)
+print(f"\n결과: {counts}")
+print(f"호출 수: {calls} / resolver 요청 {resolver.requests}회\n")
+first = dict(calls)
+
+# 2) 거절된 배치는 절반씩 나눠 재조회: 문제 ID만 한 건짜리 배치로 남음
+posted.clear()
+halved = CitationResolver(base_url=base_url, batch_size=4, min_interval=0.0).resolve(
+    ["2401.00001", "2401.00002", REJECT, "cs/0112017"]
+)
+halved_posts = list(posted)
+
+# 3) 서버 장애: 재시도 후에도 응답이 없으면 남은 배치·단건 조회 없이 중단
+posted.clear()
+mode["batch"], mode["single"] = "down", "down"
+single_before = calls["single"]
+down = CitationResolver(base_url=base_url, batch_size=2, max_retries=0, min_interval=0.0).resolve(ids)
+down_posts, down_singles = list(posted), calls["single"] - single_before
+
+# 4) 배치는 모두 null, 단건은 장애: max_failures번 연속 실패하면 나머지 단건 조회 포기
+mode["batch"] = "null"
+single_before = calls["single"]
+gave_up = CitationResolver(
+    base_url=base_url, batch_size=5, max_retries=0, min_interval=0.0, max_failures=2
+).resolve(ids)
+gave_up_singles = calls["single"] - single_before
+server.shutdown()
+print(f"\n거절 배치 크기: {halved_posts} / 장애 시 배치 {down_posts} 단건 {down_singles}회 / 단건 포기 전 {gave_up_singles}회")
+
+checks = [
+    ("버전 제거된 정규 ID로 반환",       "2401.00001" in counts and "2401.00001v2" not in counts),
+    ("배치 결과 인용수 일치",           counts.get("2401.00001") == 12 and counts.get("cs/0112017") == 3),
+    ("인용수 0도 정상 처리",            counts.get("2401.00002") == 0),
+    ("배치 누락분 단건 fallback",       counts.get(FLAKY) == 7),
+    ("미인덱싱(404)은 0",              counts.get("2401.99999") == 0),
+    ("429 후 재시도",                  resolver.throttled == 1),
+    ("배치 요청 수 = ceil(5/2)",        first["batch"] == 3),
+    ("단건 요청은 누락분만 (2건)",       first["single"] == 2),
+    ("거절된 배치는 절반씩 재조회",       halved_posts == [4, 2, 2, 1, 1]),
+    ("거절 ID 외 인용수는 배치로 조회",   halved == {"2401.00001": 12, "2401.00002": 0, "cs/0112017": 3, REJECT: 0}),
+    ("서버 장애 시 남은 조회 중단",       down == {} and down_posts == [2] and down_singles == 0),
+    ("단건 연속 실패 시 나머지 포기",     gave_up == {} and gave_up_singles == 2),
+]
+all_pass = True
+for condition, passed in checks:
+    print(f"  {'✅' if passed else '❌'} {condition}")
+    all_pass = all_pass and passed
+
+print(f"\n{'✅ 모든 조건 통과' if all_pass else '❌ 일부 조건 미충족'}")
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""MongoDB 연결 관리 테스트 - 인덱스 일괄 생성 / 공용 연결 실패 처리 (MongoDB 불필요)"""
+
+import os
+
+os.environ["MONGODB_URI"] = "mongodb://127.0.0.1:1/"
+os.environ["MONGODB_TIMEOUT_MS"] = "200"
+
+import inspect  # noqa: E402
+
+from paper_briefing import citation_cache, db, snapshot_ingest, state  # noqa: E402
+from paper_briefing.config import BOOKMARKS_COLLECTION, MONGODB_COLLECTION  # noqa: E402
+
+
+class RecordingDb(dict):
+    """create_index 호출만 기록하는 데이터베이스 대역."""
+
+    class Collection:
+        def __init__(self):
+            self.indexes = []
+
+        def create_index(self, keys, **options):
+            self.indexes.append((keys, options))
+            return "_".join(f"{field}_{direction}" for field, direction in keys)
+
+    def __missing__(self, name):
+        self[name] = self.Collection()
+        return self[name]
+
+
+print("=== MongoDB 연결 관리 테스트 ===\n")
+
+# 1) 선언된 인덱스를 한 번에 생성
+fake = RecordingDb()
+created = db.ensure_indexes(fake)
+papers_indexes = fake[MONGODB_COLLECTION].indexes
+
+# 2) 연결 실패 시 예외, 실패한 client는 공유하지 않음
+try:
+    db.get_db()
+    failed = False
+except Exception:
+    failed = True
+
+# 3) 호출·요청 경로에는 인덱스 DDL 없음
+ddl_free = all("create_index" not in inspect.getsource(m) for m in (state, citation_cache, snapshot_ingest))
+print()
+
+checks = [
+    ("papers.id unique 인덱스",               ([("id", 1)], {"unique": True}) in papers_indexes),
+    ("bookmarks.paper_id unique 인덱스",      fake[BOOKMARKS_COLLECTION].indexes == [([("paper_id", 1)], {"unique": True})]),
+    ("선언된 컬렉션 모두 생성",                  set(created) == set(db.INDEXES)),
+    ("연결 실패 → 예외 / client 미보관",         failed and db._client is None),
+    ("호출 경로에 create_index 없음",           ddl_free),
+]
+all_pass = True
+for condition, passed in checks:
+    print(f"  {'✅' if passed else '❌'} {condition}")
+    all_pass = all_pass and passed
+
+print(f"\n{'✅ 모든 조건 통과' if all_pass else '❌ 일부 조건 미충족'}")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""동시 수집 테스트 - 여러 연도 그룹을 동시에 수집해도 arXiv 요청 간격(ARXIV_MIN_INTERVAL)이
+전체 기준으로 지켜지는지 / 결과가 연도 그룹 순서를 유지하는지
+(가짜 시계 + 로컬 arXiv Atom 대역 서버 사용, 네트워크·MongoDB 불필요)"""
+
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from paper_briefing import http_cache, rate_limit
+from paper_briefing.arxiv_fetcher import RateLimitedClient, fetch_buckets
+from paper_briefing.config import ARXIV_BURST, ARXIV_MIN_INTERVAL, SEARCH_QUERY
+from paper_briefing.query_planner import QueryShard
+
+http_cache.configure(ttl=0)   # 매 실행 대역 서버에서 받도록 응답 캐시 미사용
+
+ENTRY = """<entry>
+  <id>http://arxiv.org/abs/{id}</id>
+  <updated>{year}-05-{day:02d}T00:00:00Z</updated>
+  <published>{year}-05-{day:02d}T00:00:00Z</published>
+  <title>Robot Policy {id}</title>
+  <summary>Robot Policy {id} abstract</summary>
+  <author><name>Author</name></author>
+  <link href="http://arxiv.org/abs/{id}" rel="alternate" type="text/html"/>
+  <link title="pdf" href="http://arxiv.org/pdf/{id}" rel="related" type="application/pdf"/>
+  <arxiv:primary_category term="cs.RO"/>
+  <category term="cs.RO"/>
+</entry>"""
+
+FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/"
+      xmlns:arxiv="http://arxiv.org/schemas/atom">
+  <title>arXiv Query</title>
+  <id>http://arxiv.org/api/test</id>
+  <updated>2024-05-31T00:00:00Z</updated>
+  <opensearch:totalResults>{total}</opensearch:totalResults>
+  <opensearch:startIndex>{start}</opensearch:startIndex>
+  <opensearch:itemsPerPage>{size}</opensearch:itemsPerPage>
+{entries}
+</feed>"""
+
+PER_BUCKET = 6   # 연도 그룹마다 검색 결과 수
+PER_PAGE = 2     # 대역 서버가 한 페이지에 돌려주는 수 → 그룹마다 3페이지 요청
+SLOW_YEAR = 2021 # 이 연도 요청은 실제로 늦게 응답 → 가장 늦게 끝나도 순서 유지되는지 확인
+
+
+class FakeClock:
+    """rate_limit 모듈의 time 대신 쓰는 가짜 시계.
+
+    sleep(dt)은 실제로 기다리지 않고 시계를 (호출 시각 + dt)까지 앞당깁니다.
+    여러 스레드가 같은 시각부터 기다리면 시계는 한 번만 앞당겨집니다.
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+        self._lock = threading.Lock()
+
+    def monotonic(self):
+        with self._lock:
+            return self.now
+
+    def sleep(self, seconds):
+        with self._lock:
+            target = self.now + seconds
+        time.sleep(0.001)   # 다른 워커 스레드에 실행 기회
+        with self._lock:
+            self.now = max(self.now, target)
+
+
+requests = []   # 받은 페이지 요청의 (연도, start)
+lock = threading.Lock()
+
+
+class StandIn(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        args = parse_qs(urlparse(self.path).query)
+        start = int(args["start"][0])
+        year = int(re.search(r"submittedDate:\[(\d{4})", args["search_query"][0]).group(1))
+        with lock:
+            requests.append((year, start))
+        if year == SLOW_YEAR:
+            time.sleep(0.05)
+        entries = "\n".join(
+            ENTRY.format(id=f"{year % 100:02d}05.{n:05d}v1", year=year, day=28 - n)
+            for n in range(start, min(start + PER_PAGE, PER_BUCKET))
+        )
+        data = FEED.format(total=PER_BUCKET, start=start, size=PER_PAGE, entries=entries).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/atom+xml")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+RateLimitedClient.query_url_format = f"http://127.0.0.1:{server.server_port}/api/query?{{}}"
+
+clock = FakeClock()
+rate_limit.time = clock        # TokenBucket의 time.monotonic / time.sleep → 가짜 시계
+rate_limit._arxiv_limiter = None   # 가짜 시계로 기본 설정(ARXIV_MIN_INTERVAL, ARXIV_BURST) 버킷 새로 생성
+limiter = rate_limit.get_arxiv_limiter()
+
+print("=== 동시 수집 테스트 ===\n")
+
+buckets = [(f"{y}", y, y) for y in (SLOW_YEAR, 2022, 2023, 2024)]
+started_fake, started_real = clock.now, time.monotonic()
+fetched = fetch_buckets(buckets, max_results=PER_BUCKET, shards=[QueryShard("", SEARCH_QUERY)])
+elapsed_fake, elapsed_real = clock.now - started_fake, time.monotonic() - started_real
+rate_limit.time = time
+
+n_requests = len(requests)
+min_elapsed = (n_requests - ARXIV_BURST) * ARXIV_MIN_INTERVAL
+print(f"\n요청 {n_requests}회 / 가짜 시계 경과 {elapsed_fake:.1f}s (최소 {min_elapsed:.1f}s) / 실제 {elapsed_real:.2f}s\n")
+
+checks = [
+    ("연도 그룹마다 모든 페이지 요청",          sorted(requests) == sorted((y, s) for _, y, _ in buckets for s in range(0, PER_BUCKET, PER_PAGE))),
+    ("여러 연도 그룹이 실제로 동시에 진행",      [y for y, _ in requests[:len(buckets)]] != [y for y, _ in sorted(requests)[:len(buckets)]]),
+    ("전체 요청 간격 ARXIV_MIN_INTERVAL 유지",  elapsed_fake >= min_elapsed - 1e-6),
+    ("불필요한 추가 대기 없음",                 elapsed_fake <= min_elapsed + ARXIV_MIN_INTERVAL + 1e-6),
+    ("실제로는 기다리지 않음 (가짜 시계)",       elapsed_real < n_requests * ARXIV_MIN_INTERVAL / 2),
+    ("결과가 연도 그룹 순서 유지",              [b.label for b in fetched] == [label for label, _, _ in buckets]),
+    ("그룹마다 자기 연도 논문만",               all(
+        len(b.papers) == PER_BUCKET and all(p.id.startswith(f"{b.year_start % 100:02d}05.") for p in b.papers)
+        for b in fetched
+    )),
+]
+all_pass = True
+for condition, passed in checks:
+    print(f"  {'✅' if passed else '❌'} {condition}")
+    all_pass = all_pass and passed
+
+server.shutdown()
+print(f"\n{'✅ 모든 조건 통과' if all_pass else '❌ 일부 조건 미충족'}")
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""증분 수집 테스트 - high-water mark 저장/로드(같은 날 base 재사용)와 mark 이후 이어서 수집하는
+위치(offset + 새 논문 수)가 맞는지 SQLite·MongoDB(mongomock) 저장소 모두에서 확인
+(로컬 arXiv Atom 대역 서버 사용, 네트워크·MongoDB 서버 불필요)"""
+
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import mongomock
+
+from paper_briefing import http_cache, rate_limit, storage
+from paper_briefing.arxiv_fetcher import RateLimitedClient, _BucketStream, _harvest_key
+from paper_briefing.rate_limit import TokenBucket
+from paper_briefing.state import load_harvest_marks, save_harvest_marks
+from paper_briefing.storage import MongoStore, SqliteStore
+
+http_cache.configure(ttl=0)   # 매 실행 대역 서버에서 받도록 응답 캐시 미사용
+
+ENTRY = """<entry>
+  <id>http://arxiv.org/abs/{id}</id>
+  <updated>2024-05-{day:02d}T00:00:00Z</updated>
+  <published>2024-05-{day:02d}T00:00:00Z</published>
+  <title>Robot Policy {id}</title>
+  <summary>Robot Policy {id} abstract</summary>
+  <author><name>Author</name></author>
+  <link href="http://arxiv.org/abs/{id}" rel="alternate" type="text/html"/>
+  <link title="pdf" href="http://arxiv.org/pdf/{id}" rel="related" type="application/pdf"/>
+  <arxiv:primary_category term="cs.RO"/>
+  <category term="cs.RO"/>
+</entry>"""
+
+FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/"
+      xmlns:arxiv="http://arxiv.org/schemas/atom">
+  <title>arXiv Query</title>
+  <id>http://arxiv.org/api/test</id>
+  <updated>2024-05-31T00:00:00Z</updated>
+  <opensearch:totalResults>{total}</opensearch:totalResults>
+  <opensearch:startIndex>{start}</opensearch:startIndex>
+  <opensearch:itemsPerPage>{size}</opensearch:itemsPerPage>
+{entries}
+</feed>"""
+
+results = []     # 검색 결과 (제출일 최신순): (ID, 제출일)
+requests = []    # 받은 페이지 요청의 start
+
+
+class StandIn(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        args = parse_qs(urlparse(self.path).query)
+        start, size = int(args["start"][0]), int(args["max_results"][0])
+        requests.append(start)
+        page = results[start:start + size]
+        entries = "\n".join(ENTRY.format(id=pid, day=day) for pid, day in page)
+        data = FEED.format(total=len(results), start=start, size=len(page), entries=entries).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/atom+xml")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+RateLimitedClient.query_url_format = f"http://127.0.0.1:{server.server_port}/api/query?{{}}"
+limiter = TokenBucket(rate=1000.0, capacity=1000)
+
+QUERY = "cat:cs.RO AND submittedDate:[20240101 TO 20241231]"
+KEY = _harvest_key(QUERY)
+
+
+def ids(prefix, *ns):
+    return [f"{prefix}.{n:05d}v1" for n in ns]
+
+
+def harvest(mark, max_scan):
+    """mark부터 max_scan편 수집 → (논문 ID, 요청 start 목록, 다음 mark)."""
+    requests.clear()
+    stream = _BucketStream(RateLimitedClient(limiter, page_size=2), QUERY, mark, max_scan)
+    papers = [p.id for p in stream]
+    return papers, list(requests), stream.next_mark()
+
+
+def yesterday(store):
+    """저장된 mark를 어제 실행한 것처럼 바꿉니다."""
+    for key, doc in store.harvest_marks().items():
+        store.put_harvest_mark(key, {**doc, "run_date": "2000-01-01"})
+
+
+def run_suite(store):
+    storage._store = store   # state의 load/save_harvest_marks가 이 저장소를 사용
+    results[:] = [(pid, 20 - n) for n, pid in enumerate(ids("2405", *range(10)))]
+
+    # 1) 첫 실행: mark 없이 처음부터 4편 → 다음 위치 offset 4
+    first, _, mark1 = harvest(None, 4)
+    save_harvest_marks({KEY: mark1})
+    first_day = load_harvest_marks()   # 오늘이 첫 수집이면 base 없음 → 같은 날 재실행도 처음부터
+
+    # 2) 다음 날: 새 논문 2편이 맨 앞에 올라옴 → 새 논문 다음에 offset 4 + 2 = 6부터 이어서
+    yesterday(store)
+    results[:0] = [(pid, 25 - n) for n, pid in enumerate(ids("2406", 0, 1))]
+    loaded = load_harvest_marks()
+    second, second_pages, mark2 = harvest(loaded.get(KEY), 5)
+    save_harvest_marks({KEY: mark2})
+
+    # 3) 같은 날 재실행: 오늘 첫 실행 시점의 mark(base)에서 다시 시작 → 같은 페이지 요청
+    replay_mark = load_harvest_marks().get(KEY)
+    replay, replay_pages, _ = harvest(replay_mark, 5)
+    save_harvest_marks({KEY: mark2})
+    base_kept = load_harvest_marks().get(KEY) == replay_mark
+
+    # 4) 초기화
+    deleted = store.reset_harvest_marks()
+    cleared = load_harvest_marks()
+
+    return [
+        ("첫 실행은 처음부터, 다음 위치 offset = 본 수",   first == ids("2405", 0, 1, 2, 3) and mark1["offset"] == 4),
+        ("mark 저장 당일 첫 실행이면 base 없음",          first_day == {}),
+        ("다음 날 저장된 mark 로드",                       loaded.get(KEY, {}).get("offset") == 4
+                                                          and loaded[KEY]["newest_id"] == "2405.00000v1"),
+        ("head: 새 논문만 받고 mark에서 멈춤",             second[:2] == ids("2406", 0, 1)),
+        ("tail: offset + 새 논문 수(6)부터 이어서",        second[2:] == ids("2405", 4, 5, 6) and 6 in second_pages),
+        ("다음 mark = offset + 새 논문 + tail",          mark2["offset"] == 4 + 2 + 3 and mark2["newest_id"] == "2406.00000v1"),
+        ("같은 날 재실행은 base에서 시작",                 replay_mark is not None and replay_mark["offset"] == 4),
+        ("같은 날 재실행은 같은 논문·같은 페이지",          replay == second and replay_pages == second_pages),
+        ("같은 날 다시 저장해도 base 유지",               base_kept),
+        ("초기화 후 mark 없음",                          deleted == 1 and cleared == {}),
+    ]
+
+
+print("=== 증분 수집 테스트 ===\n")
+
+stores = {
+    "sqlite": SqliteStore(os.path.join(tempfile.mkdtemp(), "papers.db")),
+    "mongo (mongomock)": MongoStore(mongomock.MongoClient()["paper_briefing_harvest_test"]),
+}
+all_pass = True
+for name, store in stores.items():
+    print(f"[{name}]")
+    try:
+        checks = run_suite(store)
+    except Exception as e:
+        checks = [(f"실행 중 오류: {e!r}", False)]
+    for condition, passed in checks:
+        print(f"  {'✅' if passed else '❌'} {condition}")
+        all_pass = all_pass and passed
+    store.close()
+    print()
+
+storage._store = None
+server.shutdown()
+print(f"{'✅ 모든 조건 통과' if all_pass else '❌ 일부 조건 미충족'}")
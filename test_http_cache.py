@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""HTTP 응답 캐시 테스트 - TTL 만료 / 오프라인 모드 캐시 미스 / 여러 스레드의 동시 저장·통계
+(로컬 대역 서버 사용, 네트워크 불필요)"""
+
+import glob
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from paper_briefing import http_cache
+from paper_briefing.http_cache import CachedSession, OfflineCacheMiss
+
+cache_dir = tempfile.mkdtemp()
+http_cache.configure(ttl=60, offline=False, cache_dir=cache_dir)
+
+hits = []   # 대역 서버가 받은 요청 경로
+
+
+class StandIn(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        hits.append(self.path)
+        data = f"body for {self.path}".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+base_url = f"http://127.0.0.1:{server.server_port}"
+session = CachedSession()
+
+
+def _store_error(key, resp):
+    try:
+        http_cache._store(key, resp)
+    except OSError as e:
+        return repr(e)
+    return None
+
+
+def age_cache(seconds):
+    """저장된 모든 캐시 항목의 받은 시각을 seconds만큼 과거로 옮깁니다."""
+    for path in glob.glob(os.path.join(cache_dir, "*", "*.json")):
+        with open(path, encoding="utf-8") as f:
+            meta = json.load(f)
+        meta["fetched_at"] -= seconds
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+
+print("=== HTTP 응답 캐시 테스트 ===\n")
+
+# 1) TTL 안에서는 캐시 적중, 지나면 다시 요청
+first = session.get(f"{base_url}/page?start=0")
+second = session.get(f"{base_url}/page?start=0")
+other_page = session.get(f"{base_url}/page?start=50")
+fresh_hits = len(hits)
+age_cache(61)
+expired = session.get(f"{base_url}/page?start=0")
+expired_hits = len(hits)
+
+# 2) 오프라인: 캐시에 있으면 신선도와 무관하게 사용, 없으면 요청 없이 OfflineCacheMiss
+age_cache(3600)
+http_cache.configure(offline=True)
+stale = session.get(f"{base_url}/page?start=50")
+try:
+    session.get(f"{base_url}/page?start=100")
+    miss_raised = False
+except OfflineCacheMiss:
+    miss_raised = True
+offline_hits = len(hits)
+http_cache.configure(offline=False)
+
+# 3) 여러 스레드: 서로 다른 페이지를 동시에 받아도 통계 누락 없음,
+#    같은 키를 동시에 저장해도 임시 파일이 섞이지 않음
+before = http_cache.cache_stats()
+n = 64
+with ThreadPoolExecutor(max_workers=16) as pool:
+    pages = list(pool.map(lambda i: CachedSession().get(f"{base_url}/page?start={1000 + i}"), range(n)))
+after = http_cache.cache_stats()
+key = http_cache.cache_key("GET", f"{base_url}/same")
+with ThreadPoolExecutor(max_workers=16) as pool:
+    errors = [e for e in pool.map(lambda i: _store_error(key, pages[i]), range(n)) if e]
+stored = http_cache.lookup("GET", f"{base_url}/same")
+leftovers = glob.glob(os.path.join(cache_dir, "*", "*.tmp"))
+server.shutdown()
+
+print(f"대역 서버 요청: TTL 안 {fresh_hits}회 / 만료 후 {expired_hits}회 / 오프라인 후 {offline_hits}회")
+print(f"동시 요청 통계: {before} → {after} / 같은 키 동시 저장 실패 {len(errors)}회\n")
+
+checks = [
+    ("TTL 안에서는 캐시 적중",               first.text == second.text and getattr(second, "from_cache", False)),
+    ("페이지(offset)가 다르면 다른 캐시 키",   other_page.text.endswith("start=50") and fresh_hits == 2),
+    ("TTL이 지나면 다시 요청",               expired_hits == 3 and not getattr(expired, "from_cache", False)),
+    ("오프라인: 만료된 캐시도 사용",          getattr(stale, "from_cache", False) and stale.text.endswith("start=50")),
+    ("오프라인: 캐시 미스는 OfflineCacheMiss", miss_raised and offline_hits == expired_hits),
+    ("동시 요청 통계 누락 없음",              after["misses"] - before["misses"] == n
+                                           and after["stores"] - before["stores"] == n),
+    ("같은 키 동시 저장 모두 성공",           not errors and stored is not None and stored.text.startswith("body for /page")),
+    ("동시 저장 후 임시 파일 없음",           not leftovers),
+]
+all_pass = True
+for condition, passed in checks:
+    print(f"  {'✅' if passed else '❌'} {condition}")
+    all_pass = all_pass and passed
+
+print(f"\n{'✅ 모든 조건 통과' if all_pass else '❌ 일부 조건 미충족'}")
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""로컬 키워드 매처 테스트 (단어 단위 Aho-Corasick, 네트워크 불필요)"""
+
+import time
+
+from paper_briefing.keyword_matcher import KeywordMatcher, match_keywords
+
+print("=== 로컬 키워드 매처 테스트 ===\n")
+
+title = "VLA: Vision-Language-Action Models for Sim-to-Real Manipulation"
+abstract = (
+    "We train a vision language action policy with a diffusion policy head in simulation, "
+    "then deploy it sim to real. We also detect out-of-distribution (OOD) inputs for safety. "
+    "Self-driving is out of scope."
+)
+hits = match_keywords(title, abstract)
+print(f"키워드: {hits.keywords}")
+print(f"주제:   {hits.topics}\n")
+
+# 겹치는 구문 (접미사/부분 구문) 검증용 매처
+overlap = KeywordMatcher({"A": ["a b c", "b c", "c"], "B": ["x y x z", "y x"]})
+
+# 처리 속도: 키워드가 거의 없는 평범한 초록
+plain = (
+    "We propose a hierarchical framework that decomposes long-horizon tasks into language "
+    "subgoals executed by a lightweight low-level controller at high frequency. Experiments "
+    "on two platforms show a 23% improvement in success rate over prior methods. "
+) * 4
+n = 5000
+started = time.perf_counter()
+for _ in range(n):
+    match_keywords("A Hierarchical Framework", plain)
+per_minute = n / (time.perf_counter() - started) * 60
+print(f"처리 속도: 분당 {per_minute / 1e6:.2f}M편 (초록 {len(plain)}자)\n")
+
+checks = [
+    ("하이픈/공백/대소문자 무시",        hits.keywords.get("vision-language-action") == 2),
+    ("약어 키워드 (VLA, OOD)",         hits.keywords.get("VLA") == 1 and hits.keywords.get("OOD") == 1),
+    ("키워드별 횟수",                  hits.keywords.get("sim-to-real") == 2),
+    ("단어 단위 일치 (simulation 1회)",  hits.keywords.get("simulation") == 1),
+    ("주제별 합계",                    hits.topics.get("VLA") == 3),
+    ("주제 순서 = TOPIC_KEYWORDS 순서", list(hits.topics) == ["AD", "VLA", "Manipulation", "Sim", "Safety"]),
+    ("제목/초록 경계를 넘는 구문 무시",  match_keywords("deep motion", "planning matters").keywords == {}),
+    ("겹치는 구문 모두 계수",           overlap.count("a b c") == {"a b c": 1, "b c": 1, "c": 1}),
+    ("실패 링크로 재시작",              overlap.count("x y x y x z") == {"y x": 2, "x y x z": 1}),
+    ("분당 100만 편 이상",              per_minute >= 1e6),
+]
+all_pass = True
+for condition, passed in checks:
+    print(f"  {'✅' if passed else '❌'} {condition}")
+    all_pass = all_pass and passed
+
+print(f"\n{'✅ 모든 조건 통과' if all_pass else '❌ 일부 조건 미충족'}")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""LLM 호출 계측 테스트 - 호출별 토큰·응답 시간·비용 기록 / 요약 / 실행 기록 저장 (네트워크·MongoDB 불필요)"""
+
+import json
+import os
+import tempfile
+
+from openai import OpenAI
+
+from paper_briefing import llm_usage, state
+from paper_briefing.arxiv_fetcher import Paper
+from paper_briefing.batch_server import LocalBatchServer
+from paper_briefing.llm_usage import RunUsage, call_cost
+from paper_briefing.providers import MockProvider
+from paper_briefing.token_budget import TokenEstimator
+from paper_briefing.triage_batch import iter_batch_results, submit_batch_file, wait_for_batch, write_batch_file
+
+WORKDIR = tempfile.mkdtemp()
+CALIBRATION = os.path.join(WORKDIR, "calibration.json")
+
+
+def make_paper(n: int) -> Paper:
+    return Paper(
+        id=f"2401.{n:05d}v1", title=f"Paper {n}", abstract="A diffusion policy for dexterous manipulation.",
+        authors=[], published="2024-01-01", arxiv_url="", pdf_url="", categories=["cs.RO"],
+    )
+
+
+class BrokenProvider(MockProvider):
+    def _stream(self, batch, user_msg):
+        raise RuntimeError("provider down")
+        yield
+
+
+class TruncatingProvider(MockProvider):
+    def _stream(self, batch, user_msg):
+        raw = "".join(part for part in super()._stream(batch, user_msg) if isinstance(part, str))
+        yield raw[: raw.index(batch[-1].id) - 10]
+
+
+print("=== LLM 호출 계측 테스트 ===\n")
+
+run = llm_usage._run = RunUsage()
+
+# 1) 동기 호출: 정상 / 잘린 응답 / 실패
+mock = MockProvider(model="mock-a", latency=0.05, estimator=TokenEstimator("mock-a", CALIBRATION))
+mock.complete([make_paper(n) for n in range(3)])
+TruncatingProvider(model="mock-a", estimator=mock.estimator).complete([make_paper(n) for n in range(3, 6)])
+try:
+    BrokenProvider(model="mock-a", estimator=mock.estimator).complete([make_paper(9)])
+except RuntimeError:
+    pass
+
+# 2) Batch API 결과 (대역 서버가 usage를 붙여 돌려줌)
+path = os.path.join(WORKDIR, "triage.jsonl")
+write_batch_file([[make_paper(n) for n in range(10, 12)]], path)
+with LocalBatchServer(polls=1) as server:
+    client = OpenAI(api_key="local", base_url=server.base_url)
+    done = wait_for_batch(client, submit_batch_file(client, path, {}).id, interval=0.01)
+    list(iter_batch_results(client, done, {"failed": 0}))
+
+rows = {(r["kind"], r["provider"]): r for r in run.summary()}
+run.print_table()
+
+
+
+def no_db():
+    raise ConnectionError("no mongodb")
+
+
+# 3) 실행 기록 저장: MongoDB 실패해도 logs/runs/{run_id}.json은 남음
+state._get_db = no_db
+os.chdir(WORKDIR)
+doc = run.save("test", {"papers": 8})
+with open(os.path.join("logs", "runs", f"{run.run_id}.json"), encoding="utf-8") as f:
+    saved = json.load(f)
+print()
+
+mock_row = rows[("sync", "mock")]
+batch_row = rows[("batch", "openai")]
+checks = [
+    ("호출별 기록 (동기 3 + batch 1)",        len(run.calls) == 4),
+    ("정상 / 잘린 응답 / 실패 구분",            mock_row["calls"] == 3 and mock_row["partial"] == 1 and mock_row["errors"] == 1),
+    ("모의 응답 토큰 집계",                    mock_row["prompt_tokens"] > 0 and mock_row["completion_tokens"] > 0),
+    ("응답 시간 p50/p95",                     mock_row["latency_p50"] is not None and mock_row["latency_p95"] >= 0.05),
+    ("batch 결과 토큰 기록 (응답 시간 없음)",    batch_row["prompt_tokens"] > 0 and batch_row["latency_p50"] is None),
+    ("비용 = 입력·캐시 입력·출력 단가",          abs(call_cost("gpt-4o", 1_000_000, 400_000, 100_000) - (1.5 + 0.5 + 1.0)) < 1e-9),
+    ("Batch API 요금 할인",                  call_cost("gpt-4o", 1000, 0, 1000, batch=True) == call_cost("gpt-4o", 1000, 0, 1000) / 2),
+    ("가격 없는 모델은 비용 0",                 call_cost("mock-keywords", 1000, 0, 1000) == 0.0),
+    ("실행 문서: run id / 합계 / 추가 필드",     doc["_id"] == run.run_id and doc["totals"]["calls"] == 4 and doc["papers"] == 8),
+    ("MongoDB 없이도 실행 로그 파일 저장",       saved["_id"] == run.run_id and len(saved["calls"]) == 4),
+]
+all_pass = True
+for condition, passed in checks:
+    print(f"  {'✅' if passed else '❌'} {condition}")
+    all_pass = all_pass and passed
+
+print(f"\n{'✅ 모든 조건 통과' if all_pass else '❌ 일부 조건 미충족'}")
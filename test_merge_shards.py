@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""쿼리 샤드 병합 테스트 - 정규 ID 기준 중복 제거 / topics에 모든 샤드 기록 /
+샤드당 창 ceil(max_results / 샤드 수)로도 연도 그룹 할당량을 채우는지
+(로컬 arXiv Atom 대역 서버 사용, 네트워크·MongoDB 불필요)"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from paper_briefing import http_cache, rate_limit
+from paper_briefing.arxiv_fetcher import BucketFetch, Paper, RateLimitedClient, _merge_shards, fetch_buckets
+from paper_briefing.config import QUERY_SHARDING
+from paper_briefing.query_planner import QueryShard, plan_shards
+from paper_briefing.rate_limit import TokenBucket
+
+http_cache.configure(ttl=0)   # 매 실행 대역 서버에서 받도록 응답 캐시 미사용
+rate_limit._arxiv_limiter = TokenBucket(rate=1000.0, capacity=1000)
+
+ENTRY = """<entry>
+  <id>http://arxiv.org/abs/{id}</id>
+  <updated>2024-05-{day:02d}T00:00:00Z</updated>
+  <published>2024-05-{day:02d}T00:00:00Z</published>
+  <title>Robot Policy {id}</title>
+  <summary>Robot Policy {id} abstract</summary>
+  <author><name>Author</name></author>
+  <arxiv:journal_ref>{journal_ref}</arxiv:journal_ref>
+  <link href="http://arxiv.org/abs/{id}" rel="alternate" type="text/html"/>
+  <link title="pdf" href="http://arxiv.org/pdf/{id}" rel="related" type="application/pdf"/>
+  <arxiv:primary_category term="cs.RO"/>
+  <category term="cs.RO"/>
+</entry>"""
+
+FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/"
+      xmlns:arxiv="http://arxiv.org/schemas/atom">
+  <title>arXiv Query</title>
+  <id>http://arxiv.org/api/test</id>
+  <updated>2024-05-31T00:00:00Z</updated>
+  <opensearch:totalResults>{total}</opensearch:totalResults>
+  <opensearch:startIndex>{start}</opensearch:startIndex>
+  <opensearch:itemsPerPage>{size}</opensearch:itemsPerPage>
+{entries}
+</feed>"""
+
+
+def pid(n, version=1):
+    return f"2405.{n:05d}v{version}"
+
+
+# 샤드별 검색 결과 (제출일 최신순, 번호가 작을수록 최신): 0~3은 세 샤드 모두, 4~5는 A·B에 걸림.
+# 같은 논문이 샤드마다 다른 버전으로 올 수 있음 (C는 v2)
+SHARD_RESULTS = {
+    "A": [pid(n) for n in (0, 1, 2, 3, 4, 5, 10, 11)],
+    "B": [pid(n) for n in (0, 1, 2, 3, 4, 5, 20, 21)],
+    "C": [pid(n, 2) for n in (0, 1, 2, 3)] + [pid(n) for n in (30, 31, 32, 33)],
+}
+SHARDS = [QueryShard(name, f'cat:cs.RO AND abs:"{name}"') for name in SHARD_RESULTS]
+requests = []   # (샤드, start, max_results)
+
+
+class StandIn(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        args = parse_qs(urlparse(self.path).query)
+        start, size = int(args["start"][0]), int(args["max_results"][0])
+        shard = next(name for name in SHARD_RESULTS if f'abs:"{name}"' in args["search_query"][0])
+        requests.append((shard, start, size))
+        results = SHARD_RESULTS[shard]
+        page = results[start:start + size]
+        entries = "\n".join(
+            ENTRY.format(id=p, day=28 - int(p[5:10]) % 28, journal_ref="")
+            for p in page
+        )
+        data = FEED.format(total=len(results), start=start, size=len(page), entries=entries).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/atom+xml")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+RateLimitedClient.query_url_format = f"http://127.0.0.1:{server.server_port}/api/query?{{}}"
+
+
+def paper(p, topics, published="2024-05-01", journal_ref=""):
+    return Paper(
+        id=p, title=p, abstract="", authors=[], published=published, arxiv_url="", pdf_url="",
+        categories=[], journal_ref=journal_ref, conference=journal_ref.split(" ")[0], topics=list(topics),
+    )
+
+
+def part(*papers):
+    return BucketFetch(label="2024", year_start=2024, year_end=2024, papers=list(papers), requests=1, scanned=len(papers))
+
+
+print("=== 쿼리 샤드 병합 테스트 ===\n")
+
+# 1) _merge_shards 직접: 같은 논문(버전 무관)은 한 편만, topics는 모든 샤드를 모음
+merged = _merge_shards([
+    part(paper(pid(1), ["A"], "2024-05-03"), paper(pid(2), ["A"], "2024-05-02")),
+    part(paper(pid(1, 2), ["B"], "2024-05-03"), paper(pid(3), ["B"], "2024-05-04", "ICML 2024")),
+    part(paper(pid(1), ["C"], "2024-05-03"), paper(pid(2, 3), ["C"], "2024-05-02")),
+], quota=2)
+by_id = {p.id: p for p in merged.papers}
+
+# 2) fetch_buckets: 샤드 3개, max_results=10 → 샤드당 창 ceil(10/3) = 4
+max_results, quota = 10, 5
+window = -(-max_results // len(SHARDS))
+requests.clear()
+plain = fetch_buckets([("2024", 2024, 2024)], max_results=max_results, shards=SHARDS)[0]
+plain_requests = list(requests)
+
+# 3) quota: 창(4편) 안에서는 세 샤드가 같은 논문 4편뿐 → 샤드마다 창 이후로 페이징해 할당량을 채움
+requests.clear()
+quoted = fetch_buckets([("2024", 2024, 2024)], max_results=max_results, quotas=[quota], shards=SHARDS)[0]
+server.shutdown()
+
+plain_ids = [p.id for p in plain.papers]
+print(f"\n창 {window} / quota 없음: {len(plain_ids)}편 (요청 {plain_requests})")
+print(f"quota {quota}: 선택 {[p.id for p in quoted.selected]} (요청 {quoted.requests}회)\n")
+
+checks = [
+    ("기본 QUERY_SHARDING은 샤딩 없음",          QUERY_SHARDING == "none" and len(plan_shards()) == 1),
+    ("정규 ID 기준 중복 제거 (버전 무관)",          sorted(by_id) == [pid(1), pid(2), pid(3)]),
+    ("topics에 걸린 샤드 모두 기록",              by_id[pid(1)].topics == ["A", "B", "C"] and by_id[pid(2)].topics == ["A", "C"]),
+    ("병합 후 제출일 최신순, 학회 우선 선택",        [p.id for p in merged.papers] == [pid(3), pid(1), pid(2)]
+                                                and merged.selected[0].id == pid(3) and len(merged.selected) == 2),
+    ("병합 통계는 샤드 합계",                     merged.requests == 3 and merged.shards == 3),
+    ("샤드당 창 = ceil(max_results / 샤드 수)",    sorted(plain_requests) == sorted((s.name, 0, window) for s in SHARDS)),
+    ("샤드 합계 창 ≥ max_results",               plain.scanned == window * len(SHARDS) >= max_results),
+    ("quota 없음: 겹친 논문은 한 편씩만",          plain_ids == [pid(n) for n in range(4)] and plain.papers[0].topics == ["A", "B", "C"]),
+    ("quota: 창 안 고유 후보가 부족하면 더 페이징",   quoted.requests > len(SHARDS)),
+    ("quota: 병합 후 할당량 채움 (중복 없이)",      len(quoted.selected) == quota
+                                                and len({p.id.split("v")[0] for p in quoted.selected}) == quota),
+]
+all_pass = True
+for condition, passed in checks:
+    print(f"  {'✅' if passed else '❌'} {condition}")
+    all_pass = all_pass and passed
+
+print(f"\n{'✅ 모든 조건 통과' if all_pass else '❌ 일부 조건 미충족'}")
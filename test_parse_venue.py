@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""학회 표기 추출 테스트 - 별칭 표 / 연도 추출 / 채택 상태 / URL·일반 문장 오탐 방지 (parse_venue)
+(네트워크·MongoDB 불필요)"""
+
+from paper_briefing.arxiv_fetcher import VenueInfo, parse_venue
+from paper_briefing.config import CONFERENCE_ALIASES
+
+print("=== 학회 표기 추출 테스트 ===\n")
+
+# 1) 별칭 표: 모든 별칭이 정규 학회명으로 (comment / journal_ref 모두)
+alias_misses = [
+    (conf, alias)
+    for conf, aliases in CONFERENCE_ALIASES.items()
+    for alias in aliases
+    if parse_venue("", f"Accepted at {alias} 2024").conference != conf
+    or parse_venue(alias, "").conference != conf
+]
+
+# 2) 연도 추출
+years = {
+    "Accepted at NeurIPS 2024": 2024,
+    "CVPR'25 camera-ready": 2025,
+    "Accepted to AAAI-24": 2024,
+    "AAAI-2023 oral": 2023,
+    "ICRA2025": 2025,
+    "ICRA, Yokohama, 2024": 2024,     # 별칭 뒤 첫 연도
+    "To appear in ICLR": 0,
+}
+year_misses = {text: parse_venue("", text).year for text, want in years.items()
+               if parse_venue("", text).year != want}
+
+# 3) 채택 상태
+statuses = {
+    ("", "Accepted at ICML 2024"): "accepted",
+    ("", "NIPS'17 workshop"): "workshop",
+    ("", "Accepted at the ICRA 2024 Workshop on Manipulation"): "workshop",   # 워크숍 우선
+    ("", "To appear in ICLR 2025"): "to_appear",
+    ("", "Submitted to CoRL 2024"): "submitted",
+    ("", "Submitted to IROS 2024, accepted"): "accepted",
+    ("ICRA 2024", ""): "accepted",                 # journal_ref에 적혀 있으면 출판
+    ("", "ICRA 2024"): "",
+}
+status_misses = {k: parse_venue(*k).status for k, want in statuses.items() if parse_venue(*k).status != want}
+
+# 4) 오탐: URL·파일 경로·일반 문장 속 짧은 별칭은 학회가 아님
+negatives = [
+    "code at github.com/foo/rss-feed",
+    "Our pipeline uses the ACL anthology",
+    "we subscribe to the rss feed of the lab",
+    "See https://icra2024.org for details",
+    "project page: www.cvpr2024.com",
+    "slides in ICRA2024.pdf",
+    "the ICML-style template",
+    "accepted at icra",                      # 소문자 짧은 별칭 (연도 없음)
+]
+false_positives = {text: parse_venue("", text) for text in negatives if parse_venue("", text) != VenueInfo()}
+
+# 5) 짧은 별칭도 대문자 + 학회 문맥이면 인정, 소문자라도 연도가 붙으면 인정
+positives = {
+    "Accepted at ICML": "ICML",
+    "ACL Findings": "ACL",
+    "RSS workshop on manipulation": "RSS",
+    "In Proc. ACL": "ACL",
+    "Accepted to CoRL (oral)": "CoRL",
+    "accepted at icra 2024": "ICRA",
+    "Submitted to NeurIPS/ICML": "NeurIPS",    # 여러 학회면 우선순위 높은 쪽
+    "IROS 2023 and NeurIPS 2024 workshop": "NeurIPS",
+}
+positive_misses = {text: parse_venue("", text).conference for text, want in positives.items()
+                   if parse_venue("", text).conference != want}
+
+for name, misses in (("별칭", alias_misses), ("연도", year_misses), ("상태", status_misses),
+                     ("오탐", false_positives), ("인정", positive_misses)):
+    if misses:
+        print(f"{name} 불일치: {misses}")
+
+checks = [
+    ("별칭 표의 모든 별칭 인식",                 not alias_misses),
+    ("연도: 4자리 / 'YY / -YY / 붙여쓰기 / 뒤쪽 연도", not year_misses),
+    ("상태: accepted / workshop / to_appear / submitted", not status_misses),
+    ("URL·파일 경로 속 별칭은 무시",              not any(t in false_positives for t in negatives[:1] + negatives[3:6])),
+    ("일반 문장 속 짧은 별칭은 무시",             not any(t in false_positives for t in negatives[1:3] + negatives[6:])),
+    ("짧은 별칭: 대문자 + 학회 문맥이면 인정",     not positive_misses),
+]
+all_pass = True
+for condition, passed in checks:
+    print(f"  {'✅' if passed else '❌'} {condition}")
+    all_pass = all_pass and passed
+
+print(f"\n{'✅ 모든 조건 통과' if all_pass else '❌ 일부 조건 미충족'}")
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""트리아지 provider 테스트 - 헤지 요청(limiter 대기 제외, 진 요청 취소·기록) / 장애 전환
+(mock provider, 네트워크·MongoDB 불필요)"""
+
+import os
+import tempfile
+import time
+
+from paper_briefing import providers, triage_cache
+from paper_briefing.arxiv_fetcher import Paper
+from paper_briefing.config import TRIAGE_LATENCY_SLO
+from paper_briefing.llm_usage import get_run_usage
+from paper_briefing.providers import HedgedProvider, MockProvider, build_triage_provider
+from paper_briefing.rate_limit import ApiRateLimiter
+from paper_briefing.token_budget import TokenEstimator
+from paper_briefing.triage import _PROMPT_HASH, _apply_results, _merge_results, _run_batches, triage_papers
+
+CALIBRATION = os.path.join(tempfile.mkdtemp(), "calibration.json")
+
+
+def make_paper(n: int) -> Paper:
+    return Paper(
+        id=f"2401.{n:05d}v1", title=f"Paper {n}",
+        abstract="A diffusion policy for dexterous manipulation with out-of-distribution detection.",
+        authors=[], published="2024-01-01", arxiv_url="", pdf_url="", categories=["cs.RO"],
+    )
+
+
+def mock(model: str, latency=0.0) -> MockProvider:
+    return MockProvider(model=model, latency=latency, estimator=TokenEstimator(model, CALIBRATION))
+
+
+class BrokenProvider(MockProvider):
+    def _stream(self, batch, user_msg):
+        raise RuntimeError("provider down")
+        yield
+
+
+class CacheCollection:
+    """triage_cache 컬렉션 대역 (_id $in 조회 / bulk_write)."""
+
+    def __init__(self, docs):
+        self.docs = {doc["_id"]: doc for doc in docs}
+
+    def find(self, query, projection=None):
+        return [self.docs[key] for key in query["_id"]["$in"] if key in self.docs]
+
+    def bulk_write(self, ops, ordered=True):
+        for op in ops:
+            self.docs[op._filter["_id"]] = {"_id": op._filter["_id"], **op._doc["$set"]}
+
+
+def run(provider, batches):
+    papers = [p for batch in batches for p in batch]
+    started = time.monotonic()
+    outputs = _run_batches(batches, provider.complete, provider.name)
+    elapsed = time.monotonic() - started
+    provider.close()
+    _apply_results(papers, _merge_results(outputs))
+    return papers, elapsed
+
+
+print("=== 트리아지 provider 테스트 ===\n")
+
+# 1) 단일 provider
+papers, _ = run(mock("mock-a"), [[make_paper(n) for n in range(3)]])
+single_ok = all(p.summary == f"[mock] {p.title}" and p.triage_model == "mock-a" for p in papers)
+
+# 2) 헤지: 주 provider가 batch 2에서만 p95(≈0.05s)보다 훨씬 느림 → 보조 provider 결과 사용
+SLOW = make_paper(13).id
+primary = mock("primary", latency=lambda msg: 2.0 if SLOW in msg else 0.02)
+primary.estimator.latencies.extend([0.05] * 10)
+hedged = HedgedProvider(primary, mock("secondary", latency=0.02))
+threshold = hedged.hedge_after()
+batches = [[make_paper(n) for n in range(10, 13)], [make_paper(n) for n in range(13, 16)]]
+hedge_started = time.monotonic()
+papers, hedge_elapsed = run(hedged, batches)
+hedge_closed = time.monotonic() - hedge_started   # close()는 진 요청이 끝날 때까지 기다림
+print(f"\n헤지 기준 {threshold:.2f}s / 소요 {hedge_elapsed:.2f}s (close까지 {hedge_closed:.2f}s) / 통계 {hedged.stats}")
+by_model = {p.id: p.triage_model for p in papers}
+# 진 주 provider 요청은 스트림을 닫고, 받은 만큼의 추정 사용량이 실행 요약에 남음
+cancelled = [c for c in get_run_usage().calls if c["model"] == "primary" and c["status"] == "cancelled"]
+
+# 2-1) 헤지 기준 시간은 limiter 통과 후부터: 주 provider가 RPM 대기(0.2s)로 늦게 시작해도 응답이 빠르면 헤지 안 함
+queued = mock("queued", latency=0.02)
+queued.estimator.latencies.extend([0.05] * 10)
+queued.limiter = ApiRateLimiter(rpm=300, tpm=10_000_000)
+queued.limiter._requests._tokens = 0                  # 다음 요청은 1 / (300/60) = 0.2s 대기
+queued_hedged = HedgedProvider(queued, mock("queued-backup", latency=0.02))
+queued_papers, _ = run(queued_hedged, [[make_paper(n) for n in range(30, 33)]])
+
+# 3) 장애 전환: 주 provider가 항상 실패
+failing = HedgedProvider(
+    BrokenProvider(model="broken", estimator=TokenEstimator("broken", CALIBRATION)), mock("backup"),
+)
+papers_fo, _ = run(failing, [[make_paper(n) for n in range(20, 22)], [make_paper(n) for n in range(22, 24)]])
+
+# 4) 응답 시간 표본이 부족하면 TRIAGE_LATENCY_SLO 기준
+cold = HedgedProvider(mock("cold"), mock("cold-backup"))
+cold_threshold = cold.hedge_after()
+cold.close()
+
+# 5) 주 provider를 쓸 수 없으면 보조 provider만 사용
+os.environ.pop("OPENAI_API_KEY", None)
+fallback = build_triage_provider("openai", "mock")
+
+# 5) 헤지 provider의 캐시 확인: 모델마다 남은 논문을 다시 확인해도 적중·미적중은 논문당 한 번 집계
+cached_papers = [make_paper(n) for n in range(40, 44)]
+hit_doc = {"_id": triage_cache.triage_key(cached_papers[0], "mock-b", _PROMPT_HASH),
+           "summary": "캐시된 요약", "tags": ["VLA"], "score": 4.0}
+triage_cache._get_cache = lambda: CacheCollection([hit_doc])
+providers.build_triage_provider = lambda: HedgedProvider(mock("mock-a"), mock("mock-b"))
+before = triage_cache.cache_stats()
+triage_papers(cached_papers)
+after = triage_cache.cache_stats()
+lookups = {key: after[key] - before[key] for key in ("hits", "misses")}
+print(f"\n헤지 provider 캐시 집계: {lookups}")
+
+checks = [
+    ("단일 provider 결과 + 모델명",          single_ok),
+    ("헤지 기준 = 최근 응답 시간 p95",        abs(threshold - 0.05) < 1e-9),
+    ("느린 배치는 보조 provider 결과 사용",    all(by_model[p.id] == "secondary" for p in batches[1])),
+    ("빠른 배치는 주 provider 결과 사용",      all(by_model[p.id] == "primary" for p in batches[0])),
+    ("헤지 1회, 보조 provider 먼저 완료",      hedged.stats["hedged"] == 1 and hedged.stats["secondary_wins"] == 1),
+    ("느린 요청을 기다리지 않음 (< 1s)",       hedge_elapsed < 1.0),
+    ("진 요청은 스트림을 닫아 취소",            hedge_closed < 1.5 and len(cancelled) == 1),
+    ("취소한 요청도 추정 토큰·비용 기록",        cancelled and cancelled[0]["prompt_tokens"] > 0
+                                             and cancelled[0]["completion_tokens"] > 0),
+    ("limiter 대기는 헤지 기준에 넣지 않음",     queued_hedged.stats["hedged"] == 0
+                                             and all(p.triage_model == "queued" for p in queued_papers)),
+    ("장애 전환으로 전체 결과 확보",            all(p.summary and p.triage_model == "backup" for p in papers_fo)),
+    ("장애 전환 횟수 집계",                   failing.stats["failovers"] == 2),
+    ("표본 부족 시 TRIAGE_LATENCY_SLO",       cold_threshold == TRIAGE_LATENCY_SLO),
+    ("주 provider 키 없음 → 보조만 사용",      isinstance(fallback, MockProvider)),
+    ("두 모델 캐시 확인 시 집계는 논문당 한 번",  lookups == {"hits": 1, "misses": 3}),
+    ("캐시 적중 논문은 캐시 결과 사용",          cached_papers[0].summary == "캐시된 요약"
+                                             and all(p.summary for p in cached_papers)),
+]
+all_pass = True
+for condition, passed in checks:
+    print(f"  {'✅' if passed else '❌'} {condition}")
+    all_pass = all_pass and passed
+
+print(f"\n{'✅ 모든 조건 통과' if all_pass else '❌ 일부 조건 미충족'}")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""rate limiter 테스트 - TokenBucket 용량 상한·대기 / ApiRateLimiter 예약 상한·정산 환불 /
+동시 acquire / provider 스트림 실패 시 예약 토큰 정산 (네트워크·MongoDB 불필요)"""
+
+import os
+import tempfile
+import threading
+import time
+
+from paper_briefing import rate_limit
+from paper_briefing.arxiv_fetcher import Paper
+from paper_briefing.providers import MockProvider
+from paper_briefing.rate_limit import ApiRateLimiter, TokenBucket
+from paper_briefing.token_budget import TokenEstimator
+
+
+class FakeClock:
+    """rate_limit 모듈의 time 대신 쓰는 가짜 시계 (sleep은 시계만 앞당김).
+
+    부동소수 오차로 남은 아주 작은 대기도 시계가 실제로 움직이도록 최소 1µs씩 앞당깁니다.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += max(seconds, 1e-6)
+
+
+def make_paper(n: int) -> Paper:
+    return Paper(
+        id=f"2401.{n:05d}v1", title=f"Paper {n}", abstract="A diffusion policy for dexterous manipulation.",
+        authors=[], published="2024-01-01", arxiv_url="", pdf_url="", categories=["cs.RO"],
+    )
+
+
+class FailingProvider(MockProvider):
+    """after개 조각을 보낸 뒤 사용량 없이 끊기는 provider."""
+
+    name = "failing-test"
+
+    def __init__(self, after: int):
+        super().__init__(model="failing-test", estimator=TokenEstimator("failing-test", CALIBRATION))
+        self.after = after
+
+    def _stream(self, batch, user_msg):
+        for n, part in enumerate(super()._stream(batch, user_msg)):
+            if n == self.after:
+                raise RuntimeError("connection reset")
+            yield part
+
+
+CALIBRATION = os.path.join(tempfile.mkdtemp(), "calibration.json")
+
+print("=== rate limiter 테스트 ===\n")
+
+# 1) TokenBucket (가짜 시계): 오래 쉬어도 capacity까지만 쌓이고, 부족분만큼만 대기
+clock = FakeClock()
+rate_limit.time = clock
+bucket = TokenBucket(rate=10.0, capacity=5)
+clock.sleep(60)                                   # 600토큰어치 쉬어도 5개까지만
+burst = [bucket.acquire() for _ in range(5)]
+waited_sixth = bucket.acquire()
+waited_three = bucket.acquire(3)
+
+# 2) ApiRateLimiter: TPM보다 큰 요청은 버킷 크기만큼만 예약 (무한 대기 없음), settle로 환불·추가 차감
+api = ApiRateLimiter(rpm=60, tpm=1000)
+waited_huge = api.acquire(5000)
+after_huge = api._tokens._tokens
+api.settle(5000, 400)                             # 예약 1000(상한) 중 400만 사용 → 600 환불
+after_refund = api._tokens._tokens
+api.settle(1000, 0)                               # 환불해도 capacity를 넘지 않음
+after_cap = api._tokens._tokens
+api.acquire(800)
+api.settle(800, 1300)                             # 예약보다 500 더 씀 → 추가 차감
+after_over = api._tokens._tokens
+waited_debt = api.acquire(1000)                   # 빚(-300)까지 채워야 하므로 (1300 / 1000) × 60초 대기
+rate_limit.time = time
+
+# 3) 동시 acquire (실제 시계): 초당 50개, 버스트 5 → 20스레드가 1개씩이면 (20 - 5) / 50 = 0.3초 이상
+shared = TokenBucket(rate=50.0, capacity=5)
+granted = []
+lock = threading.Lock()
+
+
+def worker():
+    shared.acquire()
+    with lock:
+        granted.append(time.monotonic())
+
+
+started = time.monotonic()
+threads = [threading.Thread(target=worker) for _ in range(20)]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+span = max(granted) - started
+# 임의의 0.1초 구간에 받은 토큰 수 ≤ 버스트 5 + 0.1 × 50 (여유 1)
+worst_window = max(sum(1 for g in granted if s <= g < s + 0.1) for s in granted)
+
+# 4) provider 스트림이 실패해도 예약한 TPM 토큰을 정산 (사용량을 모르면 0으로 보고 환불)
+batch = [make_paper(n) for n in range(3)]
+failing = FailingProvider(after=0)
+failing.limiter = ApiRateLimiter(rpm=600, tpm=100_000)
+try:
+    failing.complete(batch)
+    raised = False
+except RuntimeError:
+    raised = True
+after_error = failing.limiter._tokens._tokens
+partial = FailingProvider(after=3)                # 완성 결과 일부를 받은 뒤 끊김
+partial.limiter = ApiRateLimiter(rpm=600, tpm=100_000)
+partial_items = partial.complete(batch)
+after_partial = partial.limiter._tokens._tokens
+ok = MockProvider(model="mock-ok", estimator=TokenEstimator("mock-ok", CALIBRATION))
+ok.limiter = ApiRateLimiter(rpm=600, tpm=100_000)
+ok.complete(batch)
+after_ok = ok.limiter._tokens._tokens
+
+print(f"버킷: 버스트 대기 {burst} / 6번째 {waited_sixth:.2f}s / 3개 {waited_three:.2f}s")
+print(f"TPM: 큰 요청 후 {after_huge:.0f} → 환불 {after_refund:.0f} → 상한 {after_cap:.0f} → 초과 사용 {after_over:.0f}"
+      f" (다음 대기 {waited_debt:.1f}s)")
+print(f"동시 acquire: 20개 {span:.2f}s / 0.1초 구간 최대 {worst_window}개")
+print(f"스트림 실패 후 TPM {after_error:.0f} / 중단 후 {after_partial:.0f} ({len(partial_items)}편) / 정상 {after_ok:.0f}\n")
+
+checks = [
+    ("버킷은 capacity까지만 쌓임 (버스트 5개만 즉시)",  burst == [0.0] * 5 and abs(waited_sixth - 0.1) < 1e-9),
+    ("여러 토큰은 부족분만큼 대기",                   abs(waited_three - 0.3) < 1e-9),
+    ("TPM보다 큰 요청은 버킷 크기만 예약",             waited_huge == 0.0 and after_huge == 0.0),
+    ("settle: 덜 쓴 만큼 환불",                      abs(after_refund - 600) < 1e-6),
+    ("settle: 환불해도 capacity 이하",               after_cap == 1000),
+    ("settle: 더 쓴 만큼 추가 차감 → 다음 요청 대기",    abs(after_over + 300) < 1e-6 and abs(waited_debt - 78.0) < 1e-6),
+    ("동시 acquire: 전체 속도 제한 유지",             len(granted) == 20 and span >= 0.28 and worst_window <= 11),
+    ("스트림 실패: 예외는 그대로, 예약 토큰은 환불",     raised and after_error == 100_000),
+    ("스트림 중단(일부 결과): 사용량 모르면 환불",       len(partial_items) > 0 and after_partial == 100_000),
+    ("정상 응답: 실제 사용량만큼 차감",               0 < 100_000 - after_ok < 100_000),
+]
+all_pass = True
+for condition, passed in checks:
+    print(f"  {'✅' if passed else '❌'} {condition}")
+    all_pass = all_pass and passed
+
+print(f"\n{'✅ 모든 조건 통과' if all_pass else '❌ 일부 조건 미충족'}")
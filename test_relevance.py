@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""로컬 관련도 모델 테스트 (해시 n-gram 선형 회귀, 합성 데이터, MongoDB 불필요)"""
+
+import random
+import time
+
+import numpy as np
+
+from paper_briefing.relevance import RelevanceModel, featurize
+
+print("=== 로컬 관련도 모델 테스트 ===\n")
+
+rng = random.Random(0)
+ON_TOPIC = ["diffusion policy", "dexterous manipulation", "autonomous driving", "sim-to-real transfer",
+            "vision-language-action model", "runtime safety verification", "trajectory prediction"]
+OFF_TOPIC = ["protein folding", "graph coloring", "stock price forecasting", "music generation",
+             "medical image segmentation", "quantum chemistry", "machine translation"]
+FILLER = ("we propose a novel method that improves performance on standard benchmarks "
+          "with extensive experiments and ablations across several settings").split()
+
+
+def abstract(phrases):
+    words = rng.choices(FILLER, k=140)
+    for phrase in phrases:
+        words.insert(rng.randrange(len(words)), phrase)
+    return " ".join(words)
+
+
+# 과거 LLM 점수 대신: 관련 주제 4~5점, 무관 주제 0~1점
+texts, scores = [], []
+for _ in range(2000):
+    if rng.random() < 0.5:
+        texts.append(abstract(rng.sample(ON_TOPIC, 2)))
+        scores.append(4 + rng.random())
+    else:
+        texts.append(abstract(rng.sample(OFF_TOPIC, 2)))
+        scores.append(rng.random())
+
+train, test = slice(0, 1800), slice(1800, None)
+started = time.perf_counter()
+model = RelevanceModel.fit(texts[train], scores[train])
+fit_seconds = time.perf_counter() - started
+
+y = np.asarray(scores[test])
+pred = model.predict(texts[test])
+mae = float(np.abs(pred - y).mean())
+baseline = float(np.abs(np.mean(scores[train]) - y).mean())
+print(f"학습 {fit_seconds:.1f}s / 검증 MAE {mae:.2f} (평균값 예측 {baseline:.2f})")
+
+ranked = model.predict([
+    "A Diffusion Policy for Dexterous Manipulation\nWe transfer the policy sim-to-real.",
+    "Protein Folding with Transformers\nWe study protein folding and quantum chemistry.",
+])
+print(f"관련 논문 {ranked[0]:.2f}점 / 무관 논문 {ranked[1]:.2f}점")
+
+# 특징 추출: 같은 입력은 항상 같은 특징, 문서 경계를 넘는 바이그램 없음
+a = featurize(["robot policy", "policy robot"])
+b = featurize(["robot policy", "policy robot"])
+one = featurize(["robot policy"])
+boundary = featurize(["robot \x01 policy", "x"])   # 원문에 경계 바이트가 있어도 문서 수 유지
+
+# 처리 속도: 초록 10만 편
+corpus = [abstract(rng.sample(ON_TOPIC + OFF_TOPIC, 2)) for _ in range(100_000)]
+started = time.perf_counter()
+corpus_scores = model.predict(corpus)
+predict_seconds = time.perf_counter() - started
+print(f"초록 10만 편 예측: {predict_seconds:.1f}s\n")
+
+checks = [
+    ("평균값 예측보다 오차 1/3 이하",     mae <= baseline / 3),
+    ("관련 논문 > 무관 논문",           ranked[0] > ranked[1] + 2),
+    ("예측 범위 0~5",                 0.0 <= corpus_scores.min() and corpus_scores.max() <= 5.0),
+    ("같은 입력 → 같은 특징",           all(np.array_equal(x, y) for x, y in zip(a, b))),
+    ("문서별 특징 (단어 2 + 바이그램 1)", np.bincount(a[0]).tolist() == [3, 3]),
+    ("문서 경계를 넘는 바이그램 없음",     np.array_equal(a[1][a[0] == 0], one[1])),
+    ("원문 경계 바이트 무시",            boundary[0].max() == 1 and np.bincount(boundary[0]).tolist() == [3, 1]),
+    ("10만 편 10초 이내",              predict_seconds < 10),
+]
+all_pass = True
+for condition, passed in checks:
+    print(f"  {'✅' if passed else '❌'} {condition}")
+    all_pass = all_pass and passed
+
+print(f"\n{'✅ 모든 조건 통과' if all_pass else '❌ 일부 조건 미충족'}")
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""논문 저장 테스트 - 청크 단위 unordered bulk_write / 청크별 오류 집계 (네트워크·MongoDB 불필요)"""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+from pymongo.errors import BulkWriteError
+
+from paper_briefing import state, storage
+from paper_briefing.arxiv_fetcher import Paper
+from paper_briefing.config import MONGODB_COLLECTION
+from paper_briefing.llm_usage import get_run_usage
+
+FAILING = "2401.00007v1"   # 이 논문이 든 청크는 이 논문 쓰기만 실패
+
+
+class PaperCollection:
+    """id 기준 upsert만 하는 컬렉션 대역 (bulk_write 호출 기록)."""
+
+    def __init__(self, ids=()):
+        self.docs = {pid: {"id": pid} for pid in ids}
+        self.calls = []
+
+    def bulk_write(self, ops, ordered=True):
+        self.calls.append((len(ops), ordered))
+        counts = {"nUpserted": 0, "nMatched": 0, "nModified": 0}
+        errors = []
+        for index, op in enumerate(ops):
+            pid = op._filter["id"]
+            if pid == FAILING:
+                errors.append({"index": index, "code": 2, "errmsg": f"bad document {pid}"})
+                continue
+            if pid in self.docs:
+                counts["nMatched"] += 1
+                counts["nModified"] += 1
+            else:
+                counts["nUpserted"] += 1
+            self.docs[pid] = dict(op._doc["$set"])
+        if errors:
+            raise BulkWriteError({**counts, "writeErrors": errors})
+        return SimpleNamespace(upserted_count=counts["nUpserted"], matched_count=counts["nMatched"],
+                               modified_count=counts["nModified"])
+
+
+def make_paper(n: int) -> Paper:
+    return Paper(
+        id=f"2401.{n:05d}v1", title=f"Paper {n}", abstract="", authors=[], published="2024-01-01",
+        arxiv_url="", pdf_url="", categories=["cs.RO"], summary=f"요약 {n}", score=3.0,
+    )
+
+
+print("=== 논문 저장 테스트 ===\n")
+
+collection = PaperCollection(make_paper(n).id for n in range(3))
+storage._store = storage.MongoStore({MONGODB_COLLECTION: collection})
+stats = state.save_papers((make_paper(n) for n in range(10)), chunk_size=4)
+empty = state.save_papers([])
+saved = collection.docs[make_paper(5).id]
+print(f"\nbulk_write 호출: {collection.calls} / 집계: {stats}\n")
+
+checks = [
+    ("청크 크기만큼 묶어 전송 (4+4+2)",       [size for size, _ in collection.calls] == [4, 4, 2]),
+    ("unordered 실행",                     all(not ordered for _, ordered in collection.calls)),
+    ("신규 / 기존 문서 집계",                stats["upserted"] == 6 and stats["matched"] == 3 and stats["modified"] == 3),
+    ("실패 청크도 나머지 문서는 저장",          stats["failed"] == 1 and make_paper(6).id in collection.docs),
+    ("실패 뒤 다음 청크 계속 저장",            make_paper(9).id in collection.docs),
+    ("저장 문서 필드",                       collection.docs[make_paper(5).id]["summary"] == "요약 5"),
+    ("저장 날짜(Date)·실행 ID",              saved["saved_date"] == datetime.strptime(saved["saved_at"][:10], "%Y-%m-%d")
+                                          and saved["run_id"] == get_run_usage().run_id),
+    ("보낸 논문 수 / 청크 수",                stats["papers"] == 10 and stats["chunks"] == 3),
+    ("빈 목록은 쓰기 없음",                   empty["papers"] == 0 and len(collection.calls) == 3),
+]
+all_pass = True
+for condition, passed in checks:
+    print(f"  {'✅' if passed else '❌'} {condition}")
+    all_pass = all_pass and passed
+
+print(f"\n{'✅ 모든 조건 통과' if all_pass else '❌ 일부 조건 미충족'}")
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""seen 확인 테스트 - 페이지 단위 $in 조회 / 실행 중 추가 / 페이지 콜백
+(로컬 Atom 대역 서버 사용, 네트워크·MongoDB 불필요)"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from paper_briefing import http_cache
+from paper_briefing.arxiv_fetcher import RateLimitedClient
+from paper_briefing.config import MONGODB_COLLECTION
+from paper_briefing.rate_limit import TokenBucket
+from paper_briefing.state import SeenIndex
+from paper_briefing.storage import MongoStore
+
+
+class IdCollection:
+    """`id` 필드만 가진 컬렉션 대역 ($in 조회 / 문서 수)."""
+
+    def __init__(self, ids):
+        self.ids = set(ids)
+        self.finds = []
+
+    def find(self, query, projection=None):
+        wanted = query["id"]["$in"]
+        self.finds.append(len(wanted))
+        return [{"id": pid} for pid in wanted if pid in self.ids]
+
+    def estimated_document_count(self):
+        return len(self.ids)
+
+
+def index(collection) -> SeenIndex:
+    return SeenIndex(MongoStore({MONGODB_COLLECTION: collection}))
+
+
+def page_ids(page: int, size: int = 50):
+    return [f"2401.{page * size + n:05d}v1" for n in range(size)]
+
+
+ENTRY = """<entry>
+  <id>http://arxiv.org/abs/{id}</id>
+  <updated>2024-01-02T00:00:00Z</updated>
+  <published>2024-01-01T00:00:00Z</published>
+  <title>Paper {id}</title>
+  <summary>abstract</summary>
+  <author><name>Author</name></author>
+  <link href="http://arxiv.org/abs/{id}" rel="alternate" type="text/html"/>
+  <arxiv:primary_category term="cs.RO"/>
+  <category term="cs.RO"/>
+</entry>"""
+
+
+class AtomPage(BaseHTTPRequestHandler):
+    """arXiv API 응답 형식(Atom)의 한 페이지 (구형 ID 포함)."""
+
+    ids = page_ids(7)[:2] + ["solv-int/9901001v2"]
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        data = (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/"'
+            ' xmlns:arxiv="http://arxiv.org/schemas/atom">\n'
+            "<title>arXiv Query</title><id>http://arxiv.org/api/test</id><updated>2024-01-02T00:00:00Z</updated>\n"
+            f"<opensearch:totalResults>{len(self.ids)}</opensearch:totalResults>\n"
+            "<opensearch:startIndex>0</opensearch:startIndex>\n"
+            f"<opensearch:itemsPerPage>{len(self.ids)}</opensearch:itemsPerPage>\n"
+            + "\n".join(ENTRY.format(id=pid) for pid in self.ids)
+            + "\n</feed>"
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/atom+xml")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+print("=== seen 확인 테스트 ===\n")
+
+# 1) 페이지마다 한 번의 $in 조회 → 후보별 in 검사는 조회 없이
+small = IdCollection(page_ids(0)[::2])
+seen = index(small)
+seen.prefetch(page_ids(0))
+hits = [pid in seen for pid in page_ids(0)]
+seen.add("2401.99999v1")
+
+# 2) prefetch를 거치지 않은 ID는 한 건씩 확인
+outside = "2401.00001v1" in index(small), page_ids(0)[0] in index(small)
+
+# 3) 누적 논문 수와 무관한 조회 비용: 작은 컬렉션 vs 큰 컬렉션에서 같은 조회 수·크기
+big = IdCollection(f"2301.{n:05d}v1" for n in range(200_000))
+big_seen = index(big)
+started = time.monotonic()
+for page in range(4):
+    big_seen.prefetch(page_ids(page))
+    [pid in big_seen for pid in page_ids(page)]
+big_elapsed = time.monotonic() - started
+
+# 4) RateLimitedClient: 실제 Atom 응답을 파싱한 페이지마다 on_page(ID 목록) 호출
+http_cache.configure(ttl=0)
+server = ThreadingHTTPServer(("127.0.0.1", 0), AtomPage)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+pages = []
+client = RateLimitedClient(TokenBucket(rate=1000.0, capacity=1000), on_page=pages.append)
+client._parse_feed(f"http://127.0.0.1:{server.server_port}/api/query?search_query=test&start=0&max_results=3")
+server.shutdown()
+print(f"조회: 작은 컬렉션 {small.finds} / 큰 컬렉션 {big.finds} ({big_elapsed * 1000:.1f}ms)\n")
+
+checks = [
+    ("저장된 ID만 seen",                  hits == [n % 2 == 0 for n in range(50)]),
+    ("페이지당 $in 조회 1회",               small.finds == [50, 1, 1]),
+    ("실행 중 add한 ID는 조회 없이 seen",     "2401.99999v1" in seen and len(small.finds) == 3),
+    ("prefetch 밖의 ID는 한 건씩 확인",       outside == (False, True)),
+    ("누적 수와 무관한 조회 수·크기",         big.finds == [50] * 4),
+    ("len = 저장된 논문 수",                len(big_seen) == 200_000),
+    ("페이지마다 on_page(ID 목록)",          pages == [AtomPage.ids]),
+]
+all_pass = True
+for condition, passed in checks:
+    print(f"  {'✅' if passed else '❌'} {condition}")
+    all_pass = all_pass and passed
+
+print(f"\n{'✅ 모든 조건 통과' if all_pass else '❌ 일부 조건 미충족'}")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""arXiv 스냅샷 적재 파서 테스트 (JSON lines / OAI-PMH XML, MongoDB 불필요)"""
+
+import gzip
+import json
+import os
+import tempfile
+
+from paper_briefing.snapshot_ingest import iter_papers
+
+JSON_RECORDS = [
+    {   # 통과: cs.RO + "diffusion policy" / "sim-to-real"
+        "id": "2401.00001",
+        "title": "Diffusion Policies\n  for Sim-to-Real Transfer",
+        "abstract": "  We train a diffusion policy in simulation and transfer it\nsim to real. ",
+        "categories": "cs.RO cs.LG",
+        "comments": "Accepted at CoRL 2024",
+        "journal-ref": None,
+        "authors_parsed": [["Kim", "Minsu", ""], ["Lee", "Jae", ""], ["Park", "S.", ""], ["Choi", "H.", ""]],
+        "versions": [{"version": "v1", "created": "Mon, 1 Jan 2024 10:00:00 GMT"},
+                     {"version": "v2", "created": "Fri, 2 Feb 2024 10:00:00 GMT"}],
+    },
+    {   # 탈락: 키워드 없음
+        "id": "2401.00002", "title": "Graph Theory", "abstract": "We study graphs.",
+        "categories": "cs.LG", "versions": [{"version": "v1", "created": "Mon, 1 Jan 2024 10:00:00 GMT"}],
+    },
+    {   # 탈락: 카테고리 불일치 (줄 단위 사전 필터에서 JSON 파싱 전에 걸러짐)
+        "id": "2401.00003", "title": "Driving", "abstract": "autonomous driving in physics",
+        "categories": "physics.soc-ph", "versions": [{"version": "v1", "created": "Mon, 1 Jan 2024 10:00:00 GMT"}],
+    },
+]
+
+OAI_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/">
+<ListRecords>
+<record><header><identifier>oai:arXiv.org:2402.00010</identifier></header>
+<metadata><arXiv xmlns="http://arxiv.org/OAI/arXiv/">
+<id>2402.00010</id><created>2024-02-01</created>
+<authors><author><keyname>Doe</keyname><forenames>Jane</forenames></author></authors>
+<title>End-to-End Driving with OOD Detection</title>
+<categories>cs.CV cs.AI</categories>
+<journal-ref>CVPR 2024 Workshop</journal-ref>
+<abstract>An end-to-end driving model with out-of-distribution detection.</abstract>
+</arXiv></metadata></record>
+<record><header status="deleted"><identifier>oai:arXiv.org:2402.00011</identifier></header></record>
+<record><header><identifier>oai:arXiv.org:2402.00012</identifier></header>
+<metadata><arXivRaw xmlns="http://arxiv.org/OAI/arXivRaw/">
+<id>2402.00012</id>
+<version version="v1"><date>Sat, 3 Feb 2024 09:00:00 GMT</date></version>
+<version version="v3"><date>Sun, 4 Feb 2024 09:00:00 GMT</date></version>
+<title>VLA Models</title><authors>A. One, B. Two and C. Three</authors>
+<categories>cs.RO</categories>
+<abstract>A vision-language-action model.</abstract>
+</arXivRaw></metadata></record>
+<resumptionToken cursor="0" completeListSize="3"></resumptionToken>
+</ListRecords>
+</OAI-PMH>
+"""
+
+print("=== arXiv 스냅샷 적재 파서 테스트 ===\n")
+
+with tempfile.TemporaryDirectory() as tmp:
+    json_path = os.path.join(tmp, "snapshot.json.gz")
+    with gzip.open(json_path, "wt", encoding="utf-8") as f:
+        for rec in JSON_RECORDS:
+            f.write(json.dumps(rec) + "\n")
+    xml_path = os.path.join(tmp, "oai.xml")
+    with open(xml_path, "w", encoding="utf-8") as f:
+        f.write(OAI_XML)
+
+    stats = {}
+    papers = {p.id: p for p in iter_papers([json_path, xml_path], stats)}
+
+for pid, p in papers.items():
+    print(f"  {pid}: {p.title} / {p.published} / {p.authors} / {p.conference} {p.venue_status} / {p.topics}")
+print(f"\n통계: {stats}\n")
+
+a = papers.get("2401.00001v2")
+b = papers.get("2402.00010")
+c = papers.get("2402.00012v3")
+checks = [
+    ("조건 통과 논문만 (3편)",            len(papers) == 3),
+    ("카테고리 사전 필터로 파싱 생략",     stats.get("read") == 4),
+    ("최신 버전 포함 ID / v1 제출일",      a is not None and a.published == "2024-01-01"),
+    ("제목·초록 공백 정리",               a is not None and a.title == "Diffusion Policies for Sim-to-Real Transfer"),
+    ("저자 최대 3명 (이름 성 순서)",       a is not None and a.authors == ["Minsu Kim", "Jae Lee", "S. Park"]),
+    ("comment에서 학회 추출",             a is not None and a.conference == "CoRL" and a.venue_year == 2024),
+    ("주제 태깅 (하이픈 무시)",            a is not None and a.topics == ["Manipulation", "Sim"]),
+    ("OAI arXiv 형식 + 워크숍 상태",       b is not None and b.conference == "CVPR" and b.venue_status == "workshop"),
+    ("OAI 삭제 레코드 제외",              "2402.00011" not in papers),
+    ("OAI arXivRaw 형식 저자 분리",        c is not None and c.authors == ["A. One", "B. Two", "C. Three"]),
+    ("arXivRaw v1 날짜",                 c is not None and c.published == "2024-02-03"),
+]
+all_pass = True
+for condition, passed in checks:
+    print(f"  {'✅' if passed else '❌'} {condition}")
+    all_pass = all_pass and passed
+
+print(f"\n{'✅ 모든 조건 통과' if all_pass else '❌ 일부 조건 미충족'}")
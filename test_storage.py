@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""저장소 백엔드 테스트 - MongoDB / SQLite(WAL)가 같은 조건을 통과하는지 확인 (saved_date 이전 포함)
+
+SQLite와 MongoStore(mongomock, requirements-dev.txt)는 항상 같은 조건을 실행합니다.
+MONGODB_URI 서버에 연결되면 실제 서버의 임시 DB에서도 실행하고,
+STORAGE_TEST_MONGO=1이면 서버 연결 실패를 건너뛰지 않고 실패로 처리합니다 (CI용).
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+
+import mongomock
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from pymongo import MongoClient  # noqa: E402
+from pymongo.errors import PyMongoError  # noqa: E402
+
+from paper_briefing.config import MONGODB_URI  # noqa: E402
+from paper_briefing.db import ensure_indexes  # noqa: E402
+from paper_briefing.storage import MongoStore, SqliteStore, saved_day  # noqa: E402
+
+
+def doc(n: int, day: str, score: float, **extra) -> dict:
+    return {
+        "id": f"2401.{n:05d}v1", "title": f"Diffusion Policy {n}" if n % 2 else f"Driving World Model {n}",
+        "abstract": "abstract", "summary": f"요약 {n}", "tags": ["VLA"] if n % 2 else ["AD"],
+        "score": score, "citation_count": n, "published": f"2024-01-{n + 1:02d}",
+        "conference": "CoRL" if n % 3 == 0 else "", "keyword_hits": {"policy": 1},
+        "saved_at": f"{day}T09:00:0{n % 10}", "saved_date": saved_day(day), **extra,
+    }
+
+
+def legacy_doc(n: int, saved_at: str) -> dict:
+    """saved_date 없이 저장된 예전 문서."""
+    old = doc(n, "", 2.0 + n / 10, saved_at=saved_at)
+    del old["saved_date"]
+    return old
+
+
+def run_suite(store) -> list:
+    first = store.upsert_papers([
+        doc(0, "2024-03-01", 4.0), doc(1, "2024-03-01", 2.0), doc(2, "2024-03-02", 5.0), doc(3, "2024-03-02", 1.0),
+    ])
+    store.add_ref(doc(1, "", 0)["id"], {"ref_id": "r1", "url": "https://example.com"})
+    # 재저장: 다른 필드(refs)는 유지, 하위 문서는 통째로 교체 ($set과 같게)
+    second = store.upsert_papers([doc(1, "2024-03-03", 3.5, keyword_hits={"diffusion": 2}), doc(4, "2024-03-03", 4.5)])
+    kept = store.get_paper(doc(1, "", 0)["id"])
+    # 같은 논문을 그대로 다시 저장하면 바뀐 문서 없음
+    same = store.upsert_papers([doc(1, "2024-03-03", 3.5, keyword_hits={"diffusion": 2})])
+
+    rollups = store.date_rollups()
+    by_day = {r["_id"]: r for r in rollups}
+    on_day = [p["id"] for p in store.papers_on_date("2024-03-02")]
+    search_q = [p["id"] for p in store.search("diffusion POLICY")]
+    search_tag = [p["id"] for p in store.search(tag="AD", sort_by="citation")]
+    search_conf = [p["id"] for p in store.search(conf="CoRL", sort_by="published")]
+    refs_after_delete = store.delete_ref(doc(1, "", 0)["id"], "r1")
+    seen, count = store.seen_ids([doc(n, "", 0)["id"] for n in (0, 4, 9)]), store.count_papers()
+
+    # 예전 문서 이전: saved_date를 배치로 채우기 (날짜를 읽을 수 없는 문서는 날짜별 목록에서 제외)
+    store.upsert_papers([legacy_doc(5, "2024-03-04T08:00:00"), legacy_doc(6, "2024-03-04T10:00:00"),
+                         legacy_doc(7, "unknown")])
+    hidden = store.papers_on_date("2024-03-04")
+    filled, refilled = store.backfill_saved_date(batch_size=2), store.backfill_saved_date()
+    migrated = [p["id"] for p in store.papers_on_date("2024-03-04")]
+    migrated_days = [r["_id"] for r in store.date_rollups()]
+
+    toggled = [store.toggle_bookmark(doc(2, "", 0)["id"]), store.toggle_bookmark(doc(4, "", 0)["id"]),
+               store.toggle_bookmark(doc(2, "", 0)["id"])]
+    marks = store.bookmarks()
+    ids = lambda *ns: [doc(n, "", 0)["id"] for n in ns]  # noqa: E731
+
+    return [
+        ("upsert 집계 (신규 / 기존)",        (first["upserted"], second["upserted"], second["matched"]) == (4, 1, 1)),
+        ("바뀐 문서만 modified",              second["modified"] == 1
+                                           and (same["upserted"], same["matched"], same["modified"]) == (0, 1, 0)),
+        ("seen 확인",                       seen == set(ids(0, 4))),
+        ("논문 수",                          count == 5),
+        ("재저장 시 refs 유지",               [r["ref_id"] for r in kept.get("refs", [])] == ["r1"]),
+        ("재저장 시 하위 문서 교체",            kept["keyword_hits"] == {"diffusion": 2} and kept["score"] == 3.5),
+        ("날짜별 집계 (최신 날짜 먼저)",        [r["_id"] for r in rollups] == ["2024-03-03", "2024-03-02", "2024-03-01"]),
+        ("날짜별 수·평균 점수·학회지 수",        (by_day["2024-03-03"]["count"], by_day["2024-03-03"]["avg_score"],
+                                           by_day["2024-03-02"]["conf_count"]) == (2, 4.0, 1)),
+        ("날짜별 목록 (점수 높은 순)",          on_day == ids(2, 3)),
+        ("이전 전 예전 문서는 날짜 조회에 없음",    hidden == []),
+        ("saved_date 배치 이전 (다시 실행 시 0)",  (filled, refilled) == (3, 0)),
+        ("이전 후 날짜별 목록·집계",             migrated == ids(6, 5) and migrated_days[0] == "2024-03-04"
+                                           and len(migrated_days) == 4),
+        ("검색: 대소문자 무시 정규식",          search_q == ids(1, 3)),
+        ("검색: 태그 필터 + 인용수 정렬",       search_tag == ids(4, 2, 0)),
+        ("검색: 학회 필터 + 출판일 정렬",       search_conf == ids(3, 0)),
+        ("참조 링크 삭제",                    refs_after_delete == []),
+        ("북마크 토글",                       toggled == [True, True, False] and set(marks) == set(ids(4))),
+        ("북마크 수",                         store.count_bookmarks() == 1),
+        ("논문 전체 삭제",                    store.reset_papers() == 8 and store.count_papers() == 0),
+    ]
+
+
+print("=== 저장소 백엔드 테스트 ===\n")
+
+all_pass = True
+mock_db = mongomock.MongoClient()["paper_briefing_storage_test"]
+ensure_indexes(mock_db)
+stores = {
+    "sqlite": SqliteStore(os.path.join(tempfile.mkdtemp(), "papers.db")),
+    "mongo (mongomock)": MongoStore(mock_db),
+}
+client = MongoClient(MONGODB_URI, serverSelectionTimeoutMS=1000)
+try:
+    client.admin.command("ping")
+    test_db = client["paper_briefing_storage_test"]
+    client.drop_database(test_db.name)
+    ensure_indexes(test_db)
+    stores["mongo (server)"] = MongoStore(test_db)
+except PyMongoError as e:
+    required = os.getenv("STORAGE_TEST_MONGO") == "1"
+    print(f"[mongo (server)] 서버 연결 안 됨 → {'❌ 실패' if required else '건너뜀'} ({type(e).__name__})\n")
+    all_pass = not required
+
+for name, store in stores.items():
+    print(f"[{name}]")
+    try:
+        results = run_suite(store)
+    except Exception as e:   # 예: mongomock과 맞지 않는 pymongo 버전 (requirements.txt 참고)
+        results = [(f"실행 오류 {type(e).__name__}: {e}", False)]
+    for condition, passed in results:
+        print(f"  {'✅' if passed else '❌'} {condition}")
+        all_pass = all_pass and passed
+    store.close()
+if "mongo (server)" in stores:
+    client.drop_database("paper_briefing_storage_test")
+
+# saved_date 열이 없던 예전 SQLite 파일: 열·인덱스 추가 후 이전
+old_path = os.path.join(tempfile.mkdtemp(), "old.db")
+with sqlite3.connect(old_path) as old:
+    old.execute("CREATE TABLE papers (id TEXT PRIMARY KEY, saved_at TEXT NOT NULL DEFAULT '', score REAL,"
+                " citation_count INTEGER, published TEXT, conference TEXT, doc TEXT NOT NULL)")
+    old_doc = legacy_doc(8, "2024-02-29T23:59:59")
+    old.execute("INSERT INTO papers (id, saved_at, score, doc) VALUES (?, ?, ?, ?)",
+                (old_doc["id"], old_doc["saved_at"], old_doc["score"], json.dumps(old_doc)))
+old.close()
+reopened = SqliteStore(old_path)
+old_filled = reopened.backfill_saved_date()
+old_day = reopened.papers_on_date("2024-02-29")
+plan = " ".join(row[-1] for row in reopened._conn().execute(
+    "EXPLAIN QUERY PLAN SELECT doc FROM papers WHERE saved_date = ? ORDER BY score DESC", ("2024-02-29",)))
+reopened.close()
+print(f"[sqlite 예전 파일] 이전 {old_filled}편 / 조회 계획: {plan}")
+for condition, passed in [
+    ("예전 파일 열 추가 후 이전",      old_filled == 1 and [p["saved_date"] for p in old_day] == ["2024-02-29"]),
+    ("날짜 조회가 복합 인덱스 사용",    "papers_saved_date_score" in plan and "TEMP B-TREE" not in plan),
+]:
+    print(f"  {'✅' if passed else '❌'} {condition}")
+    all_pass = all_pass and passed
+
+print(f"\n{'✅ 모든 조건 통과' if all_pass else '❌ 일부 조건 미충족'}")
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""토큰 예산 배치 테스트 - pack_batches 예산 준수·고른 분할·예산 초과 논문 단독 배치 /
+TokenEstimator EMA 보정 수렴·저장 (네트워크·MongoDB 불필요)"""
+
+import os
+import random
+import tempfile
+from types import SimpleNamespace
+
+from paper_briefing.arxiv_fetcher import Paper
+from paper_briefing.config import TRIAGE_BATCH, TRIAGE_CONTEXT_TOKENS, TRIAGE_LATENCY_SLO, TRIAGE_MAX_OUTPUT_TOKENS
+from paper_briefing.token_budget import _SAFETY, TokenEstimator, pack_batches
+
+CALIBRATION = os.path.join(tempfile.mkdtemp(), "calibration.json")
+FIXED = 1200   # 시스템 프롬프트 등 요청마다 고정된 입력 토큰
+BUDGET = TRIAGE_CONTEXT_TOKENS * _SAFETY
+
+
+def make_paper(n: int, chars: int) -> Paper:
+    return Paper(
+        id=f"2401.{n:05d}v1", title=f"Paper {n}", abstract="x" * chars,
+        authors=[], published="2024-01-01", arxiv_url="", pdf_url="", categories=["cs.RO"],
+    )
+
+
+def prompt_of(p: Paper) -> str:
+    return f"[{p.id}] {p.title}\n{p.abstract}"
+
+
+def violations(batches, estimator, max_papers=TRIAGE_BATCH):
+    """예산을 넘는 배치 목록 (논문 1편짜리 배치는 더 나눌 수 없으므로 예외)."""
+    bad = []
+    for b in batches:
+        inputs = sum(estimator.input_tokens(prompt_of(p)) for p in b)
+        out = estimator.output_per_paper * len(b)
+        if len(b) > 1 and (len(b) > max_papers or out > estimator.max_output_tokens()
+                           or FIXED + inputs + out > BUDGET):
+            bad.append([p.id for p in b])
+    return bad
+
+
+def flatten(batches):
+    return [p.id for b in batches for p in b]
+
+
+print("=== 토큰 예산 배치 테스트 ===\n")
+
+# 1) 길이가 제각각인 논문: 모든 배치가 예산 안, 순서·누락 없이 전부 포함
+estimator = TokenEstimator("budget-test", CALIBRATION)
+rng = random.Random(7)
+mixed = [make_paper(n, rng.choice([800, 4_000, 40_000, 120_000])) for n in range(60)]
+mixed_batches = pack_batches(mixed, prompt_of, estimator, FIXED)
+
+# 2) 짧은 논문만: 출력 상한(논문 수)으로 나뉘고, 같은 요청 수 안에서 크기를 고르게
+per_request = int(estimator.max_output_tokens() // estimator.output_per_paper)
+small = [make_paper(n, 800) for n in range(2 * per_request + 3)]
+small_batches = pack_batches(small, prompt_of, estimator, FIXED)
+small_sizes = [len(b) for b in small_batches]
+
+# 3) 예산보다 큰 논문 1편: 혼자 한 배치, 앞뒤 논문은 다른 배치에
+huge = make_paper(999, int(BUDGET * 4.5))
+around = [make_paper(n, 800) for n in range(3)] + [huge] + [make_paper(n, 800) for n in range(3, 6)]
+around_batches = pack_batches(around, prompt_of, estimator, FIXED)
+huge_batch = next(b for b in around_batches if huge in b)
+
+# 4) max_papers 제한
+capped = pack_batches(small[:10], prompt_of, estimator, FIXED, max_papers=3)
+
+# 5) EMA 보정: 실제 입력 = 추정 × 1.3, 논문당 출력 200토큰, 출력 속도 40토큰/초로 수렴
+calibrated = TokenEstimator("calibrate-test", CALIBRATION)
+raw, n_papers = 20_000, 8
+for _ in range(30):
+    usage = SimpleNamespace(prompt_tokens=int(raw * 1.3), completion_tokens=200 * n_papers)
+    calibrated.observe(raw, n_papers, usage, latency=200 * n_papers / 40)
+calibrated.observe(raw, n_papers, None, latency=99.0)   # usage 없으면 응답 시간만 기록
+calibrated.save()
+reloaded = TokenEstimator("calibrate-test", CALIBRATION)
+slo_cap = int(min(TRIAGE_MAX_OUTPUT_TOKENS, TRIAGE_LATENCY_SLO * 40) * _SAFETY)
+calibrated_batches = pack_batches(small, prompt_of, calibrated, FIXED)
+
+# 6) 이상치 응답 시간(캐시 응답 등)은 출력 속도를 허용 범위 안에서만 움직임
+outlier = TokenEstimator("outlier-test", CALIBRATION)
+for _ in range(30):
+    outlier.observe(raw, n_papers, SimpleNamespace(prompt_tokens=raw, completion_tokens=1600), latency=0.001)
+
+print(f"혼합 {len(mixed)}편 → {len(mixed_batches)}배치 {[len(b) for b in mixed_batches]}")
+print(f"짧은 논문 {len(small)}편 (요청당 최대 {per_request}편) → {small_sizes}")
+print(f"예산 초과 논문 주변 → {[len(b) for b in around_batches]}")
+print(f"보정: input_ratio {calibrated.input_ratio:.3f} / 논문당 출력 {calibrated.output_per_paper:.1f}"
+      f" / 출력 속도 {calibrated.output_tps:.1f} → 재로드 {reloaded.input_ratio:.3f}, {reloaded.output_tps:.1f}"
+      f" / 보정 후 {[len(b) for b in calibrated_batches]}")
+print(f"이상치 출력 속도: {outlier.output_tps:.1f}\n")
+
+checks = [
+    ("모든 배치가 토큰 예산 안",                 not violations(mixed_batches, estimator)),
+    ("논문 순서 유지, 누락·중복 없음",            flatten(mixed_batches) == [p.id for p in mixed]),
+    ("최소 요청 수 + 고른 배치 크기",             len(small_batches) == 3 and max(small_sizes) - min(small_sizes) <= 1
+                                                and not violations(small_batches, estimator)),
+    ("예산보다 큰 논문은 단독 배치",              huge_batch == [huge] and flatten(around_batches) == [p.id for p in around]),
+    ("예산 초과 논문 주변도 예산 안",             not violations(around_batches, estimator)),
+    ("max_papers 이하",                         max(len(b) for b in capped) <= 3 and len(capped) == 4),
+    ("EMA: 입력 비율 수렴 (1.3)",                abs(calibrated.input_ratio - 1.3) < 0.01),
+    ("EMA: 논문당 출력 수렴 (200)",              abs(calibrated.output_per_paper - 200) < 1),
+    ("EMA: 출력 속도 수렴 → 출력 상한 반영",       abs(calibrated.output_tps - 40) < 0.5
+                                                and calibrated.max_output_tokens() == slo_cap),
+    ("usage 없으면 보정 생략, 응답 시간만 기록",    calibrated.observations == 30 and calibrated.latencies[-1] == 99.0),
+    ("보정값 저장 후 다음 실행에 이어짐",           abs(reloaded.input_ratio - calibrated.input_ratio) < 1e-3
+                                                and abs(reloaded.output_tps - calibrated.output_tps) < 0.1
+                                                and reloaded.observations == 30),
+    ("보정 후 배치도 예산 안",                    not violations(calibrated_batches, calibrated)),
+    ("이상치 응답 시간은 허용 범위로 제한",         outlier.output_tps <= 500.0),
+]
+all_pass = True
+for condition, passed in checks:
+    print(f"  {'✅' if passed else '❌'} {condition}")
+    all_pass = all_pass and passed
+
+print(f"\n{'✅ 모든 조건 통과' if all_pass else '❌ 일부 조건 미충족'}")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Batch API 트리아지 프로토콜 테스트 (로컬 대역 서버 사용, 네트워크·MongoDB 불필요)"""
+
+import json
+import os
+import tempfile
+
+from openai import OpenAI
+
+from paper_briefing.arxiv_fetcher import Paper
+from paper_briefing.batch_server import LocalBatchServer, mock_triage
+from paper_briefing.triage import _apply_results, _merge_results
+from paper_briefing.triage_batch import (
+    iter_batch_results,
+    submit_batch_file,
+    wait_for_batch,
+    write_batch_file,
+)
+
+
+def make_paper(n: int, abstract: str) -> Paper:
+    return Paper(
+        id=f"2401.{n:05d}v1", title=f"Paper {n}", abstract=abstract, authors=[],
+        published="2024-01-01", arxiv_url="", pdf_url="", categories=["cs.RO"],
+    )
+
+
+papers = [make_paper(n, "A diffusion policy for dexterous manipulation, trained in simulation.") for n in range(7)]
+papers.append(make_paper(7, "An end-to-end driving model with out-of-distribution detection."))
+batches = [papers[0:3], papers[3:6], papers[6:8]]
+FAILING = papers[4].id   # 이 논문이 든 요청은 대역 서버가 실패 처리
+
+
+def responder(body):
+    if FAILING in body["messages"][1]["content"]:
+        return None
+    return mock_triage(body)
+
+
+print("=== Batch API 트리아지 테스트 ===\n")
+
+path = os.path.join(tempfile.mkdtemp(), "triage.jsonl")
+requests = write_batch_file(batches, path)
+with open(path, encoding="utf-8") as f:
+    lines = [json.loads(line) for line in f]
+print(f"요청 파일: {len(lines)}줄 → {requests}\n")
+
+statuses = []
+with LocalBatchServer(responder=responder, polls=3) as server:
+    client = OpenAI(api_key="local", base_url=server.base_url)
+    created = submit_batch_file(client, path, {"source": "test"})
+    statuses.append(created.status)
+    done = wait_for_batch(client, created.id, interval=0.01)
+    statuses.append(done.status)
+
+    stats = {"failed": 0}
+    results = list(iter_batch_results(client, done, stats))
+
+got_ids = [pid for custom_id, _ in results for pid in requests[custom_id]]
+_apply_results(papers, _merge_results([items for _, items in results]), warn=False)
+print(f"\n상태: {statuses} / 성공 요청 {len(results)}개 / 실패 {stats['failed']}개")
+for p in papers:
+    print(f"  {p.id}: {p.summary or '(결과 없음)'} {p.tags} {p.score}")
+
+checks = [
+    ("요청 1줄 = 배치 1개",                len(lines) == len(batches)),
+    ("요청 형식 (custom_id/url/body)",     all(l["url"] == "/v1/chat/completions" and l["body"]["messages"] for l in lines)),
+    ("요청 ID → 논문 ID 목록",             requests["req-00002"] == [papers[6].id, papers[7].id]),
+    ("validating → completed 상태 확인",  statuses == ["validating", "completed"]),
+    ("성공 요청 결과만 스트리밍",            [c for c, _ in results] == ["req-00000", "req-00002"]),
+    ("실패 요청은 오류 파일로 집계",          stats["failed"] == 1),
+    ("결과를 논문에 반영",                  papers[7].summary == "[mock] Paper 7" and papers[7].tags == ["AD", "Safety"]),
+    ("실패 요청의 논문은 비워 둠 (재제출 대상)", all(not p.summary for p in papers[3:6])),
+    ("성공 논문 수",                       len(got_ids) == 5 and all(p.summary for p in papers if p.id in got_ids)),
+]
+all_pass = True
+for condition, passed in checks:
+    print(f"  {'✅' if passed else '❌'} {condition}")
+    all_pass = all_pass and passed
+
+print(f"\n{'✅ 모든 조건 통과' if all_pass else '❌ 일부 조건 미충족'}")
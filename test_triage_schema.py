@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""트리아지 구조화 출력 테스트 - 응답 스키마 / 결과 검증 / ID 불일치 매칭 (네트워크 불필요)"""
+
+import json
+import os
+import tempfile
+
+from paper_briefing.arxiv_fetcher import Paper
+from paper_briefing.providers import MockProvider
+from paper_briefing.token_budget import TokenEstimator
+from paper_briefing.triage import (
+    _TAGS, _ResultMatcher, _apply_results, _chat_request, _merge_results, _triage_batch, _unmatched,
+)
+
+CALIBRATION = os.path.join(tempfile.mkdtemp(), "calibration.json")
+
+
+def make_paper(n: int) -> Paper:
+    return Paper(
+        id=f"2401.{n:05d}v1", title=f"Learning Policy Number {n}",
+        abstract="A diffusion policy for dexterous manipulation.",
+        authors=[], published="2024-01-01", arxiv_url="", pdf_url="", categories=["cs.RO"],
+    )
+
+
+print("=== 트리아지 구조화 출력 테스트 ===\n")
+
+batch = [make_paper(n) for n in range(5)]
+
+# 1) 요청 스키마: 배치 ID / _TAGS enum, strict
+request = _chat_request(batch)
+fmt = request["response_format"]
+item_schema = fmt["json_schema"]["schema"]["properties"]["papers"]["items"]
+
+# 2) 검증·매칭: 버전 누락, 오타(위치), id 자리의 제목, 잘못된 태그·점수, 요약 없음, 중복
+items = [
+    {"id": "2401.00000", "summary": "버전 번호 없음", "tags": ["VLA", "Robotics", "VLA"], "score": 7},
+    {"id": "2401.0001", "summary": "오타 → 위치로 매칭", "tags": ["AD"], "score": "3.5"},
+    {"id": "Learning policy number 2!", "summary": "제목으로 매칭", "tags": [], "score": -1},
+    {"id": "2401.00003v1", "summary": "", "tags": ["Sim"], "score": 2},
+    {"id": "2401.00000v1", "summary": "중복", "tags": [], "score": 1},
+    {"id": "2401.00004v1", "summary": "정상", "tags": ["Safety"], "score": 4},
+]
+matcher = _ResultMatcher(batch)
+matched = {r["id"]: r for r in matcher.match_all(items)}
+print(f"매칭: {sorted(matched)} / 제목·위치 {matcher.rescued}편, 버림 {matcher.dropped}개")
+
+# 3) ID를 어긋나게 돌려주는 provider도 재요청 없이 전체 결과 확보
+requests = []
+
+
+class SloppyProvider(MockProvider):
+    def _stream(self, batch, user_msg):
+        requests.append(len(batch))
+        raw = json.loads("".join(part for part in super()._stream(batch, user_msg) if isinstance(part, str)))
+        for n, item in enumerate(raw["papers"]):
+            item["id"] = item["id"][:-2] if n % 2 else f"paper-{n}"   # 버전 누락 / 엉뚱한 ID
+        yield json.dumps(raw)
+
+
+sloppy = SloppyProvider(model="sloppy", estimator=TokenEstimator("sloppy", CALIBRATION))
+results = _triage_batch(sloppy.complete, batch, sloppy.name, "batch 1")
+print(f"요청 논문 수: {requests}\n")
+
+# 3) 카테고리에 'v'가 들어간 구형 ID: 버전만 떼고 매칭 (다른 논문과 섞이지 않음)
+old_style = [Paper(id=f"solv-int/990100{n}v2", title=f"Soliton {n}", abstract="", authors=[], published="1999-01-01",
+                   arxiv_url="", pdf_url="", categories=["nlin.SI"]) for n in (1, 2)]
+old_items = [{"id": "solv-int/9901001", "summary": "구형 ID", "tags": [], "score": 3}]
+old_missing = _unmatched(old_style, old_items)
+_apply_results(old_style, _merge_results([old_items]), warn=False)
+
+checks = [
+    ("json_schema strict 모드",              fmt["type"] == "json_schema" and fmt["json_schema"]["strict"]),
+    ("id enum = 배치 ID",                   item_schema["properties"]["id"]["enum"] == [p.id for p in batch]),
+    ("tags enum = _TAGS",                   item_schema["properties"]["tags"]["items"]["enum"] == _TAGS),
+    ("필수 필드 / 추가 필드 금지",              item_schema["required"] == ["id", "summary", "tags", "score"]
+                                            and item_schema["additionalProperties"] is False),
+    ("버전 번호 없는 ID 매칭",                 matched[batch[0].id]["summary"] == "버전 번호 없음"),
+    ("오타 ID → 위치로 매칭",                  matched[batch[1].id]["summary"] == "오타 → 위치로 매칭"),
+    ("id 자리의 제목 → 제목으로 매칭",          matched[batch[2].id]["summary"] == "제목으로 매칭"),
+    ("요약 없는 결과 버림",                    batch[3].id not in matched),
+    ("중복 결과는 처음 것만",                   matched[batch[0].id]["score"] == 5.0),
+    ("태그는 _TAGS만, 중복 제거",               matched[batch[0].id]["tags"] == ["VLA"]),
+    ("점수 숫자 변환·0~5 제한",                 matched[batch[1].id]["score"] == 3.5 and matched[batch[2].id]["score"] == 0.0),
+    ("매칭·버림 집계",                        matcher.rescued == 2 and matcher.dropped == 2),
+    ("구형 ID 버전 없이 매칭",                  old_style[0].summary == "구형 ID" and old_style[1].summary == ""),
+    ("구형 ID 미매칭 논문은 재시도 대상",          old_missing == [old_style[1]]),
+    ("ID 불일치 응답도 재요청 없음",             requests == [5] and {r["id"] for r in results} == {p.id for p in batch}),
+]
+all_pass = True
+for condition, passed in checks:
+    print(f"  {'✅' if passed else '❌'} {condition}")
+    all_pass = all_pass and passed
+
+print(f"\n{'✅ 모든 조건 통과' if all_pass else '❌ 일부 조건 미충족'}")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""트리아지 응답 증분 파싱 테스트 - 조각 단위 파싱 / 잘린·깨진 응답 / 누락 논문만 재시도 (네트워크 불필요)"""
+
+import json
+import os
+import tempfile
+import time
+
+from paper_briefing.arxiv_fetcher import Paper
+from paper_briefing.json_stream import JsonItemStream
+from paper_briefing.providers import MockProvider
+from paper_briefing.token_budget import TokenEstimator
+from paper_briefing.triage import _triage_batch
+
+CALIBRATION = os.path.join(tempfile.mkdtemp(), "calibration.json")
+
+
+def make_paper(n: int) -> Paper:
+    return Paper(
+        id=f"2401.{n:05d}v1", title=f"Paper {n}", abstract="A diffusion policy for dexterous manipulation.",
+        authors=[], published="2024-01-01", arxiv_url="", pdf_url="", categories=["cs.RO"],
+    )
+
+
+def parse(text: str, size: int):
+    stream = JsonItemStream()
+    items = []
+    for i in range(0, len(text), size):
+        items += stream.feed(text[i:i + size])
+    return items, stream
+
+
+print("=== 트리아지 응답 증분 파싱 테스트 ===\n")
+
+# 1) 조각 크기와 무관하게 json.loads와 같은 결과 (문자열 안의 괄호·따옴표·이스케이프 포함)
+expected = [
+    {"id": "2401.00001", "summary": "중괄호 } 와 대괄호 ] 를 포함한 \"요약\" \\ 끝", "tags": ["VLA", "Sim"], "score": 4.5},
+    {"id": "2401.00002", "summary": "nested {\"a\": [1, 2]}", "tags": [], "score": 1},
+    {"id": "2401.00003", "summary": "plain", "tags": ["AD"], "score": 3.0},
+]
+text = json.dumps({"papers": expected}, ensure_ascii=False)
+chunked_ok = all(parse(text, size)[0] == expected for size in range(1, len(text) + 1))
+array_ok = parse(json.dumps(expected), 7)[0] == expected
+fenced, fenced_stream = parse("```json\n" + text + "\n```", 5)
+
+# 2) 잘린 응답: 완성된 객체만
+truncated, truncated_stream = parse(text[: text.index('"2401.00003"') + 5], 11)
+
+# 3) 중간 객체 손상 (trailing comma) → 나머지는 살림
+broken_text = text.replace('"score": 1}', '"score": 1,}')
+broken, broken_stream = parse(broken_text, 13)
+
+# 4) provider: 첫 요청의 스트림이 중간에 끊기면 빠진 논문만 다시 요청
+batch = [make_paper(n) for n in range(6)]
+requests = []
+
+
+class TruncatingProvider(MockProvider):
+    def _stream(self, batch, user_msg):
+        first = not requests
+        requests.append(len(batch))
+        raw = "".join(part for part in super()._stream(batch, user_msg) if isinstance(part, str))
+        yield raw[: raw.index(make_paper(4).id) - 10] if first else raw
+
+
+provider = TruncatingProvider(model="trunc", estimator=TokenEstimator("trunc", CALIBRATION))
+items = _triage_batch(provider.complete, batch, provider.name, "batch 1")
+got_ids = {item["id"] for item in items}
+
+# 5) 논문 객체는 스트림이 끝나기 전에 콜백으로 전달
+arrivals = []
+slow = MockProvider(model="slow", latency=0.5, estimator=TokenEstimator("slow", CALIBRATION))
+started = time.monotonic()
+slow.complete([make_paper(n) for n in range(10, 14)], lambda item: arrivals.append(time.monotonic() - started))
+total = time.monotonic() - started
+print(f"\n요청 논문 수: {requests} / 첫 결과 {arrivals[0]:.2f}s, 전체 {total:.2f}s\n")
+
+checks = [
+    ("모든 조각 크기에서 json.loads와 같은 결과", chunked_ok),
+    ("최상위 배열 형식",                   array_ok),
+    ("코드 펜스 무시",                     fenced == expected and fenced_stream.ok),
+    ("잘린 응답 → 완성된 객체만",            truncated == expected[:2] and not truncated_stream.complete),
+    ("깨진 객체만 버림",                    broken == [expected[0], expected[2]] and broken_stream.corrupt == 1),
+    ("잘린 스트림 뒤 빠진 논문만 재요청",      requests[0] == 6 and sum(requests[1:]) == 2),
+    ("재요청 후 전체 결과 확보",              got_ids == {p.id for p in batch}),
+    ("첫 결과가 스트림 완료 전에 도착",        len(arrivals) == 4 and arrivals[0] < total / 2),
+]
+all_pass = True
+for condition, passed in checks:
+    print(f"  {'✅' if passed else '❌'} {condition}")
+    all_pass = all_pass and passed
+
+print(f"\n{'✅ 모든 조건 통과' if all_pass else '❌ 일부 조건 미충족'}")
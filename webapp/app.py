@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import os
+import sys
 import uuid
 from datetime import datetime
 from functools import wraps
@@ -10,9 +11,12 @@ from functools import wraps
 from dotenv import load_dotenv
 from flask import (Flask, abort, jsonify, redirect, render_template,
                    request, session, url_for)
-from pymongo import MongoClient, ASCENDING, DESCENDING
 
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), "..", ".env"))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# 파이프라인과 같은 저장소·설정 사용 (.env 로드 이후 import, STORAGE_BACKEND=mongo/sqlite)
+from paper_briefing.storage import get_store  # noqa: E402
 
 app = Flask(__name__)
 app.secret_key = os.getenv("SECRET_KEY", "arxiv-briefing-secret-key-change-me")
@@ -32,35 +36,9 @@ def login_required(f):
     return decorated
 
 
-MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017/")
-MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "arxiv_papers")
-MONGODB_COLLECTION = os.getenv("MONGODB_COLLECTION", "papers")
-BOOKMARKS_COLLECTION = "bookmarks"
-
-_client: MongoClient | None = None
-
-
-def get_db():
-    global _client
-    if _client is None:
-        _client = MongoClient(MONGODB_URI, serverSelectionTimeoutMS=5000)
-    return _client[MONGODB_DB_NAME]
-
-
-def get_collection():
-    return get_db()[MONGODB_COLLECTION]
-
-
-def get_bookmarks_col():
-    col = get_db()[BOOKMARKS_COLLECTION]
-    col.create_index("paper_id", unique=True)
-    return col
-
-
 def load_bookmarked_ids() -> set:
     """현재 북마크된 paper_id 집합 반환."""
-    col = get_bookmarks_col()
-    return {doc["paper_id"] for doc in col.find({}, {"paper_id": 1, "_id": 0})}
+    return set(get_store().bookmarks())
 
 
 # ── 날짜 목록 (메인) ─────────────────────────────────────────────────────────
@@ -88,33 +66,13 @@ def logout():
 @app.route("/")
 @login_required
 def index():
-    col = get_collection()
-    pipeline = [
-        {"$project": {"date": {"$substr": ["$saved_at", 0, 10]}}},
-        {"$group": {"_id": "$date", "count": {"$sum": 1}}},
-        {"$sort": {"_id": -1}},
-    ]
-    dates = list(col.aggregate(pipeline))
-
-    stats_pipeline = [
-        {"$project": {
-            "date": {"$substr": ["$saved_at", 0, 10]},
-            "score": 1, "conference": 1,
-        }},
-        {"$group": {
-            "_id": "$date",
-            "avg_score": {"$avg": "$score"},
-            "conf_count": {"$sum": {"$cond": [{"$gt": ["$conference", ""]}, 1, 0]}},
-        }},
-    ]
-    stats_by_date = {s["_id"]: s for s in col.aggregate(stats_pipeline)}
-
+    store = get_store()
+    dates = store.date_rollups()   # 날짜별 논문 수·평균 점수·학회지 수 (최신 날짜 먼저)
     for d in dates:
-        d["avg_score"] = round(stats_by_date.get(d["_id"], {}).get("avg_score", 0), 2)
-        d["conf_count"] = stats_by_date.get(d["_id"], {}).get("conf_count", 0)
+        d["avg_score"] = round(d.get("avg_score") or 0, 2)
 
-    total_papers = col.count_documents({})
-    bookmark_count = get_bookmarks_col().count_documents({})
+    total_papers = store.count_papers()
+    bookmark_count = store.count_bookmarks()
 
     return render_template("index.html", dates=dates,
                            total_papers=total_papers, bookmark_count=bookmark_count)
@@ -130,10 +88,8 @@ def papers_by_date(date_str: str):
     except ValueError:
         abort(400)
 
-    col = get_collection()
-    all_papers = list(col.find(
-        {"saved_at": {"$regex": f"^{date_str}"}}, {"_id": 0}
-    ).sort("score", -1))
+    store = get_store()
+    all_papers = store.papers_on_date(date_str)
 
     if not all_papers:
         abort(404)
@@ -158,13 +114,7 @@ def papers_by_date(date_str: str):
     }
     papers = sorted(papers, key=sort_key_map.get(sort_by, sort_key_map["score"]), reverse=True)
 
-    all_dates = sorted(
-        {d["_id"] for d in col.aggregate([
-            {"$project": {"date": {"$substr": ["$saved_at", 0, 10]}}},
-            {"$group": {"_id": "$date"}},
-        ])},
-        reverse=True,
-    )
+    all_dates = [d["_id"] for d in store.date_rollups()]
     try:
         idx = all_dates.index(date_str)
         prev_date = all_dates[idx + 1] if idx + 1 < len(all_dates) else None
@@ -191,8 +141,7 @@ def papers_by_date(date_str: str):
 @app.route("/paper/<path:paper_id>")
 @login_required
 def paper_detail(paper_id: str):
-    col = get_collection()
-    paper = col.find_one({"id": paper_id}, {"_id": 0})
+    paper = get_store().get_paper(paper_id)
     if not paper:
         abort(404)
 
@@ -214,27 +163,7 @@ def search():
     conf_filter = request.args.get("conf", "")
     sort_by     = request.args.get("sort", "score")
 
-    col = get_collection()
-    query: dict = {}
-    if q:
-        query["$or"] = [
-            {"title":    {"$regex": q, "$options": "i"}},
-            {"summary":  {"$regex": q, "$options": "i"}},
-            {"abstract": {"$regex": q, "$options": "i"}},
-        ]
-    if tag_filter:
-        query["tags"] = tag_filter
-    if conf_filter:
-        query["conference"] = conf_filter
-
-    sort_map = {
-        "score":     [("score", DESCENDING)],
-        "citation":  [("citation_count", DESCENDING)],
-        "published": [("published", DESCENDING)],
-    }
-    papers = list(col.find(query, {"_id": 0})
-                     .sort(sort_map.get(sort_by, sort_map["score"]))
-                     .limit(100))
+    papers = get_store().search(q, tag=tag_filter, conf=conf_filter, sort_by=sort_by, limit=100)
 
     all_tags  = sorted(set(t for p in papers for t in p.get("tags", [])))
     all_confs = sorted(set(p["conference"] for p in papers if p.get("conference")))
@@ -260,12 +189,10 @@ def bookmarks():
     tag_filter  = request.args.get("tag", "")
     conf_filter = request.args.get("conf", "")
 
-    bm_col  = get_bookmarks_col()
-    papers_col = get_collection()
+    store = get_store()
 
     # 북마크된 항목 (북마크 날짜 포함)
-    bm_docs = list(bm_col.find({}, {"_id": 0}))
-    bm_map  = {d["paper_id"]: d["bookmarked_at"] for d in bm_docs}
+    bm_map = store.bookmarks()
 
     if not bm_map:
         bookmarked_ids = set()
@@ -275,7 +202,7 @@ def bookmarks():
                                sort_by=sort_by,
                                bookmarked_ids=bookmarked_ids, bookmark_count=0)
 
-    papers = list(papers_col.find({"id": {"$in": list(bm_map.keys())}}, {"_id": 0}))
+    papers = store.papers_by_ids(list(bm_map.keys()))
 
     # 북마크 날짜 주입 및 수집일 날짜 필드 추가
     for p in papers:
@@ -315,24 +242,12 @@ def bookmarks():
 @app.route("/api/bookmark/<path:paper_id>", methods=["POST"])
 @login_required
 def toggle_bookmark(paper_id: str):
-    col = get_collection()
-    if not col.find_one({"id": paper_id}, {"_id": 1}):
+    store = get_store()
+    if not store.get_paper(paper_id):
         return jsonify({"error": "paper not found"}), 404
 
-    bm_col = get_bookmarks_col()
-    existing = bm_col.find_one({"paper_id": paper_id})
-
-    if existing:
-        bm_col.delete_one({"paper_id": paper_id})
-        bookmarked = False
-    else:
-        bm_col.insert_one({
-            "paper_id":      paper_id,
-            "bookmarked_at": datetime.now().isoformat(),
-        })
-        bookmarked = True
-
-    total = bm_col.count_documents({})
+    bookmarked = store.toggle_bookmark(paper_id)
+    total = store.count_bookmarks()
     return jsonify({"bookmarked": bookmarked, "total": total})
 
 
@@ -346,22 +261,17 @@ def add_ref(paper_id: str):
     title = (data.get("title") or "").strip()
     if not url:
         return jsonify({"error": "url required"}), 400
-    col = get_collection()
-    if not col.find_one({"id": paper_id}, {"_id": 1}):
+    store = get_store()
+    if not store.get_paper(paper_id):
         return jsonify({"error": "paper not found"}), 404
     ref = {"ref_id": str(uuid.uuid4()), "url": url, "title": title or url}
-    col.update_one({"id": paper_id}, {"$push": {"refs": ref}})
-    paper = col.find_one({"id": paper_id}, {"refs": 1, "_id": 0})
-    return jsonify({"refs": paper.get("refs", [])})
+    return jsonify({"refs": store.add_ref(paper_id, ref)})
 
 
 @app.route("/api/paper/<path:paper_id>/refs/<ref_id>", methods=["DELETE"])
 @login_required
 def delete_ref(paper_id: str, ref_id: str):
-    col = get_collection()
-    col.update_one({"id": paper_id}, {"$pull": {"refs": {"ref_id": ref_id}}})
-    paper = col.find_one({"id": paper_id}, {"refs": 1, "_id": 0})
-    return jsonify({"refs": paper.get("refs", [])})
+    return jsonify({"refs": get_store().delete_ref(paper_id, ref_id)})
 
 
 if __name__ == "__main__":
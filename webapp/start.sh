@@ -5,5 +5,8 @@ set -e
 PYTHON="/home/bskang/miniconda3/envs/Papers/bin/python"
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 
+# MongoDB 인덱스 (이미 있으면 그대로, 실패해도 웹앱은 실행)
+(cd "$SCRIPT_DIR/.." && "$PYTHON" run_briefing.py --init-db) || echo "[start] 인덱스 생성 실패 - run_briefing.py --init-db 확인"
+
 cd "$SCRIPT_DIR"
 exec "$PYTHON" app.py